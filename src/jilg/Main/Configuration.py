@@ -5,10 +5,13 @@ from typing import Union
 import numpy as np
 from numpy.random import Generator
 
+from src.jilg.Main.TableWriter import TableWriter
+from src.jilg.Main.XesWriter import XesWriter
 from src.jilg.Model.Distribution import Distribution
 from src.jilg.Model.Model import Model
 from src.jilg.Other.Global import *
 from src.jilg.Model.SemanticInformation import SemanticInformation
+from src.jilg.Simulation.Event import Event
 from src.jilg.Simulation.SimulationConfiguration import SimulationConfiguration
 from src.jilg.Simulation.TransitionConfiguration import TransitionConfiguration
 
@@ -22,6 +25,8 @@ Json file.
 
 
 class Configuration:
+    output_formats = ["xes", "csv", "parquet"]
+    compressions = [""] + list(XesWriter.compression_extensions.keys())
     model_file_path: str
     output_directory_path: str
     number_of_event_logs: int
@@ -31,6 +36,9 @@ class Configuration:
     event_log_name: str
     copy_config_to_output_dir: bool
     include_metadata: bool
+    write_traces_during_simulation: bool
+    output_format: str  # "xes", "csv" or "parquet"
+    compression: str  # "", "gzip", "lzma" or "bz2", only used for XES files
     rng: np.random.default_rng
 
     def __init__(self, rng: Generator):
@@ -44,6 +52,14 @@ class Configuration:
         self.logs_in_one_file = False
         self.rng = rng
         self.copy_config_to_output_dir = True
+        self.write_traces_during_simulation = False
+        self.output_format = "xes"
+        self.compression = ""
+
+    def get_output_file_extension(self) -> str:
+        if self.output_format == "xes":
+            return ".xes" + XesWriter.compression_extensions.get(self.compression, "")
+        return TableWriter.file_extensions[self.output_format]
 
     def remove_duplicate_variable_values(self):
         for sem_info in self.semantic_information:
@@ -68,6 +84,18 @@ class Configuration:
                     transition.config = trans_config
                     transition.invisible = trans_config.invisible
                     break
+        self.configure_event_attributes(model)
+
+    def configure_event_attributes(self, model: Model):
+        # Precomputes the variables that are included in the events of every transition, so that
+        # creating an event only has to read the current values of the variables.
+        model.event_attributes = {}
+        if not model.variables:
+            return
+        for transition in model.transitions:
+            if hasattr(transition, "config"):
+                model.event_attributes[transition.id] = Event.get_event_attributes(model,
+                                                                                   transition.id)
 
     def configure_simulation(self, model: Model):
         for transition in model.transitions:
@@ -115,6 +143,9 @@ class Configuration:
                      'simulation_config': self.write_simulation_config(),
                      "copy_config_to_output_dir": self.copy_config_to_output_dir,
                      "include_metadata": self.include_metadata,
+                     "write_traces_during_simulation": self.write_traces_during_simulation,
+                     "output_format": self.output_format,
+                     "compression": self.compression,
                      'semantic_information': []}
 
         for sem_info in self.semantic_information:
@@ -152,6 +183,7 @@ class Configuration:
                                'max_time_interval_variance': self.simulation_config.max_time_interval_variance,
 
                                'random_seed': self.simulation_config.random_seed,
+                               'workers': self.simulation_config.workers,
                                'transition_configs': [],
                                'trace_names': self.simulation_config.trace_names,
                                'allow_duplicate_trace_names':
@@ -170,6 +202,9 @@ class Configuration:
                                "perform_trace_estimation":
                                    self.simulation_config.perform_trace_estimation,
                                "merge_intervals": self.simulation_config.merge_intervals,
+                               "solve_guards_with_milp":
+                                   self.simulation_config.solve_guards_with_milp,
+                               "columnar_event_logs": self.simulation_config.columnar_event_logs,
                                "use_only_values_from_guard_strings":
                                    self.simulation_config.use_only_values_from_guard_strings,
                                "timestamp_millieseconds": self.simulation_config.
@@ -276,6 +311,17 @@ class Configuration:
             self.number_of_event_logs = json_data["number_of_event_logs"]
             if "logs_in_one_file" in json_data.keys():
                 self.logs_in_one_file = json_data["logs_in_one_file"]
+            if "write_traces_during_simulation" in json_data.keys():
+                self.write_traces_during_simulation = json_data["write_traces_during_simulation"]
+            # Invalid output options are reported before the simulation instead of when the
+            # event logs are written.
+            if "output_format" in json_data.keys():
+                self.output_format = self.get_valid_option("output_format",
+                                                           json_data["output_format"],
+                                                           self.output_formats)
+            if "compression" in json_data.keys():
+                self.compression = self.get_valid_option("compression", json_data["compression"],
+                                                         self.compressions)
 
             sim_config_dict = json_data["simulation_config"]
             self.simulation_config = self.read_simulation_config(sim_config_dict)
@@ -287,6 +333,12 @@ class Configuration:
         if with_model:
             self.configure_variables_and_transitions(model)
 
+    def get_valid_option(self, name: str, value: str, valid_values: list) -> str:
+        if value not in valid_values:
+            raise ValueError("Invalid {name} '{value}'! Valid values are: {values}".format(
+                name=name, value=value, values=", ".join(repr(v) for v in valid_values)))
+        return value
+
     def read_simulation_config(self, sim_config_dict: dict) -> SimulationConfiguration:
         sim_config = SimulationConfiguration()
         sim_config.sim_strategy = sim_config_dict['sim_strategy']
@@ -307,6 +359,8 @@ class Configuration:
         sim_config.timestamp_delay_min = sim_config_dict["timestamp_delay_min"]
         sim_config.timestamp_delay_max = sim_config_dict["timestamp_delay_max"]
         sim_config.random_seed = sim_config_dict["random_seed"]
+        if "workers" in sim_config_dict.keys():
+            sim_config.workers = sim_config_dict["workers"]
         sim_config.transition_configs = []
         sim_config.trace_names = sim_config_dict["trace_names"]
         sim_config.allow_duplicate_trace_names = sim_config_dict["allow_duplicate_trace_names"]
@@ -337,6 +391,10 @@ class Configuration:
             sim_config_dict["duplicates_with_invisible_transitions"]
 
         sim_config.merge_intervals = sim_config_dict["merge_intervals"]
+        if "solve_guards_with_milp" in sim_config_dict.keys():
+            sim_config.solve_guards_with_milp = sim_config_dict["solve_guards_with_milp"]
+        if "columnar_event_logs" in sim_config_dict.keys():
+            sim_config.columnar_event_logs = sim_config_dict["columnar_event_logs"]
 
         if "timestamp_millieseconds" in sim_config_dict.keys():
             sim_config.timestamp_millieseconds = sim_config_dict["timestamp_millieseconds"]
@@ -7,10 +7,13 @@ import numpy as np
 
 from src.jilg.Main.Configuration import Configuration
 from src.jilg.Main.PnmlReader import PnmlReader
+from src.jilg.Main.TableWriter import TableWriter
+from src.jilg.Main.TraceStreamWriter import TraceStreamWriter
 from src.jilg.Main.XesWriter import XesWriter
 from src.jilg.Model.Model import Model
 from src.jilg.Main.ModelAnalyser import ModelAnalyser
 from src.jilg.Other import Global
+from src.jilg.Simulation.Event import Event
 from src.jilg.Simulation.EventLog import EventLog
 from src.jilg.Simulation.Simulation import Simulation, SimStatus
 
@@ -21,6 +24,9 @@ class Main:
     config: Configuration
     reader: PnmlReader
     writer: XesWriter
+    table_writer: TableWriter  # used if the output format is "csv" or "parquet"
+    trace_writer: TraceStreamWriter  # None if the event logs are written after the simulation
+    written_event_logs: list  # event logs that have been written during the simulation
     analyser: ModelAnalyser
     event_logs: list
     simulation: Simulation
@@ -35,6 +41,9 @@ class Main:
     def __init__(self):
         self.reader = PnmlReader()
         self.writer = XesWriter()
+        self.table_writer = TableWriter()
+        self.trace_writer = None
+        self.written_event_logs = []
         self.analyser = ModelAnalyser()
         self.event_logs = []
         self.sim_status = SimStatus()
@@ -63,9 +72,28 @@ class Main:
         self.errors = ""
         self.rng = np.random.default_rng(self.config.simulation_config.random_seed)
         self.config.rng = self.rng
+        self.config.configure_event_attributes(self.model)
         self.model.reset()
+        if write_event_logs and self.config.write_traces_during_simulation and \
+                self.config.output_format == "xes":
+            self.trace_writer = TraceStreamWriter(self.writer, self.config.output_directory_path,
+                                                  self.config.event_log_name,
+                                                  self.config.logs_in_one_file,
+                                                  self.config.number_of_event_logs,
+                                                  self.config.simulation_config.trace_names[0],
+                                                  self.config.simulation_config
+                                                  .include_invisible_transitions_in_log,
+                                                  self.config.include_metadata,
+                                                  compression=self.config.compression)
+            self.trace_writer.start()
+        else:
+            self.trace_writer = None
         self.simulation = Simulation(self.model, self.config.simulation_config, self.rng,
-                                     self.config.number_of_event_logs, self.config.event_log_name)
+                                     self.config.number_of_event_logs, self.config.event_log_name,
+                                     trace_writer=self.trace_writer)
+        self.written_event_logs = []
+        if write_event_logs and self.trace_writer is None and not self.config.logs_in_one_file:
+            self.simulation.event_log_handler = self.write_finished_event_log
         self.simulation.config = self.config.simulation_config
 
         if gui_lock is not None:
@@ -110,7 +138,7 @@ class Main:
                 msg = "\nSimulation finished!\n\n{logs} event log with a total number of {traces}" \
                       " traces has been generated! \n\nWriting event logs to:\n {dir}"
             print(msg.format(dir=self.config.output_directory_path, logs=len(self.event_logs),
-                          traces=len(self.event_logs[0].traces) * len(self.event_logs)))
+                          traces=self.event_logs[0].get_number_of_traces() * len(self.event_logs)))
             if write_event_logs:
                 self.write_event_logs(self.simulation.event_logs)
             if len(self.event_logs) > 1:
@@ -125,7 +153,7 @@ class Main:
             time.sleep(3)
             with self.simulation.thread_status_lock:
                 self.event_logs = self.simulation.event_logs
-            if write_event_logs and self.event_logs:
+            if write_event_logs and (self.event_logs or self.trace_writer is not None):
                 print("\nWriting event log/traces that have been generated so far to {dir}."
                       .format(dir=self.config.output_directory_path))
                 self.write_event_logs(self.simulation.event_logs)
@@ -135,7 +163,7 @@ class Main:
             print("\nThe following exception occurred during the simulation!")
             print(traceback.format_exc())
             self.event_logs = self.simulation.event_logs
-            if write_event_logs and self.event_logs:
+            if write_event_logs and (self.event_logs or self.trace_writer is not None):
                 print("\nWriting even log/traces that have been generated so far to {dir}."
                       .format(dir=self.config.output_directory_path))
                 self.write_event_logs(self.simulation.event_logs)
@@ -183,10 +211,53 @@ class Main:
             return False
 
     def write_event_logs(self, event_logs: [EventLog]):
-        self.writer.write_event_logs_to_xes_file(self.config.output_directory_path, event_logs,
-                                                 self.config.logs_in_one_file,
-                                                 self.config.event_log_name,
-                                                 self.config.simulation_config.trace_names,
-                                                 self.config.simulation_config
-                                                 .include_invisible_transitions_in_log,
-                                                 self.config.include_metadata)
+        if self.trace_writer is not None:
+            # The traces have already been written during the simulation.
+            self.trace_writer.close()
+            return
+        if self.written_event_logs:
+            # The event logs have been generated in parallel and have already been written.
+            return
+        if self.config.output_format == "xes":
+            self.writer.write_event_logs_to_xes_file(self.config.output_directory_path, event_logs,
+                                                     self.config.logs_in_one_file,
+                                                     self.config.event_log_name,
+                                                     self.config.simulation_config.trace_names,
+                                                     self.config.simulation_config
+                                                     .include_invisible_transitions_in_log,
+                                                     self.config.include_metadata,
+                                                     compression=self.config.compression)
+        else:
+            self.table_writer.write_event_logs_to_table_file(
+                self.config.output_directory_path, event_logs, self.config.logs_in_one_file,
+                self.config.event_log_name, self.config.simulation_config.trace_names,
+                self.config.simulation_config.include_invisible_transitions_in_log,
+                self.config.output_format, self.get_table_variables())
+
+    def write_finished_event_log(self, event_log: EventLog, index: int):
+        if self.config.output_format == "xes":
+            self.writer.write_event_log_to_separate_file(self.config.output_directory_path,
+                                                         event_log, index,
+                                                         self.config.number_of_event_logs,
+                                                         self.config.simulation_config
+                                                         .include_invisible_transitions_in_log,
+                                                         self.config.include_metadata,
+                                                         self.config.event_log_name,
+                                                         self.config.simulation_config
+                                                         .trace_names[0],
+                                                         compression=self.config.compression)
+        else:
+            self.table_writer.write_event_log_to_separate_file(
+                self.config.output_directory_path, event_log, index,
+                self.config.number_of_event_logs,
+                self.config.simulation_config.include_invisible_transitions_in_log,
+                self.config.event_log_name, self.config.simulation_config.trace_names[0],
+                self.config.output_format, self.get_table_variables())
+        self.written_event_logs.append(event_log)
+
+    def get_table_variables(self) -> list:
+        # Every variable of the model gets a column in the CSV and Parquet files.
+        variables = []
+        for variable in self.model.variables:
+            variables.append((variable.original_name, Event.xml_type_strings.get(variable.type)))
+        return variables
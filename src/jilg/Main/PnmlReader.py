@@ -52,11 +52,13 @@ class PnmlReader:
             self.read_page(model_obj, net)
             self.read_final_markings(model_obj, net)
             self.configure_arc_references(model_obj)
+            model_obj.build_incidence_matrices()
 
             model_obj.setup_current_marking()
             model_obj.initial_marking = deepcopy(model_obj.current_marking)
 
             self.replace_non_valid_variable_names(model_obj)
+            model_obj.update_indexes()
             self.add_missing_read_and_write_variables(model_obj)
             self.check_model_conformance(model_obj)
 
@@ -397,7 +399,7 @@ class PnmlReader:
             else:
                 self.warnings.append(final_marking_warning)
 
-        model_obj.places.append(place)
+        model_obj.add_place(place)
 
     def add_transition_variables(self, model_obj: Model, transition: Transition, element: Et.Element):
         variables_written = self.get_children_by_tag(element, "writeVariable")
@@ -440,7 +442,7 @@ class PnmlReader:
             transition.guard = Guard("guard", guard, transition)
         transition.tool_specific_info = element.attrib.get("toolspecific", None)
         self.add_graphics(transition, element)
-        model_obj.transitions.append(transition)
+        model_obj.add_transition(transition)
 
     def add_graphics(self, net_object: Union[Place, Transition], element: Et.Element):
         graphics = self.get_child_by_tag(element, "graphics")
@@ -479,8 +481,7 @@ class PnmlReader:
                     arc_type = arc_type_element[0].text
                 else:
                     arc_type = "undefined"
-                model_obj.arcs.append(
-                    Arc(name, arc_id, source, target, arc_type, tool_specific_info))
+                model_obj.add_arc(Arc(name, arc_id, source, target, arc_type, tool_specific_info))
 
     def add_final_marking(self, model_obj: Model, element: Et.Element, marking_id: int):
         valid = True
@@ -542,9 +543,9 @@ class PnmlReader:
             var_pos_y = 0.0
             var_height = 50
             var_width = 50
-        model_obj.variables.append(Variable(var_name, var_type, var_pos_x, var_pos_y, var_height,
-                                            var_width, var_min_value, var_max_value,
-                                            var_initial_value))
+        model_obj.add_variable(Variable(var_name, var_type, var_pos_x, var_pos_y, var_height,
+                                        var_width, var_min_value, var_max_value,
+                                        var_initial_value))
 
     def get_element_name(self, element: Et.Element) -> str:
         name_element = self.get_child_by_tag(element, "name")
@@ -0,0 +1,201 @@
+import csv
+from typing import Union
+
+from src.jilg.Other.Global import print_summary_global
+from src.jilg.Simulation.EventLog import EventLog
+from src.jilg.Simulation.TimestampFormatter import TimestampFormatter
+
+try:
+    import pyarrow
+    import pyarrow.parquet
+except ImportError:
+    pyarrow = None
+
+'''
+This class is used to export the generated event logs as tables with one row per event instead of
+XES files. The columns are the case id, the activity, the timestamp and one column per variable.
+The values of trace variables are repeated in every row of the trace. If the event logs are
+written to a single file, an additional first column contains the number of the event log.
+
+The tables are written as CSV files or, if pyarrow is installed, as Parquet files. Both are written
+incrementally, i.e. the CSV rows are written as soon as they have been created and the Parquet rows
+are written in row groups of batch_size rows. The case ids are the same names that the XesWriter
+uses for the traces, the timestamps and dates are the same ISO strings. Parquet files contain the
+timestamps as UTC timestamps and the variables with the type of the variable.
+'''
+
+
+class TableWriter:
+    file_extensions = {"csv": ".csv", "parquet": ".parquet"}
+    log_column = "log"
+    case_column = "case:concept:name"
+    activity_column = "concept:name"
+    timestamp_column = "time:timestamp"
+    batch_size = 10000
+    timestamp_formatter: TimestampFormatter
+
+    def print_summary(self, print_list_elements=False):
+        print_summary_global(self, print_list_elements)
+
+    def __init__(self):
+        self.timestamp_formatter = TimestampFormatter()
+
+    @staticmethod
+    def is_parquet_available() -> bool:
+        return pyarrow is not None
+
+    def write_event_logs_to_table_file(self, output_dir: str, event_logs: [EventLog],
+                                       write_to_single_file: bool, file_name: str,
+                                       trace_names: [str], include_invisible_transitions: bool,
+                                       file_format: str = "csv", variables: Union[list, None] = None):
+        # variables: (name, XES type string) of the variable columns, determined from the event
+        # logs if they are not given.
+        if variables is None:
+            variables = self.get_variables(event_logs)
+        if write_to_single_file and len(event_logs) > 1:
+            rows = self.get_event_logs_rows(event_logs, trace_names[0],
+                                            include_invisible_transitions, variables)
+            self.write_rows(output_dir + file_name + self.file_extensions[file_format], file_format,
+                            variables, rows, True)
+        else:
+            for index, event_log in enumerate(event_logs):
+                self.write_event_log_to_separate_file(output_dir, event_log, index,
+                                                      len(event_logs),
+                                                      include_invisible_transitions, file_name,
+                                                      trace_names[0], file_format, variables)
+
+    def write_event_log_to_separate_file(self, path: str, event_log: EventLog, index: int,
+                                         number_of_event_logs: int,
+                                         include_invisible_transitions: bool,
+                                         file_name="event_log", trace_name="trace",
+                                         file_format: str = "csv",
+                                         variables: Union[list, None] = None):
+        if variables is None:
+            variables = self.get_variables([event_log])
+        rows = self.get_rows(event_log, trace_name, include_invisible_transitions, variables)
+        self.write_rows(self.get_separate_file_path(path, file_name, index, number_of_event_logs,
+                                                    file_format), file_format, variables, rows)
+
+    def get_separate_file_path(self, path: str, file_name: str, index: int,
+                               number_of_event_logs: int, file_format: str) -> str:
+        if number_of_event_logs == 1:
+            return path + file_name + self.file_extensions[file_format]
+        else:
+            return path + file_name + str(index + 1) + self.file_extensions[file_format]
+
+    def get_trace_name(self, trace_name: str, index: int, number_of_traces: int) -> str:
+        if number_of_traces == 1:
+            if trace_name == "":
+                return "1"
+            else:
+                return trace_name
+        else:
+            return trace_name + str(index + 1)
+
+    def get_variables(self, event_logs: [EventLog]) -> list:
+        # Returns the variables of all traces and events in the order of their first occurrence.
+        variables = {}
+        for event_log in event_logs:
+            for trace in event_log.get_traces():
+                for var_name, var_value, var_type in trace.variables:
+                    variables.setdefault(var_name, var_type)
+                for event in trace.events:
+                    for var_name, var_value, var_type in event.variables:
+                        variables.setdefault(var_name, var_type)
+        return list(variables.items())
+
+    def get_event_logs_rows(self, event_logs: [EventLog], trace_name: str,
+                            include_invisible_transitions: bool, variables: list):
+        for index, event_log in enumerate(event_logs):
+            for row in self.get_rows(event_log, trace_name, include_invisible_transitions,
+                                     variables):
+                yield [index + 1] + row
+
+    def get_rows(self, event_log: EventLog, trace_name: str, include_invisible_transitions: bool,
+                 variables: list):
+        # Yields [case id, activity, (timestamp, UTC offset), variable values...] for every event.
+        # Missing values are None, dates are already converted to ISO strings.
+        columns = {}
+        for index, variable in enumerate(variables):
+            columns[variable[0]] = index + 3
+        number_of_traces = event_log.get_number_of_traces()
+        for trace_index, trace in enumerate(event_log.get_traces()):
+            trace_row = [self.get_trace_name(trace_name, trace_index, number_of_traces), None,
+                         None] + [None] * len(variables)
+            self.set_values(trace_row, trace.variables, columns)
+            for event in trace.events:
+                if not event.from_invisible_transition or include_invisible_transitions:
+                    row = trace_row.copy()
+                    row[1] = event.name
+                    row[2] = (event.timestamp, event.utc_offset)
+                    self.set_values(row, event.variables, columns)
+                    yield row
+
+    def set_values(self, row: list, attributes: list, columns: dict):
+        for var_name, var_value, var_type in attributes:
+            column = columns.get(var_name)
+            if column is not None:
+                if var_type == "date":
+                    var_value = self.timestamp_formatter.format_date(var_value)
+                row[column] = var_value
+
+    def write_rows(self, path: str, file_format: str, variables: list, rows,
+                   with_log_column: bool = False):
+        header = [self.case_column, self.activity_column, self.timestamp_column]
+        for var_name, var_type in variables:
+            header.append(var_name)
+        if with_log_column:
+            header.insert(0, self.log_column)
+        if file_format == "parquet":
+            self.write_parquet_file(path, header, variables, rows, with_log_column)
+        else:
+            self.write_csv_file(path, header, rows, with_log_column)
+
+    def write_csv_file(self, path: str, header: list, rows, with_log_column: bool):
+        timestamp_index = header.index(self.timestamp_column)
+        with open(path, "w", encoding="utf-8", newline="") as file:
+            writer = csv.writer(file)
+            writer.writerow(header)
+            for row in rows:
+                row[timestamp_index] = self.timestamp_formatter.format_timestamp(
+                    *row[timestamp_index])
+                writer.writerow(row)
+
+    def write_parquet_file(self, path: str, header: list, variables: list, rows,
+                           with_log_column: bool):
+        if pyarrow is None:
+            raise ImportError("Writing Parquet files requires pyarrow!")
+        types = {"int": pyarrow.int64(), "float": pyarrow.float64(), "boolean": pyarrow.bool_(),
+                 "string": pyarrow.string(), "date": pyarrow.string()}
+        fields = [pyarrow.field(self.case_column, pyarrow.string()),
+                  pyarrow.field(self.activity_column, pyarrow.string()),
+                  pyarrow.field(self.timestamp_column, pyarrow.timestamp("us", tz="UTC"))]
+        for var_name, var_type in variables:
+            fields.append(pyarrow.field(var_name, types.get(var_type, pyarrow.string())))
+        if with_log_column:
+            fields.insert(0, pyarrow.field(self.log_column, pyarrow.int64()))
+        schema = pyarrow.schema(fields)
+        timestamp_index = header.index(self.timestamp_column)
+        writer = pyarrow.parquet.ParquetWriter(path, schema)
+        try:
+            batch = []
+            for row in rows:
+                # Timestamps without time zone are written as if they were in UTC.
+                row[timestamp_index] = row[timestamp_index][0]
+                batch.append(row)
+                if len(batch) == self.batch_size:
+                    writer.write_table(self.get_parquet_table(batch, header, schema))
+                    batch = []
+            if batch:
+                writer.write_table(self.get_parquet_table(batch, header, schema))
+        finally:
+            writer.close()
+
+    def get_parquet_table(self, batch: list, header: list, schema):
+        columns = {}
+        for index, column in enumerate(header):
+            values = []
+            for row in batch:
+                values.append(row[index])
+            columns[column] = values
+        return pyarrow.Table.from_pydict(columns, schema=schema)
@@ -0,0 +1,226 @@
+import queue
+import shutil
+import sys
+import tempfile
+import threading
+import traceback
+from typing import TextIO, Union
+
+from src.jilg.Main.XesWriter import XesWriter
+from src.jilg.Other import Global
+from src.jilg.Other.Global import print_summary_global
+from src.jilg.Simulation.EventLog import EventLog
+from src.jilg.Simulation.Trace import Trace
+
+'''
+This class is used to write the traces of the generated event logs to XES files while the
+simulation is still running. The simulation pushes every completed trace into a bounded queue and
+a writer thread streams the traces to disk. Therefore, the traces do not have to be kept in memory
+until the simulation has ended and the traces that have been generated before an abort of the
+simulation are not lost. If the writer thread fails, the error is raised in the simulation the
+next time it passes a trace to the writer or closes it, instead of blocking on the full queue.
+
+The header of a XES file contains the metadata of the whole event log. The traces of an event log
+are therefore first written to an anonymous temporary file in the output directory and are copied
+into the XES file behind the header once the event log is closed. The resulting files are equal
+to the ones written by the XesWriter after the simulation.
+'''
+
+
+class EventLogStream:
+    event_log: EventLog
+    index: int
+    trace_file: TextIO
+    pending_trace: Union[Trace, None]  # the first trace is named differently if it is the only one
+    number_of_traces: int
+    number_of_events_traces: list
+    event_names: set
+    event_names_traces: list
+
+    def print_summary(self, print_list_elements=False):
+        print_summary_global(self, print_list_elements)
+
+    def __init__(self, event_log: EventLog, index: int, output_dir: str):
+        self.event_log = event_log
+        self.index = index
+        self.trace_file = tempfile.TemporaryFile("w+", encoding="utf-8", dir=output_dir or None)
+        self.pending_trace = None
+        self.number_of_traces = 0
+        self.number_of_events_traces = []
+        self.event_names = set()
+        self.event_names_traces = []
+
+
+class TraceStreamWriter:
+    queue_size = 64
+    put_timeout = 0.1  # seconds between the checks of the writer thread while the queue is full
+    writer: XesWriter
+    output_dir: str
+    file_name: str
+    write_to_single_file: bool
+    number_of_event_logs: int
+    trace_name: str
+    include_invisible_transitions: bool
+    include_metadata: bool
+    indent: str
+    compression: str  # see XesWriter.open_file
+    trace_queue: queue.Queue
+    thread: threading.Thread
+    lock: threading.Lock
+    closed: bool
+    error: Union[BaseException, None]  # set if the writer thread failed
+    streams: dict  # id of the event log -> EventLogStream
+    number_of_streams: int
+    number_of_written_logs: int
+
+    def print_summary(self, print_list_elements=False):
+        print_summary_global(self, print_list_elements)
+
+    def __init__(self, writer: XesWriter, output_dir: str, file_name: str,
+                 write_to_single_file: bool, number_of_event_logs: int, trace_name: str,
+                 include_invisible_transitions: bool, include_metadata: bool, indent: str = "  ",
+                 compression: str = ""):
+        self.writer = writer
+        self.output_dir = output_dir
+        self.file_name = file_name
+        self.write_to_single_file = write_to_single_file
+        self.number_of_event_logs = number_of_event_logs
+        self.trace_name = trace_name
+        self.include_invisible_transitions = include_invisible_transitions
+        self.include_metadata = include_metadata
+        self.indent = indent
+        self.compression = compression
+        self.trace_queue = queue.Queue(self.queue_size)
+        self.lock = threading.Lock()
+        self.closed = False
+        self.error = None
+        self.streams = {}
+        self.number_of_streams = 0
+        self.number_of_written_logs = 0
+        self.thread = threading.Thread(target=self.run, daemon=True)
+
+    def start(self):
+        self.thread.start()
+
+    def write_trace(self, event_log: EventLog, trace: Trace):
+        # Blocks while the queue is full, which limits the number of traces kept in memory.
+        self.enqueue((event_log, trace))
+
+    def close_event_log(self, event_log: EventLog):
+        self.enqueue((event_log, None))
+
+    def close(self):
+        # Writes all queued traces and closes the event logs that are still open.
+        with self.lock:
+            if self.closed:
+                return
+            self.closed = True
+            self.put(None)
+        self.thread.join()
+        self.check_writer_thread()
+
+    def enqueue(self, item: tuple):
+        # The closed flag is checked while holding the lock until the item is queued. Therefore,
+        # no item can be queued behind the end of the queue and get lost.
+        with self.lock:
+            if self.closed:
+                return
+            self.put(item)
+
+    def put(self, item: Union[tuple, None]):
+        while True:
+            self.check_writer_thread()
+            try:
+                self.trace_queue.put(item, timeout=self.put_timeout)
+                return
+            except queue.Full:
+                pass
+
+    def check_writer_thread(self):
+        if self.error is not None:
+            raise RuntimeError("Writing the traces during the simulation failed!") from self.error
+
+    def run(self):
+        try:
+            while True:
+                item = self.trace_queue.get()
+                if item is None:
+                    break
+                event_log, trace = item
+                stream = self.get_stream(event_log)
+                if trace is None:
+                    self.finish_stream(stream)
+                else:
+                    self.add_trace(stream, trace)
+            for stream in sorted(self.streams.values(), key=lambda s: s.index):
+                self.finish_stream(stream)
+        except:
+            self.error = sys.exc_info()[1]
+            Global.log_error(__file__, "Writing the traces during the simulation failed!", traceback)
+
+    def get_stream(self, event_log: EventLog) -> EventLogStream:
+        stream = self.streams.get(id(event_log))
+        if stream is None:
+            stream = EventLogStream(event_log, self.number_of_streams, self.output_dir)
+            self.streams[id(event_log)] = stream
+            self.number_of_streams += 1
+        return stream
+
+    def add_trace(self, stream: EventLogStream, trace: Trace):
+        number_of_events = 0
+        trace_event_names = set()
+        for event in trace.events:
+            if self.include_invisible_transitions or not event.from_invisible_transition:
+                number_of_events += 1
+                trace_event_names.add(event.name)
+        stream.number_of_events_traces.append(number_of_events)
+        stream.event_names.update(trace_event_names)
+        stream.event_names_traces.append(len(trace_event_names))
+
+        if stream.number_of_traces == 0:
+            stream.pending_trace = trace
+        else:
+            if stream.pending_trace is not None:
+                self.write_stream_trace(stream, stream.pending_trace, 0, 2)
+                stream.pending_trace = None
+            self.write_stream_trace(stream, trace, stream.number_of_traces,
+                                    stream.number_of_traces + 1)
+        stream.number_of_traces += 1
+
+    def write_stream_trace(self, stream: EventLogStream, trace: Trace, index: int,
+                           number_of_traces: int):
+        self.writer.write_trace(stream.trace_file, trace,
+                                self.writer.get_trace_name(self.trace_name, index, number_of_traces),
+                                self.include_invisible_transitions, self.indent)
+
+    def finish_stream(self, stream: EventLogStream):
+        if stream.pending_trace is not None:
+            self.write_stream_trace(stream, stream.pending_trace, 0, 1)
+            stream.pending_trace = None
+        metadata = None
+        if self.include_metadata and stream.number_of_traces > 0:
+            metadata = self.writer.get_metadata_from_counts(stream.number_of_events_traces,
+                                                            stream.event_names_traces,
+                                                            len(stream.event_names))
+
+        if self.write_to_single_file:
+            mode = "w" if self.number_of_written_logs == 0 else "a"
+            path = self.writer.get_file_path(self.output_dir, self.file_name, self.compression)
+        else:
+            mode = "w"
+            path = self.writer.get_separate_file_path(self.output_dir, self.file_name, stream.index,
+                                                      self.number_of_event_logs, self.compression)
+
+        with self.writer.open_file(path, mode, self.compression) as file:
+            if self.write_to_single_file and self.number_of_written_logs != 0:
+                file.write("\n")
+            self.writer.write_header(file, stream.event_log, self.include_invisible_transitions,
+                                     metadata is not None, self.indent,
+                                     self.number_of_written_logs == 0 or not self.write_to_single_file,
+                                     metadata)
+            stream.trace_file.seek(0)
+            shutil.copyfileobj(stream.trace_file, file)
+            self.writer.write_footer(file, self.indent)
+        stream.trace_file.close()
+        del self.streams[id(stream.event_log)]
+        self.number_of_written_logs += 1
@@ -1,266 +1,272 @@
-import xml.etree.ElementTree as ET
-from copy import deepcopy
-from xml.dom import minidom
+import bz2
+import gzip
+import io
+import lzma
+from typing import TextIO
+from xml.sax.saxutils import escape
 
 import numpy as np
 
 from src.jilg.Other import Global
 from src.jilg.Simulation.Event import Event
 from src.jilg.Simulation.EventLog import EventLog
+from src.jilg.Simulation.TimestampFormatter import TimestampFormatter
+from src.jilg.Simulation.Trace import Trace
 
 '''
 This class is used to export the generated synthetic event log to an eXtensible Event Stream (XES)
 file.
+
+The XES file is written as a stream, i.e. every trace and event is written to the file as soon as
+it has been serialized. No document tree of the whole event log is kept in memory. If "indent" is
+set, the elements are written on separate lines and indented by the given string, which results
+in the same layout as the previously used minidom pretty printing. The timestamps of the events
+and the values of date variables are only converted to ISO strings when they are written (see
+TimestampFormatter).
+
+The XES files can be compressed with gzip, lzma or bz2 (see open_file). The compression is done
+while the event log is serialized.
 '''
 
 
 class XesWriter:
+    attribute_entities = {'"': "&quot;", "\n": "&#10;", "\r": "&#13;", "\t": "&#9;"}
+    compression_extensions = {"gzip": ".gz", "lzma": ".xz", "bz2": ".bz2"}
+    gzip_compression_level = 6
+    timestamp_formatter: TimestampFormatter
+
+    def __init__(self):
+        self.timestamp_formatter = TimestampFormatter()
+
     def write_event_logs_to_xes_file(self, output_dir: str, event_logs: [EventLog], write_to_single_file: bool,
                                      file_name: str, trace_names: [str], include_invisible_transitions: bool,
-                                     include_metadata: bool):
+                                     include_metadata: bool, indent: str = "  ", compression: str = ""):
         if write_to_single_file:
             self.write_event_logs_to_single_file(output_dir, event_logs, include_invisible_transitions,
-                                                 include_metadata, file_name, trace_names[0])
+                                                 include_metadata, file_name, trace_names[0], indent,
+                                                 compression)
         else:
             self.write_event_logs_to_separate_files(output_dir, event_logs,
                                                     include_invisible_transitions, include_metadata,
                                                     file_name,
-                                                    trace_names[0])
+                                                    trace_names[0], indent, compression)
 
     def write_event_logs_to_single_file(self, path: str, event_logs: [EventLog], include_invisible_transitions: bool,
                                         include_metadata: bool,
                                         file_name="event_log",
-                                        trace_name="trace"):
-        with open(path + file_name + ".xes", 'w') as file:
+                                        trace_name="trace", indent: str = "  ", compression: str = ""):
+        with self.open_file(self.get_file_path(path, file_name, compression), "w",
+                            compression) as file:
             for index, event_log in enumerate(event_logs):
-                event_log_xml = self.generate_xml(event_log, trace_name,
-                                                  include_invisible_transitions, include_metadata)
                 if index != 0:
-                    event_log_xml = event_log_xml.replace('<?xml version="1.0" ?>\n', '')
-                if index != len(event_logs) - 1:
-                    event_log_xml += "\n"
-                file.write(event_log_xml)
+                    file.write("\n")
+                self.write_event_log(file, event_log, trace_name, include_invisible_transitions,
+                                     include_metadata, indent, index == 0)
 
     def write_event_logs_to_separate_files(self, path: str, event_logs: [EventLog], include_invisible_transitions: bool,
                                            include_metadata: bool,
                                            file_name="event_log",
-                                           trace_name="trace"):
-        if len(event_logs) == 1:
-            event_log_xml = self.generate_xml(event_logs[0], trace_name,
-                                              include_invisible_transitions, include_metadata)
-            with open(path + file_name + ".xes", 'w') as file:
-                file.write(event_log_xml)
+                                           trace_name="trace", indent: str = "  ",
+                                           compression: str = ""):
+        for index, event_log in enumerate(event_logs):
+            self.write_event_log_to_separate_file(path, event_log, index, len(event_logs),
+                                                  include_invisible_transitions, include_metadata,
+                                                  file_name, trace_name, indent, compression)
+
+    def write_event_log_to_separate_file(self, path: str, event_log: EventLog, index: int,
+                                         number_of_event_logs: int,
+                                         include_invisible_transitions: bool, include_metadata: bool,
+                                         file_name="event_log", trace_name="trace",
+                                         indent: str = "  ", compression: str = ""):
+        with self.open_file(self.get_separate_file_path(path, file_name, index, number_of_event_logs,
+                                                        compression), "w", compression) as file:
+            self.write_event_log(file, event_log, trace_name, include_invisible_transitions,
+                                 include_metadata, indent)
+
+    def get_separate_file_path(self, path: str, file_name: str, index: int,
+                               number_of_event_logs: int, compression: str = "") -> str:
+        if number_of_event_logs == 1:
+            return self.get_file_path(path, file_name, compression)
         else:
-            for index, event_log in enumerate(event_logs):
-                event_log_xml = self.generate_xml(event_log, trace_name,
-                                                  include_invisible_transitions, include_metadata)
-                with open(path + file_name + str(index + 1) + ".xes", 'w') as file:
-                    file.write(event_log_xml)
+            return self.get_file_path(path, file_name + str(index + 1), compression)
+
+    def get_file_path(self, path: str, file_name: str, compression: str = "") -> str:
+        return path + file_name + ".xes" + self.compression_extensions.get(compression, "")
+
+    def open_file(self, path: str, mode: str, compression: str = "") -> TextIO:
+        # The data is compressed while it is written, no uncompressed file is created. Gzip files
+        # do not contain the modification time, which makes them reproducible.
+        if compression == "gzip":
+            return io.TextIOWrapper(gzip.GzipFile(path, mode + "b", self.gzip_compression_level,
+                                                  mtime=0), encoding="utf-8")
+        elif compression == "lzma":
+            return lzma.open(path, mode + "t", encoding="utf-8")
+        elif compression == "bz2":
+            return bz2.open(path, mode + "t", encoding="utf-8")
+        else:
+            return open(path, mode, encoding="utf-8")
+
+    def write_event_log(self, file: TextIO, event_log: EventLog, trace_name: str,
+                        include_invisible_transitions: bool, include_metadata: bool,
+                        indent: str = "  ", with_xml_declaration: bool = True):
+        self.write_header(file, event_log, include_invisible_transitions, include_metadata, indent,
+                          with_xml_declaration)
+        number_of_traces = event_log.get_number_of_traces()
+        for index, trace in enumerate(event_log.get_traces()):
+            self.write_trace(file, trace, self.get_trace_name(trace_name, index, number_of_traces),
+                             include_invisible_transitions, indent)
+        self.write_footer(file, indent)
 
     def generate_xml(self, event_log: EventLog, trace_name: str, include_invisible_transitions: bool,
-                     include_metadata: bool) -> str:
-        tree = self.init_element_tree(event_log, include_invisible_transitions, include_metadata)
-        name = ET.SubElement(tree.getroot(), "string")
-        name.set("key", "concept:name")
-        name.set("value", event_log.name)
-        self.add_traces(tree.getroot(), event_log, trace_name, include_invisible_transitions)
-
-        et_bytes = ET.tostring(tree.getroot())
-        rough_xml = str(et_bytes)[2:-1].replace('\n', '')
-        reparsed = minidom.parseString(rough_xml)
-        pretty_xml = reparsed.toprettyxml(indent="  ").split("?>")[1][1:]
-        xml_declaration = '<?xml version="1.0" ?>\n'
-        comments = "<!-- This file has been generated with DALG:" \
-                   " The Data Aware Event Log Generator v{version} -->\n" \
-                   "<!-- https://github.com/DavidJilg/DALG -->\n".format(version=Global.DALG_VERSION)
-        return xml_declaration + comments + pretty_xml
-
-    def add_traces(self, root: ET.Element, event_log: EventLog, trace_name: str, include_invisible_transitions: bool):
-        for index, trace in enumerate(event_log.traces):
-            trace_element = ET.SubElement(root, "trace")
-            name = ET.SubElement(trace_element, "string")
-            name.set("key", "concept:name")
-            if len(event_log.traces) == 1:
-                if trace_name == "":
-                    name.set("value", "1")
-                else:
-                    name.set("value", trace_name)
-            else:
-                name.set("value", trace_name + str(index+1))
-            for variable in trace.variables:
-                var = ET.SubElement(trace_element, variable[2])
-                var.set("key", variable[0])
-                var.set("value", str(variable[1]))
-            for event in trace.events:
-                self.add_event(trace_element, event, include_invisible_transitions)
-
-    def add_event(self, trace_element: ET.Element, event: Event, include_invisible_transitions: bool):
-        if not event.from_invisible_transition or include_invisible_transitions:
-            event_element = ET.SubElement(trace_element, "event")
-            name = ET.SubElement(event_element, "string")
-            name.set("key", "concept:name")
-            name.set("value", event.name)
-            for variable in event.variables:
-                var_name, var_value, var_type = variable
-                var_element = ET.SubElement(event_element, var_type)
-                var_element.set("key", var_name)
-                var_element.set("value", str(var_value))
-
-    def init_element_tree(self, event_log: EventLog, include_invisible_transitions: bool, include_metadata: bool) ->\
-            ET.ElementTree:
-        root = ET.Element('log')
-        root.set("xes.version", "1.0")
-        root.set("xmlns", "http://www.xes-standard.org/")
-        root.set("creator", "DALG")
-
-        extension_concept = ET.SubElement(root, "extension")
-        extension_concept.set("name", "Concept")
-        extension_concept.set("prefix", "concept")
-        extension_concept.set("uri", "http://www.xes-standard.org/concept.xesext")
-
-        extension_time = ET.SubElement(root, "extension")
-        extension_time.set("name", "Time")
-        extension_time.set("prefix", "time")
-        extension_time.set("uri", "http://www.xes-standard.org/time.xesext")
+                     include_metadata: bool, indent: str = "  ") -> str:
+        file = io.StringIO()
+        self.write_event_log(file, event_log, trace_name, include_invisible_transitions,
+                             include_metadata, indent)
+        return file.getvalue()
+
+    def write_header(self, file: TextIO, event_log: EventLog, include_invisible_transitions: bool,
+                     include_metadata: bool, indent: str = "  ", with_xml_declaration: bool = True,
+                     metadata: list = None):
+        if with_xml_declaration:
+            file.write('<?xml version="1.0" ?>\n')
+        file.write("<!-- This file has been generated with DALG:"
+                   " The Data Aware Event Log Generator v{version} -->\n"
+                   "<!-- https://github.com/DavidJilg/DALG -->\n".format(version=Global.DALG_VERSION))
+        # ElementTree, which was used to write the files before, wrote the namespace first.
+        self.write_start_tag(file, "log", [("xmlns", "http://www.xes-standard.org/"),
+                                           ("xes.version", "1.0"),
+                                           ("creator", "DALG")], 0, indent)
+        self.write_element(file, "extension", [("name", "Concept"), ("prefix", "concept"),
+                                               ("uri", "http://www.xes-standard.org/concept.xesext")],
+                           1, indent)
+        self.write_element(file, "extension", [("name", "Time"), ("prefix", "time"),
+                                               ("uri", "http://www.xes-standard.org/time.xesext")],
+                           1, indent)
 
         if include_metadata:
-            self.add_metadata(root, event_log, include_invisible_transitions)
-
-        scope_event = ET.SubElement(root, "global")
-        scope_event.set("scope", "trace")
-
-        concept_name_trace = ET.SubElement(scope_event, "string")
-        concept_name_trace.set("key", "concept:name")
-        concept_name_trace.set("value", "DEFAULT")
-
-        scope_event = ET.SubElement(root, "global")
-        scope_event.set("scope", "event")
-
-        concept_name = ET.SubElement(scope_event, "string")
-        concept_name.set("key", "concept:name")
-        concept_name.set("value", "DEFAULT")
-
-        concept_time = ET.SubElement(scope_event, "date")
-        concept_time.set("key", "time:timestamp")
-        concept_time.set("value", "1970-01-01T01:00:00.000+01:00")
-
-        return ET.ElementTree(root)
-
-    def filter_invisible_transitions(self, event_log: EventLog):
-        new_event_log = deepcopy(event_log)
-        for trace in new_event_log.traces:
-            new_events = []
-            for event in trace.events:
-                if not event.from_invisible_transition:
-                    new_events.append(event)
-            trace.events = new_events
-        return new_event_log
-
-    def add_metadata(self, root: ET.Element, event_log_original: EventLog, include_invisible_transitions: bool):
-        if include_invisible_transitions:
-            event_log = event_log_original
+            if metadata is None:
+                metadata = self.get_metadata(event_log, include_invisible_transitions)
+            self.write_element(file, "extension",
+                               [("name", "General metadata"), ("prefix", "meta_general"),
+                                ("uri", "http://www.xes-standard.org/meta_general.xesext")], 1, indent)
+            self.write_element(file, "extension",
+                               [("name", "Metadata Concept"), ("prefix", "meta_concept"),
+                                ("uri", "http://www.xes-standard.org/meta_concept.xesext")], 1, indent)
+            for var_type, key, value in metadata:
+                self.write_element(file, var_type, [("key", key), ("value", str(value))], 1, indent)
+
+        self.write_start_tag(file, "global", [("scope", "trace")], 1, indent)
+        self.write_element(file, "string", [("key", "concept:name"), ("value", "DEFAULT")], 2, indent)
+        self.write_end_tag(file, "global", 1, indent)
+        self.write_start_tag(file, "global", [("scope", "event")], 1, indent)
+        self.write_element(file, "string", [("key", "concept:name"), ("value", "DEFAULT")], 2, indent)
+        self.write_element(file, "date", [("key", "time:timestamp"),
+                                          ("value", "1970-01-01T01:00:00.000+01:00")], 2, indent)
+        self.write_end_tag(file, "global", 1, indent)
+        self.write_element(file, "string", [("key", "concept:name"), ("value", event_log.name)], 1,
+                           indent)
+
+    def write_footer(self, file: TextIO, indent: str = "  "):
+        self.write_end_tag(file, "log", 0, indent)
+
+    def get_trace_name(self, trace_name: str, index: int, number_of_traces: int) -> str:
+        if number_of_traces == 1:
+            if trace_name == "":
+                return "1"
+            else:
+                return trace_name
         else:
-            event_log = self.filter_invisible_transitions(event_log_original)
-        extension_meta_general = ET.SubElement(root, "extension")
-        extension_meta_general.set("name", "General metadata")
-        extension_meta_general.set("prefix", "meta_general")
-        extension_meta_general.set("uri", "http://www.xes-standard.org/meta_general.xesext")
-
-        extension_meta_concept = ET.SubElement(root, "extension")
-        extension_meta_concept.set("name", "Metadata Concept")
-        extension_meta_concept.set("prefix", "meta_concept")
-        extension_meta_concept.set("uri", "http://www.xes-standard.org/meta_concept.xesext")
-
-        tmp = ET.SubElement(root, "int")
-        tmp.set("key", "meta_general:traces_total")
-        tmp.set("value", str(len(event_log.traces)))
-
-        number_of_events = 0
-        number_of_events_traces = []
-        for trace in event_log.traces:
-            number_of_events += len(trace.events)
-            number_of_events_traces.append(len(trace.events))
-        tmp = ET.SubElement(root, "int")
-        tmp.set("key", "meta_general:events_total")
-        tmp.set("value", str(number_of_events))
-
-        avg_events = sum(number_of_events_traces)/len(number_of_events_traces)
-        tmp = ET.SubElement(root, "float")
-        tmp.set("key", "meta_general:events_average")
-        tmp.set("value", str(avg_events))
-
+            return trace_name + str(index + 1)
+
+    def write_trace(self, file: TextIO, trace: Trace, name: str, include_invisible_transitions: bool,
+                    indent: str = "  "):
+        self.write_start_tag(file, "trace", [], 1, indent)
+        self.write_element(file, "string", [("key", "concept:name"), ("value", name)], 2, indent)
+        for var_name, var_value, var_type in trace.variables:
+            self.write_element(file, var_type, [("key", var_name),
+                                                ("value", self.get_value_string(var_value, var_type))],
+                               2, indent)
+        for event in trace.events:
+            self.write_event(file, event, include_invisible_transitions, indent)
+        self.write_end_tag(file, "trace", 1, indent)
+
+    def write_event(self, file: TextIO, event: Event, include_invisible_transitions: bool,
+                    indent: str = "  "):
+        if not event.from_invisible_transition or include_invisible_transitions:
+            self.write_start_tag(file, "event", [], 2, indent)
+            self.write_element(file, "string", [("key", "concept:name"), ("value", event.name)], 3,
+                               indent)
+            self.write_element(file, "date", [("key", "time:timestamp"),
+                                              ("value", self.timestamp_formatter.format_timestamp(
+                                                  event.timestamp, event.utc_offset))], 3, indent)
+            for var_name, var_value, var_type in event.variables:
+                self.write_element(file, var_type, [("key", var_name),
+                                                    ("value", self.get_value_string(var_value,
+                                                                                    var_type))],
+                                   3, indent)
+            self.write_end_tag(file, "event", 2, indent)
+
+    def get_value_string(self, value, var_type: str) -> str:
+        if var_type == "date":
+            return self.timestamp_formatter.format_date(value)
+        return str(value)
+
+    def write_start_tag(self, file: TextIO, tag: str, attributes: list, depth: int, indent: str):
+        file.write(indent * depth + "<" + tag + self.get_attribute_string(attributes) + ">"
+                   + self.get_newline(indent))
+
+    def write_end_tag(self, file: TextIO, tag: str, depth: int, indent: str):
+        file.write(indent * depth + "</" + tag + ">" + self.get_newline(indent))
+
+    def write_element(self, file: TextIO, tag: str, attributes: list, depth: int, indent: str):
+        file.write(indent * depth + "<" + tag + self.get_attribute_string(attributes) + "/>"
+                   + self.get_newline(indent))
+
+    def get_newline(self, indent: str) -> str:
+        if indent:
+            return "\n"
+        else:
+            return ""
+
+    def get_attribute_string(self, attributes: list) -> str:
+        attribute_string = ""
+        for name, value in attributes:
+            attribute_string += " " + name + '="' + escape(value, self.attribute_entities) + '"'
+        return attribute_string
+
+    def get_metadata(self, event_log: EventLog, include_invisible_transitions: bool) -> list:
+        # Returns (type, key, value) tuples. Events of invisible transitions are only counted if
+        # they are included in the event log.
+        return self.get_metadata_from_counts(
+            *event_log.get_metadata_counts(include_invisible_transitions))
+
+    def get_metadata_from_counts(self, number_of_events_traces: list, event_names_traces: list,
+                                 number_of_names: int) -> list:
+        number_of_events = sum(number_of_events_traces)
+        avg_events = sum(number_of_events_traces) / len(number_of_events_traces)
         min_events = min(number_of_events_traces)
         max_events = max(number_of_events_traces)
-        tmp = ET.SubElement(root, "int")
-        tmp.set("key", "meta_general:events_min")
-        tmp.set("value", str(min_events))
-
-        tmp = ET.SubElement(root, "int")
-        tmp.set("key", "meta_general:events_max")
-        tmp.set("value", str(max_events))
-
         number_of_events_sd = np.std(number_of_events_traces)
 
-        tmp = ET.SubElement(root, "float")
-        tmp.set("key", "meta_general:events_standard_deviation")
-        tmp.set("value", str(number_of_events_sd))
-
-        # Conept General
-        event_names = []
-        event_names_traces = []
-        for trace in event_log.traces:
-            event_names_tmp = []
-            for event in trace.events:
-                event_names.append(event.name)
-                event_names_tmp.append(event.name)
-
-            event_names_traces.append(len(list(dict.fromkeys(event_names_tmp))))
-
-        event_names = list(dict.fromkeys(event_names))
-        number_of_names = len(event_names)
-        tmp = ET.SubElement(root, "int")
-        tmp.set("key", "meta_concept:different_names_total")
-        tmp.set("value", str(number_of_names))
-
-        avg_event_names = sum(event_names_traces)/len(event_names_traces)
-        tmp = ET.SubElement(root, "float")
-        tmp.set("key", "meta_concept:different_names_average")
-        tmp.set("value", str(avg_event_names))
-
+        avg_event_names = sum(event_names_traces) / len(event_names_traces)
         event_names_sd = np.std(event_names_traces)
-        tmp = ET.SubElement(root, "float")
-        tmp.set("key", "meta_concept:different_names_standard_deviation")
-        tmp.set("value", str(event_names_sd))
-
         event_names_min = min(event_names_traces)
-        tmp = ET.SubElement(root, "int")
-        tmp.set("key", "meta_concept:different_names_min")
-        tmp.set("value", str(event_names_min))
-
         event_names_max = max(event_names_traces)
-        tmp = ET.SubElement(root, "int")
-        tmp.set("key", "meta_concept:different_names_max")
-        tmp.set("value", str(event_names_max))
-
-        tmp = ET.SubElement(root, "int")
-        tmp.set("key", "meta_concept:named_events_total")
-        tmp.set("value", str(number_of_events))
-
-        tmp = ET.SubElement(root, "float")
-        tmp.set("key", "meta_concept:named_events_average")
-        tmp.set("value", str(avg_events))
-
-        tmp = ET.SubElement(root, "float")
-        tmp.set("key", "meta_concept:named_events_standard_deviation")
-        tmp.set("value", str(number_of_events_sd))
-
-        tmp = ET.SubElement(root, "int")
-        tmp.set("key", "meta_concept:named_events_min")
-        tmp.set("value", str(min_events))
-
-        tmp = ET.SubElement(root, "int")
-        tmp.set("key", "meta_concept:named_events_max")
-        tmp.set("value", str(max_events))
-
-
 
+        return [("int", "meta_general:traces_total", len(number_of_events_traces)),
+                ("int", "meta_general:events_total", number_of_events),
+                ("float", "meta_general:events_average", avg_events),
+                ("int", "meta_general:events_min", min_events),
+                ("int", "meta_general:events_max", max_events),
+                ("float", "meta_general:events_standard_deviation", number_of_events_sd),
+                # Conept General
+                ("int", "meta_concept:different_names_total", number_of_names),
+                ("float", "meta_concept:different_names_average", avg_event_names),
+                ("float", "meta_concept:different_names_standard_deviation", event_names_sd),
+                ("int", "meta_concept:different_names_min", event_names_min),
+                ("int", "meta_concept:different_names_max", event_names_max),
+                ("int", "meta_concept:named_events_total", number_of_events),
+                ("float", "meta_concept:named_events_average", avg_events),
+                ("float", "meta_concept:named_events_standard_deviation", number_of_events_sd),
+                ("int", "meta_concept:named_events_min", min_events),
+                ("int", "meta_concept:named_events_max", max_events)]
@@ -0,0 +1,182 @@
+import numpy
+
+from src.jilg.Other import Global
+from src.jilg.Other.Global import print_summary_global
+
+'''
+The classes in this file are used to represent a guard string that has been compiled by the
+MilpSolver. A compiled guard is a tree of nodes that only has to be parsed once and can afterwards
+be evaluated repeatedly against a mapping of variable names to variable values.
+
+Brackets in the guard string are represented by GuardGroup nodes. If a variable that is read by
+the guard has no current value, the innermost group containing that variable evaluates to "True"
+if the group contains a "!=" operator and to "False" otherwise.
+'''
+
+
+class GuardNode:
+    def evaluate(self, values: dict, missing: set):
+        return None
+
+
+class GuardConstant(GuardNode):
+    value: object
+
+    def __init__(self, value):
+        self.value = value
+
+    def evaluate(self, values: dict, missing: set):
+        return self.value
+
+
+class GuardVariable(GuardNode):
+    name: str  # prime variables are stored with the trailing "'"
+
+    def __init__(self, name: str):
+        self.name = name
+
+    def evaluate(self, values: dict, missing: set):
+        return values.get(self.name)
+
+
+class GuardUnparsable(GuardNode):
+    guard_string: str
+
+    def __init__(self, guard_string: str):
+        # Reported once when the guard is compiled instead of on every evaluation.
+        self.guard_string = guard_string
+        Global.log_error(__file__, "Guard string could not be parsed: " + guard_string)
+
+    def evaluate(self, values: dict, missing: set):
+        return None
+
+
+class GuardGroup(GuardNode):
+    expression: GuardNode
+    variable_names: set  # variables that are not nested in a subgroup
+    subgroups: list
+    contains_not_equal: bool  # "!=" outside of subgroups
+
+    def __init__(self):
+        self.expression = GuardNode()
+        self.variable_names = set()
+        self.subgroups = []
+        self.contains_not_equal = False
+
+    def evaluate(self, values: dict, missing: set):
+        if missing and self.is_replaced(missing):
+            return self.not_equal_in_text(missing)
+        return self.expression.evaluate(values, missing)
+
+    def is_replaced(self, missing: set) -> bool:
+        return not self.variable_names.isdisjoint(missing)
+
+    def not_equal_in_text(self, missing: set) -> bool:
+        if self.contains_not_equal:
+            return True
+        for subgroup in self.subgroups:
+            if not subgroup.is_replaced(missing) and subgroup.not_equal_in_text(missing):
+                return True
+        return False
+
+
+class GuardOperation(GuardNode):
+    number_classes = [int, float, numpy.float32, numpy.int32, numpy.float64, numpy.int64]
+    operator: str
+    operands: list
+
+    def __init__(self, operator: str, operands: list):
+        self.operator = operator
+        self.operands = operands
+
+    def evaluate(self, values: dict, missing: set):
+        if self.operator == "&&":
+            for operand in self.operands:
+                if not operand.evaluate(values, missing):
+                    return False
+            return True
+        elif self.operator == "||":
+            for operand in self.operands:
+                if operand.evaluate(values, missing):
+                    return True
+            return False
+        elif self.operator in ["==", "!="]:
+            return self.evaluate_equality(values, missing)
+        elif self.operator in [">", ">=", "<", "<="]:
+            return self.evaluate_comparison(values, missing)
+        else:
+            return self.evaluate_arithmetic(values, missing)
+
+    def evaluate_equality(self, values: dict, missing: set) -> bool:
+        results = []
+        for operand in self.operands:
+            results.append(operand.evaluate(values, missing))
+        for i in range(1, len(results)):
+            if self.operator == "==" and results[0] != results[i]:
+                return False
+            elif self.operator == "!=" and results[0] == results[i]:
+                return False
+        return True
+
+    def evaluate_comparison(self, values: dict, missing: set) -> bool:
+        part0 = self.operands[0].evaluate(values, missing)
+        part1 = self.operands[1].evaluate(values, missing)
+        if type(part0) not in self.number_classes or type(part1) not in self.number_classes:
+            return False
+        elif self.operator == ">":
+            return part0 > part1
+        elif self.operator == ">=":
+            return part0 >= part1
+        elif self.operator == "<":
+            return part0 < part1
+        else:
+            return part0 <= part1
+
+    def evaluate_arithmetic(self, values: dict, missing: set):
+        value = self.operands[0].evaluate(values, missing)
+        if type(value) not in [int, float]:
+            return False
+        for operand in self.operands[1:]:
+            tmp = operand.evaluate(values, missing)
+            if type(tmp) not in [int, float]:
+                return False
+            elif self.operator == "-":
+                value -= tmp
+            elif self.operator == "+":
+                value += tmp
+            elif self.operator == "*":
+                value *= tmp
+            else:
+                value /= tmp
+        return value
+
+
+class CompiledGuard:
+    guard_string: str
+    root: GuardGroup
+    variable_names: list
+    prime_variable_names: list
+    always_true: bool
+
+    def print_summary(self, print_list_elements: bool = False):
+        print_summary_global(self, print_list_elements)
+
+    def __init__(self, guard_string: str):
+        self.guard_string = guard_string
+        self.root = GuardGroup()
+        self.variable_names = []
+        self.prime_variable_names = []
+        self.always_true = False
+
+    def __deepcopy__(self, memo):
+        # Compiled guards are never modified after compilation and can therefore be shared.
+        return self
+
+    def evaluate(self, values: dict):
+        if self.always_true:
+            return True
+        missing = set()
+        for name in self.variable_names:
+            if name not in values:
+                missing.add(name)
+        return self.root.evaluate(values, missing)
@@ -1,8 +1,6 @@
 from typing import Union
 
 import numpy as np
-import numpy.random
-from scipy import stats
 from scipy.stats import truncnorm
 
 from src.jilg.Other.Global import print_summary_global
@@ -10,10 +8,16 @@ from src.jilg.Other.Global import print_summary_global
 '''
 This class is used to generate random numeric values that follow a distribution that was specified
 by the user.
+
+The values are drawn from the random number generator that is passed to the distribution in blocks
+of block_size values, which are transformed with the inverse of the cumulative distribution
+function (ppf) of the truncated normal or exponential distribution. A new block is only drawn once
+all values of the previous block have been used.
 '''
 
 
 class Distribution:
+    block_size = 256
     mean: float
     standard_deviation: float
     minimum: float
@@ -23,9 +27,9 @@ class Distribution:
     has_maximum: bool
     has_minimum: bool
     distribution_type: str
-    generator: None
-    set_new_seed: bool
+    generator: Union[truncnorm, None]  # frozen truncated normal distribution
     rng: np.random.default_rng
+    samples: list  # remaining values of the current block in reversed order
 
     def print_summary(self, print_list_elements: bool = False):
         print_summary_global(self, print_list_elements)
@@ -34,8 +38,9 @@ class Distribution:
         if other_arguments["minimum"] == other_arguments["maximum"]:
             other_arguments["maximum"] += 1
         self.distribution_type = distribution_type
-        self.set_new_seed = True
         self.rng = rng
+        self.generator = None
+        self.samples = []
         if 'mean' not in other_arguments:
             other_arguments["mean"] = (other_arguments["maximum"] -
                                        other_arguments["minimum"]) / 2
@@ -75,14 +80,14 @@ class Distribution:
             self.has_standard_deviation = True
             if self.mean == 0:
                 self.mean = 0.0000000000000001
-            self.generator = stats.truncexpon(
-                b=(self.maximum - self.minimum) / self.standard_deviation,
-                loc=self.minimum,
-                scale=self.standard_deviation)
 
     def get_truncated_normal(self, mean: float, sd: float, low: float, upper: float) -> truncnorm:
         return truncnorm((low - mean) / sd, (upper - mean) / sd, loc=mean, scale=sd)
 
+    def set_rng(self, rng: np.random.Generator):
+        self.rng = rng
+        self.samples = []
+
     def get_next_int(self) -> int:
         return int(self.get_next_value())
 
@@ -90,13 +95,20 @@ class Distribution:
         return self.get_next_value()
 
     def get_next_value(self) -> Union[float, int]:
-        if self.set_new_seed:
-            numpy.random.seed(int(self.rng.uniform(0, 1000)))
-            self.set_new_seed = False
+        if not self.samples:
+            self.samples = self.get_samples(self.block_size).tolist()
+            self.samples.reverse()
+        return self.samples.pop()
+
+    def get_samples(self, size: int) -> np.ndarray:
         if self.distribution_type == "truncated_normal" or self.distribution_type == "normal":
-            return self.generator.rvs()
+            return self.generator.ppf(self.rng.random(size))
         elif self.distribution_type == "uniform":
-            return self.rng.uniform(self.minimum, self.maximum)
+            return self.rng.uniform(self.minimum, self.maximum, size)
         elif self.distribution_type == "exponential" or \
                 self.distribution_type == "truncated_exponential":
-            return self.generator.rvs()
+            # Exponential distribution with the standard deviation as scale that is truncated to
+            # the interval [minimum, maximum].
+            upper = (self.maximum - self.minimum) / self.standard_deviation
+            return self.minimum - self.standard_deviation * np.log1p(
+                self.rng.random(size) * np.expm1(-upper))
@@ -1,21 +1,47 @@
 from typing import Union
 
+import numpy
 
 from src.jilg.Other.Global import print_summary_global
 
 '''
 An instance of this class is used for every initial, current, and final marking in the internal
 model representation. 
+
+The current marking of a model is backed by a numpy vector that contains the token count of every
+place (in the order of Model.places). The token_places list of such a marking is derived from that
+vector on access, so firing a transition only has to update the vector.
 '''
 
 
 class Marking:
     name: str
-    token_places: list
+    token_list: list
+    place_ids: Union[None, list]
+    token_vector: Union[None, numpy.ndarray]
 
     def __init__(self, name: str):
         self.name = name
-        self.token_places = []
+        self.token_list = []
+        self.place_ids = None
+        self.token_vector = None
+
+    @property
+    def token_places(self) -> list:
+        if self.token_vector is not None:
+            return list(zip(self.place_ids, self.token_vector.tolist()))
+        return self.token_list
+
+    @token_places.setter
+    def token_places(self, token_places: list):
+        self.token_list = token_places
+        self.place_ids = None
+        self.token_vector = None
+
+    def set_token_vector(self, place_ids: list, token_vector: numpy.ndarray):
+        self.token_list = []
+        self.place_ids = place_ids
+        self.token_vector = token_vector
 
     def print_summary(self, print_list_elements: bool = False):
         print_summary_global(self, print_list_elements)
@@ -41,6 +67,13 @@ class Marking:
                         string += str(token_place)
             return string
 
+    def to_key(self) -> Union[bytes, tuple]:
+        # Hashable and immutable representation of the marking, e.g. to count how often a marking
+        # has been reached. Only keys of markings over the same places are comparable.
+        if self.token_vector is not None:
+            return self.token_vector.tobytes()
+        return tuple(self.token_list)
+
     def to_minimalistic_string(self) -> str:
         string = self.name + ": "
         for index, token_place in enumerate(self.token_places):
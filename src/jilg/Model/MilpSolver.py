@@ -1,11 +1,13 @@
-import numpy
 import re
-from copy import deepcopy
 from enum import Enum
 
+import numpy as np
 from PySide6.QtCore import QDateTime
+from scipy.optimize import Bounds, LinearConstraint, milp
 
-from src.jilg.Model.Variable import Variable, VariableTypes
+from src.jilg.Model.CompiledGuard import CompiledGuard, GuardConstant, GuardGroup, GuardNode, \
+    GuardOperation, GuardUnparsable, GuardVariable
+from src.jilg.Model.Variable import VariableTypes
 
 
 class Operators(Enum):
@@ -30,6 +32,11 @@ class Operators(Enum):
 '''
 This class is used to determine if the current status of a model (variable values) satisfy a guard
 string. Additionally it is used to determine if the preconditions of a variable dependency are met.
+Guard strings are compiled to a CompiledGuard the first time they are evaluated. The compiled guards
+are cached so that later evaluations only have to look up the current variable values.
+Conjunctions of linear (in)equalities over numeric and date variables can also be solved as a mixed
+integer linear program (see solve_linear_guards), which either returns values that satisfy all
+guards or shows that no such values exist.
 '''
 
 
@@ -39,119 +46,335 @@ class MilpSolver:
     operators_last_single = [Operators.GREATER_EQUAL, Operators.LESSER_EQUAL, Operators.GREATER,
                              Operators.LESSER]
     operators_math = [Operators.MINUS, Operators.PLUS, Operators.TIMES, Operators.DIVIDE]
-    variables: list
+    operator_pattern = r"&&|\|\||==|!=|<=|>=|<|>|-|\+|\*|/"
+    milp_variable_types = [VariableTypes.INT, VariableTypes.LONG, VariableTypes.DOUBLE,
+                           VariableTypes.DATE]
+    strict_inequality_offset = 1e-6
     variables_names: list
+    operands: dict
+    groups: dict
+    compiled_guards: dict
 
     def __init__(self):
-        self.variables = []
         self.variables_names = []
-
-    def compile_and_evaluate_string(self, guard_string, variables, transition=None, value_gen=None):
-        self.__init__()
+        self.operands = {}
+        self.groups = {}
+        self.compiled_guards = {}
+
+    def compile_and_evaluate_string(self, guard_string, variables, transition=None, value_gen=None,
+                                    variable_values=None):
+        # variable_values is a read-only snapshot (name -> value) that can be shared by all guards
+        # that are evaluated in the same simulation step.
         if guard_string is None:
             return True
+        compiled_guard = self.get_compiled_guard(guard_string, variables)
+        if compiled_guard.always_true:
+            return True
+        if variable_values is None:
+            variable_values = self.get_variable_values(variables)
+        if compiled_guard.prime_variable_names:
+            variable_values = dict(variable_values)
+            self.add_prime_variable_values(variable_values, compiled_guard, variables, transition,
+                                           value_gen)
+        return compiled_guard.evaluate(variable_values)
+
+    def get_compiled_guard(self, guard_string, variables) -> CompiledGuard:
+        variable_names = []
+        for variable in variables:
+            variable_names.append(variable.name)
+        key = (guard_string, tuple(variable_names))
+        if key not in self.compiled_guards:
+            self.compiled_guards[key] = self.compile_guard_string(guard_string, variable_names)
+        return self.compiled_guards[key]
+
+    def get_variable_values(self, variables):
+        values = {}
+        for variable in variables:
+            if variable.has_current_value:
+                values[variable.name] = variable.value
+        return values
+
+    def add_prime_variable_values(self, values, compiled_guard, variables, transition, value_gen):
         prime_variables = []
         for variable in variables:
-            if variable.name + "'" in guard_string:
+            if variable.name in compiled_guard.prime_variable_names:
                 prime_variables.append(variable)
-        processed_guard_string = self.replace_prime_variables(guard_string, prime_variables,
-                                                              transition, value_gen)
-
-        self.variables = deepcopy(variables)
-        processed_guard_string = self.remove_spaces(processed_guard_string).replace('\n', '')
-        if guard_string == "":
-            return True
-        processed_guard_string = self.check_for_negative_numbers(processed_guard_string)
-        for variable in self.variables:
-            self.variables_names.append(variable.name)
-            if not variable.has_current_value:
-                if variable.name in processed_guard_string:
-                    processed_guard_string = self.deal_with_missing_values(processed_guard_string,
-                                                                           variable.name)
-        return self.evaluate_guard_string(processed_guard_string)
-
-    def replace_prime_variables(self, guard_string, prime_variables, transition,
-                                value_gen):
-        if not prime_variables:
-            return guard_string
-        else:
-            processed_guard_string = guard_string
         if transition is not None:
             value_gen.generate_variable_values(transition, prime_variables=prime_variables)
+            for variable in prime_variables:
+                values[variable.name + "'"] = self.get_prime_variable_value(variable, transition)
+
+    def get_prime_variable_value(self, variable, transition):
+        if variable.type == VariableTypes.DATE:
+            return int(variable.get_correct_next_value(transition.id))
+        else:
+            return self.parse_constant(variable.get_next_value_string(transition))
+
+    def solve_linear_guards(self, guard_strings, variables, solved_variables):
+        # Searches values for the solved_variables for which all guards are satisfied. Returns
+        # None if the guards can not be translated into linear constraints over these variables,
+        # (False, None) if the constraints are infeasible and (True, values) otherwise. The values
+        # of integer and date variables are integers and all values lie within the minimum and
+        # maximum of the semantic information of the variable (if they form a valid interval).
+        variable_indexes = {}
+        for variable in solved_variables:
+            if variable.type not in self.milp_variable_types:
+                return None
+            variable_indexes[variable.name] = len(variable_indexes)
+        rows = []
+        for guard_string in guard_strings:
+            compiled_guard = self.get_compiled_guard(guard_string, variables)
+            if compiled_guard.always_true:
+                continue
+            if compiled_guard.prime_variable_names:
+                return None
+            if not self.add_linear_constraints(compiled_guard.root, variable_indexes, rows):
+                return None
 
-        for variable in prime_variables:
-            processed_guard_string = processed_guard_string.replace(variable.name + "'",
-                                                                    variable.get_next_value_string(transition))
-        return processed_guard_string
-
-    def deal_with_missing_values(self, guard_string, variable_name):
-        edited_string = guard_string
-        index = edited_string.find(variable_name)
-        while index != -1:
-            edited_string = self.replace_missing_value(edited_string, index, variable_name)
-            index = edited_string.find(variable_name)
-        return edited_string
-
-    def replace_missing_value(self, string, index, variable_name):
-        true_string = 'true'
-        false_string = 'false'
-        if "(" in string:
-            left_bracket_index, right_bracket_index = self.find_brackets(string, index,
-                                                                         len(variable_name))
-            if left_bracket_index == 0:
-                left_string = "("
+        integrality = np.zeros(len(solved_variables))
+        lower_bounds = np.full(len(solved_variables), -np.inf)
+        upper_bounds = np.full(len(solved_variables), np.inf)
+        for index, variable in enumerate(solved_variables):
+            if variable.type != VariableTypes.DOUBLE:
+                integrality[index] = 1
+            if not hasattr(variable, "semantic_information"):
+                continue
+            semantic_information = variable.semantic_information
+            if semantic_information.has_min and semantic_information.has_max and \
+                    semantic_information.min <= semantic_information.max:
+                lower_bounds[index] = semantic_information.min
+                upper_bounds[index] = semantic_information.max
+        constraints = []
+        if rows:
+            matrix = np.zeros((len(rows), len(solved_variables)))
+            row_lower_bounds = np.full(len(rows), -np.inf)
+            row_upper_bounds = np.full(len(rows), np.inf)
+            for row_index, (coefficients, operator, bound) in enumerate(rows):
+                for name, coefficient in coefficients.items():
+                    matrix[row_index, variable_indexes[name]] = coefficient
+                row_upper_bounds[row_index] = self.get_constraint_bound(
+                    coefficients, operator, bound, solved_variables, variable_indexes)
+                if operator == "==":
+                    row_lower_bounds[row_index] = bound
+            constraints.append(LinearConstraint(matrix, row_lower_bounds, row_upper_bounds))
+
+        result = milp(np.zeros(len(solved_variables)), integrality=integrality,
+                      bounds=Bounds(lower_bounds, upper_bounds), constraints=constraints)
+        if result.status == 2:
+            return False, None
+        elif result.x is None:
+            return None
+        values = {}
+        for index, variable in enumerate(solved_variables):
+            if integrality[index]:
+                values[variable.name] = int(round(result.x[index]))
             else:
-                left_string = string[0:left_bracket_index + 1]
-            if right_bracket_index == len(string) - 1:
-                right_string = ")"
+                values[variable.name] = float(result.x[index])
+        return True, values
+
+    def add_linear_constraints(self, node, variable_indexes, rows) -> bool:
+        # Adds the constraints of a guard (or a part of it) as (coefficients, operator, bound)
+        # tuples, i.e. sum(coefficients[name] * name) operator bound with the operator "<=", "<" or
+        # "==". Returns False if the node is not a conjunction of linear (in)equalities.
+        if isinstance(node, GuardGroup):
+            return self.add_linear_constraints(node.expression, variable_indexes, rows)
+        elif not isinstance(node, GuardOperation):
+            return False
+        elif node.operator == "&&":
+            for operand in node.operands:
+                if not self.add_linear_constraints(operand, variable_indexes, rows):
+                    return False
+            return True
+        elif node.operator not in ["==", ">", ">=", "<", "<="]:
+            return False
+        expressions = []
+        for operand in node.operands:
+            expression = self.get_linear_expression(operand, variable_indexes)
+            if expression is None:
+                return False
+            expressions.append(expression)
+        if node.operator in [">", ">="]:
+            expressions.reverse()
+        for expression in expressions[1:]:
+            # expressions[0] operator expression => left side - right side operator constant
+            coefficients = dict(expressions[0][0])
+            for name, coefficient in expression[0].items():
+                coefficients[name] = coefficients.get(name, 0.0) - coefficient
+            operator = node.operator.replace(">", "<")
+            rows.append((coefficients, operator, expression[1] - expressions[0][1]))
+        return True
+
+    def get_linear_expression(self, node, variable_indexes):
+        # Returns the node as (coefficients, constant) or None if the node is not linear.
+        if isinstance(node, GuardGroup):
+            return self.get_linear_expression(node.expression, variable_indexes)
+        elif isinstance(node, GuardConstant):
+            if type(node.value) in [int, float]:
+                return {}, float(node.value)
+            return None
+        elif isinstance(node, GuardVariable):
+            if node.name in variable_indexes:
+                return {node.name: 1.0}, 0.0
+            return None
+        elif not isinstance(node, GuardOperation) or node.operator not in ["+", "-", "*", "/"]:
+            return None
+        expressions = []
+        for operand in node.operands:
+            expression = self.get_linear_expression(operand, variable_indexes)
+            if expression is None:
+                return None
+            expressions.append(expression)
+        coefficients, constant = dict(expressions[0][0]), expressions[0][1]
+        for other_coefficients, other_constant in expressions[1:]:
+            if node.operator in ["+", "-"]:
+                sign = 1.0 if node.operator == "+" else -1.0
+                for name, coefficient in other_coefficients.items():
+                    coefficients[name] = coefficients.get(name, 0.0) + sign * coefficient
+                constant += sign * other_constant
+            elif node.operator == "*" and not other_coefficients:
+                for name in coefficients:
+                    coefficients[name] *= other_constant
+                constant *= other_constant
+            elif node.operator == "*" and not coefficients:
+                factor = constant
+                coefficients = {}
+                for name, coefficient in other_coefficients.items():
+                    coefficients[name] = coefficient * factor
+                constant = other_constant * factor
+            elif node.operator == "/" and not other_coefficients and other_constant != 0:
+                for name in coefficients:
+                    coefficients[name] /= other_constant
+                constant /= other_constant
             else:
-                right_string = string[right_bracket_index:]
-            replacement_part = string[left_bracket_index + 1: right_bracket_index]
+                return None
+        return coefficients, constant
+
+    def get_constraint_bound(self, coefficients, operator, bound, solved_variables,
+                             variable_indexes):
+        # Strict inequalities are tightened by one if the left side can only take integer values
+        # and by a small offset otherwise.
+        if operator != "<":
+            return bound
+        for name, coefficient in coefficients.items():
+            if solved_variables[variable_indexes[name]].type == VariableTypes.DOUBLE or \
+                    coefficient != int(coefficient):
+                return bound - self.strict_inequality_offset
+        return np.ceil(bound) - 1
+
+    def compile_guard_string(self, guard_string, variable_names) -> CompiledGuard:
+        compiled_guard = CompiledGuard(guard_string)
+        if guard_string == "":
+            compiled_guard.always_true = True
+            return compiled_guard
+        self.variables_names = variable_names
+        self.operands = {}
+        self.groups = {}
+        processed_guard_string = guard_string
+        for variable_name in variable_names:
+            self.operands[variable_name] = GuardVariable(variable_name)
+            if variable_name + "'" in processed_guard_string:
+                placeholder = "______PV_______" + str(len(compiled_guard.prime_variable_names))
+                processed_guard_string = processed_guard_string.replace(variable_name + "'",
+                                                                        placeholder)
+                self.operands[placeholder] = GuardVariable(variable_name + "'")
+                compiled_guard.prime_variable_names.append(variable_name)
 
+        processed_guard_string = self.remove_spaces(processed_guard_string).replace('\n', '')
+        processed_guard_string, variable_tupels = \
+            self.check_for_negative_numbers(processed_guard_string)
+        for variable_tuple in variable_tupels:
+            self.operands[variable_tuple[0]] = GuardConstant(float(variable_tuple[1]))
+
+        compiled_guard.root = self.compile_group(processed_guard_string, [])
+        compiled_guard.variable_names = self.get_group_variable_names(compiled_guard.root)
+        return compiled_guard
+
+    def get_group_variable_names(self, group):
+        variable_names = list(group.variable_names)
+        for subgroup in group.subgroups:
+            for variable_name in self.get_group_variable_names(subgroup):
+                if variable_name not in variable_names:
+                    variable_names.append(variable_name)
+        return variable_names
+
+    def compile_group(self, guard_string, brackets) -> GuardGroup:
+        group = GuardGroup()
+        if '(' in guard_string:
+            guard_string, brackets = self.replace_brackets(guard_string, brackets)
+        group.contains_not_equal = Operators.NOT_EQUAL.value in guard_string
+        for operand in re.split(self.operator_pattern, guard_string):
+            if operand in self.variables_names:
+                group.variable_names.add(operand)
+            elif self.is_bracket(operand, brackets):
+                self.groups[operand] = self.compile_group(brackets[int(operand[7:])], brackets)
+                group.subgroups.append(self.groups[operand])
+        group.expression = self.compile_expression(guard_string)
+        return group
+
+    def is_bracket(self, string, brackets):
+        return string.startswith("bracket") and string[7:].isdigit() and \
+            int(string[7:]) < len(brackets)
+
+    def compile_expression(self, guard_string) -> GuardNode:
+        node = self.compile_single_value(guard_string)
+        if node is not None:
+            return node
+        for operator in self.operators_last:
+            if self.only_one_operator_type(guard_string, operator):
+                return self.compile_operation(guard_string, operator)
+        for operator in self.operators_last_single:
+            if self.only_one(guard_string, operator):
+                return self.compile_operation(guard_string, operator)
+        for operator in self.operators_math:
+            if self.only_one_operator_type(guard_string, operator):
+                return self.compile_operation(guard_string, operator)
+        if self.no_operators_in_string(guard_string):
+            return self.compile_bracket(guard_string)
+        return GuardUnparsable(guard_string)
+
+    def compile_operation(self, guard_string, operator) -> GuardOperation:
+        operands = []
+        for part in guard_string.split(operator.value):
+            operands.append(self.compile_expression(part))
+        return GuardOperation(operator.value, operands)
+
+    def compile_bracket(self, guard_string) -> GuardNode:
+        if guard_string in self.groups:
+            return self.groups[guard_string]
         else:
-            replacement_part = string
-            left_string, right_string = "", ""
+            return GuardUnparsable(guard_string)
 
-        if "!=" in replacement_part:
-            replacement_part = true_string
-            return left_string + replacement_part + right_string
-        else:
-            replacement_part = false_string
-            return left_string + replacement_part + right_string
-
-    def find_brackets(self, string, index, var_length):
-        left_index = -1
-        right_index = -1
-        current_index = index
-        bracket_count = 0
-        while current_index >= 0:
-            if string[current_index] == "(" and bracket_count == 0:
-                left_index = current_index
-                break
-            elif string[current_index] == ")":
-                bracket_count += 1
-                current_index -= 1
-            elif string[current_index] == "(":
-                bracket_count -= 1
-                current_index -= 1
-            else:
-                current_index -= 1
+    def compile_single_value(self, guard_string) -> GuardNode:
+        for operator in self.operator_values:
+            if operator != "-" and operator != "+" and operator in guard_string:
+                return None
+        if guard_string in self.operands:
+            return self.operands[guard_string]
+        value = self.parse_constant(guard_string)
+        if value is not None:
+            return GuardConstant(value)
+        return None
 
-        bracket_count = 0
-        current_index = index + var_length
-        while current_index < len(string):
-            if string[current_index] == ")" and bracket_count == 0:
-                right_index = current_index
-                break
-            elif string[current_index] == "(":
-                bracket_count += 1
-                current_index += 1
-            elif string[current_index] == ")":
-                bracket_count -= 1
-                current_index += 1
-            else:
-                current_index += 1
-        return left_index, right_index
+    def parse_constant(self, string):
+        if self.check_int(string):
+            return int(string)
+        elif self.check_float(string):
+            return float(string)
+        elif self.check_string(string):
+            try:
+                date = QDateTime.fromString(string[1:-1], "yyyy-MM-ddThh:mm:ss")
+                if date.isNull():
+                    return string[1:-1]
+                else:
+                    return date.toSecsSinceEpoch()
+            except:
+                return string[1:-1]
+
+        elif string in ["FALSE", "false", "False"]:
+            return False
+        elif string in ["TRUE", "true", "True"]:
+            return True
+        return None
 
     def remove_spaces(self, string):
         lst = string.split('"')
@@ -163,9 +386,9 @@ class MilpSolver:
     def check_for_negative_numbers(self, guard_string):
         minus_indices = self.check_for_non_operator_minuses(guard_string)
         if not minus_indices:
-            return guard_string
+            return guard_string, []
         else:
-            return self.replace_negative_numbers_and_add_variables(guard_string, minus_indices)
+            return self.replace_negative_numbers(guard_string, minus_indices)
 
     def check_for_non_operator_minuses(self, guard_string):
         single_minuses_indices = []
@@ -211,15 +434,6 @@ class MilpSolver:
                 minus_index)
         return guard_string, variable_tupels
 
-    def replace_negative_numbers_and_add_variables(self, guard_string, indices):
-        guard_string, variable_tupels = self.replace_negative_numbers(guard_string, indices)
-        for variable_tuple in variable_tupels:
-            self.variables.append(
-                Variable(variable_tuple[0], VariableTypes.DOUBLE.value, None, None,
-                         None, None, None, None, float(variable_tuple[1]), True)
-            )
-        return guard_string
-
     def is_operator_char(self, char):
         for operator_value in self.operator_values:
             if operator_value[0] == char:
@@ -238,188 +452,6 @@ class MilpSolver:
             if string in self.operator_values or string == '(':
                 return True
 
-    def check_for_single_value(self, guard_string):
-        for operator in self.operator_values:
-            if operator != "-" and operator != "+" and operator in guard_string:
-                return None
-        if guard_string in self.variables_names:
-            return self.variable_value_by_name(guard_string)
-        elif self.check_int(guard_string):
-            return int(guard_string)
-        elif self.check_float(guard_string):
-            return float(guard_string)
-        elif self.check_string(guard_string):
-            try:
-                date = QDateTime.fromString(guard_string[1:-1], "yyyy-MM-ddThh:mm:ss")
-                if date.isNull():
-                    return guard_string[1:-1]
-                else:
-                    return date.toSecsSinceEpoch()
-            except:
-                return guard_string[1:-1]
-
-        elif guard_string in ["FALSE", "false", "False"]:
-            return False
-        elif guard_string in ["TRUE", "true", "True"]:
-            return True
-        return None
-
-    def evaluate_guard_string(self, guard_string, brackets=None):
-        if brackets is None:
-            brackets = []
-        if '(' in guard_string or ')' in guard_string:
-            guard_string, brackets = self.replace_brackets(guard_string, brackets)
-            return self.evaluate_guard_string(guard_string, brackets)
-        else:
-            value = self.check_for_single_value(guard_string)
-            if value is not None:
-                return value
-            else:
-                return self.deal_with_operators(guard_string, brackets)
-
-    def deal_with_operators(self, guard_string, brackets):
-        for operator in self.operators_last:
-            if self.only_one_operator_type(guard_string, operator):
-                return self.evaluate_brackets(guard_string, brackets, operator)
-        for operator in self.operators_last_single:
-            if self.only_one(guard_string, operator):
-                return self.evaluate_brackets(guard_string, brackets, operator)
-        for operator in self.operators_math:
-            if self.only_one_operator_type(guard_string, operator):
-                return self.evaluate_brackets(guard_string, brackets, operator)
-        if self.no_operators_in_string(guard_string):
-            return self.evaluate_brackets(guard_string, brackets, Operators.NONE)
-        print("THIS SHOULD NOT BE REACHED! Guard String:" + guard_string)
-
-    def evaluate_brackets_with_and(self, parts, brackets):
-        for part in parts:
-            if not self.evaluate_guard_string(part, brackets):
-                return False
-        return True
-
-    def evaluate_brackets_with_or(self, parts, brackets):
-        for part in parts:
-            if self.evaluate_guard_string(part, brackets):
-                return True
-        return False
-
-    def evaluate_brackets_with_equal(self, parts, brackets):
-        results = []
-        for part in parts:
-            results.append(self.evaluate_guard_string(part, brackets))
-        for i in range(1, len(results)):
-            if results[0] != results[i]:
-                return False
-        return True
-
-    def evaluate_brackets_with_not_equal(self, parts, brackets):
-        results = []
-        for part in parts:
-            results.append(self.evaluate_guard_string(part, brackets))
-        for i in range(1, len(results)):
-            if results[0] == results[i]:
-                return False
-        return True
-
-    def evaluate_brackets_with_last_operator(self, parts, brackets, operator):
-        if operator == Operators.AND:
-            return self.evaluate_brackets_with_and(parts, brackets)
-        elif operator == Operators.OR:
-            return self.evaluate_brackets_with_or(parts, brackets)
-        elif operator == Operators.EQUAL:
-            return self.evaluate_brackets_with_equal(parts, brackets)
-        elif operator == Operators.NOT_EQUAL:
-            return self.evaluate_brackets_with_not_equal(parts, brackets)
-
-    def evaluate_brackets_with_last_single_operator(self, parts, brackets, operator):
-        part0 = self.evaluate_guard_string(parts[0], brackets)
-        part1 = self.evaluate_guard_string(parts[1], brackets)
-        number_classes = [int, float, numpy.float32, numpy.int32, numpy.float64, numpy.float32, numpy.int64]
-        if type(part0) not in number_classes or type(part1) not in number_classes:
-            return False
-        elif operator == Operators.GREATER:
-            return part0 > part1
-        elif operator == Operators.GREATER_EQUAL:
-            return part0 >= part1
-        elif operator == Operators.LESSER:
-            return part0 < part1
-        elif operator == Operators.LESSER_EQUAL:
-            return part0 <= part1
-
-    def evaluate_brackets_with_minus(self, parts, brackets):
-        value = self.evaluate_guard_string(parts[0], brackets)
-        if type(value) not in [int, float]:
-            return False
-        for index, part in enumerate(parts):
-            if index != 0:
-                tmp = self.evaluate_guard_string(parts[index], brackets)
-                if type(tmp) not in [int, float]:
-                    return False
-                else:
-                    value -= tmp
-        return value
-
-    def evaluate_brackets_with_plus(self, parts, brackets):
-        value = self.evaluate_guard_string(parts[0], brackets)
-        if type(value) not in [int, float]:
-            return False
-        for index, part in enumerate(parts):
-            if index != 0:
-                tmp = self.evaluate_guard_string(parts[index], brackets)
-                if type(tmp) not in [int, float]:
-                    return False
-                else:
-                    value += self.evaluate_guard_string(parts[index], brackets)
-        return value
-
-    def evaluate_brackets_with_times(self, parts, brackets):
-        value = self.evaluate_guard_string(parts[0], brackets)
-        if type(value) not in [int, float]:
-            return False
-        for index, part in enumerate(parts):
-            if index != 0:
-                tmp = self.evaluate_guard_string(parts[index], brackets)
-                if type(tmp) not in [int, float]:
-                    return False
-                else:
-                    value *= self.evaluate_guard_string(parts[index], brackets)
-        return value
-
-    def evaluate_brackets_with_divide(self, parts, brackets):
-        value = self.evaluate_guard_string(parts[0], brackets)
-        if type(value) not in [int, float]:
-            return False
-        for index, part in enumerate(parts):
-            if index != 0:
-                tmp = self.evaluate_guard_string(parts[index], brackets)
-                if type(tmp) not in [int, float]:
-                    return False
-                else:
-                    value /= self.evaluate_guard_string(parts[index], brackets)
-        return value
-
-    def evaluate_brackets_with_arithmetic_operator(self, parts, brackets, operator):
-        if operator == Operators.MINUS:
-            return self.evaluate_brackets_with_minus(parts, brackets)
-        elif operator == Operators.PLUS:
-            return self.evaluate_brackets_with_plus(parts, brackets)
-        elif operator == Operators.TIMES:
-            return self.evaluate_brackets_with_times(parts, brackets)
-        elif operator == Operators.DIVIDE:
-            return self.evaluate_brackets_with_divide(parts, brackets)
-
-    def evaluate_brackets(self, guard_string, brackets, operator):
-        if operator != Operators.NONE:
-            parts = guard_string.split(operator.value)
-            if operator in self.operators_last:
-                return self.evaluate_brackets_with_last_operator(parts, brackets, operator)
-            elif operator in self.operators_last_single:
-                return self.evaluate_brackets_with_last_single_operator(parts, brackets, operator)
-            else:
-                return self.evaluate_brackets_with_arithmetic_operator(parts, brackets, operator)
-        else:
-            return self.evaluate_bracket(guard_string, brackets)
-
     def check_int(self, string):
         if string[0] in ('-', '+'):
             return string[1:].isdigit()
@@ -438,35 +470,6 @@ class MilpSolver:
         else:
             return False
 
-    def variable_value_by_name(self, name):
-        for variable in self.variables:
-            if name == variable.name:
-                if variable.has_current_value:
-                    if variable.type == VariableTypes.DATE:
-                        return variable.value
-                    else:
-                        return variable.value
-                else:
-                    return self.replacement_value(variable)
-        else:
-            return None
-
-    def replacement_value(self, variable):
-        if variable.type == VariableTypes.DATE:
-            return 253370761260
-        elif variable.type in [VariableTypes.INT, VariableTypes.LONG]:
-            return -123456789
-        elif variable.type == VariableTypes.STRING:
-            return "__UNDEFINED1701__"
-        elif variable.type == VariableTypes.BOOL:
-            return False
-        elif variable.type == VariableTypes.DOUBLE:
-            return -123456789.0
-
-    def evaluate_bracket(self, guard_string, brackets):
-        bracket_id = int(guard_string[7:])
-        return self.evaluate_guard_string(brackets[bracket_id], brackets)
-
     def only_one(self, string, operator):
         return string.count(operator.value) == 1
 
@@ -1,9 +1,12 @@
 from copy import deepcopy
 from typing import Union
 
+import numpy
+
 from src.jilg.Model.Arc import Arc
 from src.jilg.Model.Marking import Marking
 from src.jilg.Model.Place import Place
+from src.jilg.Model.ReachabilityGraph import ReachabilityGraph
 from src.jilg.Model.Transition import Transition
 from src.jilg.Model.Variable import Variable
 from src.jilg.Other.Global import print_summary_global
@@ -13,6 +16,13 @@ from src.jilg.Simulation.ValueGenerator import ValueGenerator
 This class is used to represent the model that is currently loaded. The PnmlReader will create an
 instance of this class and of all subcomponents, e.g. places, transitions, when a model file is
 loaded.
+
+The structure of the net is additionally stored as pre and post incidence matrices (one row per
+transition, one column per place) that are built from the arcs of the model. Together with the
+token vector of the current marking they allow to determine all enabled transitions with a single
+vectorized comparison and to fire a transition with a single vector addition. The reachability
+graph of the net (see ReachabilityGraph) is built on top of these matrices and is kept until the
+matrices are rebuilt.
 '''
 
 
@@ -27,6 +37,18 @@ class Model:
     initial_marking: Marking
     current_marking: Union[Marking, None]
     final_markings: list
+    nodes_by_id: dict
+    nodes_by_name: dict
+    variables_by_name: dict
+    arcs_by_id: dict
+    place_indexes: dict
+    transition_indexes: dict
+    pre_matrix: Union[None, numpy.ndarray]
+    post_matrix: Union[None, numpy.ndarray]
+    change_matrix: Union[None, numpy.ndarray]
+    final_marking_vectors: list
+    reachability_graph: Union[None, ReachabilityGraph]
+    event_attributes: dict  # transition id -> variables included in its events (see Event)
 
     def __init__(self, name: str):
         self.name = name
@@ -38,13 +60,100 @@ class Model:
         self.arcs = []
         self.current_marking = None
         self.final_markings = []
+        self.nodes_by_id = {}
+        self.nodes_by_name = {}
+        self.variables_by_name = {}
+        self.arcs_by_id = {}
+        self.place_indexes = {}
+        self.transition_indexes = {}
+        self.pre_matrix = None
+        self.post_matrix = None
+        self.change_matrix = None
+        self.final_marking_vectors = []
+        self.reachability_graph = None
+        self.event_attributes = {}
+
+    def add_place(self, place: Place):
+        self.places.append(place)
+        self.index_node(place)
+
+    def add_transition(self, transition: Transition):
+        self.transitions.append(transition)
+        self.index_node(transition)
+
+    def add_variable(self, variable: Variable):
+        self.variables.append(variable)
+        self.index_variable(variable)
+
+    def add_arc(self, arc: Arc):
+        self.arcs.append(arc)
+        self.arcs_by_id.setdefault(arc.id, arc)
+
+    def update_indexes(self):
+        # Has to be called whenever ids or names are changed after the elements have been added,
+        # e.g. when the PnmlReader replaces invalid variable names. Like the former linear scans,
+        # the first matching element wins and transitions take precedence over places.
+        self.nodes_by_id = {}
+        self.nodes_by_name = {}
+        for node in self.transitions + self.places:
+            self.index_node(node)
+        self.variables_by_name = {}
+        for variable in self.variables:
+            self.index_variable(variable)
+        self.arcs_by_id = {}
+        for arc in self.arcs:
+            self.arcs_by_id.setdefault(arc.id, arc)
+
+    def index_node(self, node: Union[Place, Transition]):
+        for index, key in [(self.nodes_by_id, node.id), (self.nodes_by_name, node.name)]:
+            if key not in index or (type(node) is Transition and type(index[key]) is Place):
+                index[key] = node
+
+    def index_variable(self, variable: Variable):
+        self.variables_by_name.setdefault(variable.name, variable)
+        self.variables_by_name.setdefault(variable.original_name, variable)
+
+    def build_incidence_matrices(self):
+        self.place_indexes = {}
+        for index, place in enumerate(self.places):
+            self.place_indexes.setdefault(place.id, index)
+        self.transition_indexes = {}
+        for index, transition in enumerate(self.transitions):
+            self.transition_indexes.setdefault(transition.id, index)
+        self.pre_matrix = numpy.zeros((len(self.transitions), len(self.places)), dtype=int)
+        self.post_matrix = numpy.zeros((len(self.transitions), len(self.places)), dtype=int)
+        for arc in self.arcs:
+            if arc.source in self.place_indexes and arc.target in self.transition_indexes:
+                self.pre_matrix[self.transition_indexes[arc.target],
+                                self.place_indexes[arc.source]] += 1
+            elif arc.source in self.transition_indexes and arc.target in self.place_indexes:
+                self.post_matrix[self.transition_indexes[arc.source],
+                                 self.place_indexes[arc.target]] += 1
+        self.change_matrix = self.post_matrix - self.pre_matrix
+        self.final_marking_vectors = []
+        for final_marking in self.final_markings:
+            self.final_marking_vectors.append(self.get_marking_vector(final_marking))
+        self.reachability_graph = None
+
+    def get_reachability_graph(self) -> ReachabilityGraph:
+        if self.reachability_graph is None:
+            self.reachability_graph = ReachabilityGraph(self)
+        return self.reachability_graph
+
+    def get_marking_vector(self, marking: Marking) -> (numpy.ndarray, numpy.ndarray):
+        place_indexes = []
+        token_counts = []
+        for token_place in marking.token_places:
+            place_indexes.append(self.place_indexes[token_place[0]])
+            token_counts.append(token_place[1])
+        return numpy.array(place_indexes, dtype=int), numpy.array(token_counts, dtype=int)
 
     def reset(self):
         self.current_marking = deepcopy(self.initial_marking)
         for variable in self.variables:
             variable.reset()
-        for token_placement in self.current_marking.token_places:
-            self.get_place_or_transition_by_id(token_placement[0]).token_count = token_placement[1]
+        if self.current_marking.token_vector is None:
+            self.setup_current_marking()
 
     def reset_prime_variable_values(self):
         for variable in self.variables:
@@ -70,52 +179,47 @@ class Model:
         print_summary_global(self, print_list_elements)
 
     def get_variable_by_name(self, var_name: str) -> Union[Variable, None]:
-        for var in self.variables:
-            if var.name == var_name or var.original_name == var_name:
-                return var
-        return None
+        return self.variables_by_name.get(var_name)
+
+    def get_variable_values(self) -> dict:
+        variable_values = {}
+        for variable in self.variables:
+            if variable.has_current_value:
+                variable_values[variable.name] = variable.value
+        return variable_values
 
     def get_arc_by_id(self, arc_id: str) -> Union[Arc, None]:
-        for arc in self.arcs:
-            if arc.id == arc_id:
-                return arc
-        return None
+        return self.arcs_by_id.get(arc_id)
 
     def is_in_final_state(self) -> bool:
-        for marking in self.final_markings:
-            if self.check_final_marking(marking):
+        return self.is_final_token_vector(self.current_marking.token_vector)
+
+    def is_final_token_vector(self, token_vector: numpy.ndarray) -> bool:
+        for place_indexes, token_counts in self.final_marking_vectors:
+            if numpy.array_equal(token_vector[place_indexes], token_counts):
                 return True
         return False
 
     def check_final_marking(self, final_marking: Marking) -> bool:
-        for token_place in final_marking.token_places:
-            if self.get_place_or_transition_by_id(token_place[0]).token_count != token_place[1]:
-                return False
-        return True
+        place_indexes, token_counts = self.get_marking_vector(final_marking)
+        return numpy.array_equal(self.current_marking.token_vector[place_indexes], token_counts)
 
     def get_place_or_transition_by_id(self, object_id: str) -> Union[Place, Transition, None]:
-        for transition in self.transitions:
-            if transition.id == object_id:
-                return transition
-        for place in self.places:
-            if place.id == object_id:
-                return place
-        return None
+        return self.nodes_by_id.get(object_id)
 
     def get_place_or_transition_by_name(self, name: str) -> Union[Place, Transition, None]:
-        for transition in self.transitions:
-            if transition.name == name:
-                return transition
-        for place in self.places:
-            if place.name == name:
-                return place
-        return None
+        return self.nodes_by_name.get(name)
 
     def get_enabled_transitions(self, with_probabilities: bool, with_data: bool, value_gen: ValueGenerator) ->\
             ([Transition], Union[None, list[float]]):
         enabled_transitions = []
-        for transition in self.transitions:
-            if transition.is_enabled(with_data, value_gen):
+        if with_data:
+            variable_values = self.get_variable_values()
+        else:
+            variable_values = None
+        for index in self.get_enabled_transition_indexes(self.current_marking.token_vector):
+            transition = self.transitions[index]
+            if not with_data or transition.evalute_guard(value_gen, variable_values):
                 enabled_transitions.append(transition)
 
         if with_probabilities and enabled_transitions:
@@ -126,6 +230,11 @@ class Model:
         else:
             return enabled_transitions
 
+    def get_enabled_transition_indexes(self, token_vector: numpy.ndarray) -> numpy.ndarray:
+        # Indexes (in self.transitions) of the transitions that are enabled in the given marking if
+        # the guards are not considered.
+        return numpy.flatnonzero(numpy.all(self.pre_matrix <= token_vector, axis=1))
+
     def calculate_probabilities(self, enabled_transitions: [Transition]) -> [float]:
         weights = []
         for transition in enabled_transitions:
@@ -149,25 +258,17 @@ class Model:
         return probabilities
 
     def fire_transition(self, transition_id: str, with_data: bool = True):
-        transition = self.get_place_or_transition_by_id(transition_id)
-        self.update_current_marking(transition.fire())
-
-    def update_current_marking(self, effected_ids: [str]):
-        new_token_places = []
-        effected_input_places, effected_output_places = effected_ids
-        for token_place in self.current_marking.token_places:
-            if token_place[0] in effected_input_places and token_place[0] in effected_output_places:
-                new_token_places.append(token_place)
-            elif token_place[0] in effected_input_places:
-                new_token_places.append((token_place[0], token_place[1] - 1))
-            elif token_place[0] in effected_output_places:
-                new_token_places.append((token_place[0], token_place[1] + 1))
-            else:
-                new_token_places.append(token_place)
-        self.current_marking.token_places = new_token_places
+        self.current_marking.token_vector += self.change_matrix[self.transition_indexes[transition_id]]
+
+    def get_token_count(self, place_id: str) -> int:
+        return int(self.current_marking.token_vector[self.place_indexes[place_id]])
 
     def setup_current_marking(self):
-        new_token_places = []
-        for place in self.places:
-            new_token_places.append((place.id, place.token_count))
-        self.current_marking.token_places = new_token_places
+        # Builds the token vector of the current marking from the token counts of the initial
+        # marking that the PnmlReader has stored in the places.
+        place_ids = []
+        token_vector = numpy.zeros(len(self.places), dtype=int)
+        for index, place in enumerate(self.places):
+            place_ids.append(place.id)
+            token_vector[index] = place.token_count
+        self.current_marking.set_token_vector(place_ids, token_vector)
@@ -11,7 +11,7 @@ This class is used to represent all places of the internal model representation.
 class Place:
     name: str
     id: str
-    token_count: int
+    token_count: int  # initial marking, the current marking is stored in Model.current_marking
     pos_x: float
     pos_y: float
     dim_x: float
@@ -0,0 +1,62 @@
+import numpy
+
+from src.jilg.Other.Global import print_summary_global
+
+'''
+This class is used to represent the reachability graph of the control flow of a model, i.e. of the
+markings that can be reached by firing transitions without considering guards. The markings are
+identified by consecutive ids and the successors of a marking are stored as a list of
+(transition index, successor marking id) tuples, where the transition index refers to
+Model.transitions.
+
+The graph is built lazily: the successors of a marking are only determined when they are requested
+for the first time and are then stored. Since the graph does not depend on the simulation
+configuration, a graph that is stored on the model can be reused by every simulation run and
+strategy. Limits like the maximal trace length or the maximal number of loop iterations are
+applied to the paths through the graph by the code using the graph.
+'''
+
+
+class ReachabilityGraph:
+    model: "Model"
+    token_vectors: list  # marking id -> token vector
+    marking_ids: dict  # bytes of the token vector -> marking id
+    successors: list  # marking id -> list of (transition index, marking id), None if not expanded
+    final: list  # marking id -> marking is a final marking
+
+    def print_summary(self, print_list_elements=False):
+        print_summary_global(self, print_list_elements)
+
+    def __init__(self, model: "Model"):
+        self.model = model
+        self.token_vectors = []
+        self.marking_ids = {}
+        self.successors = []
+        self.final = []
+
+    def get_marking_id(self, token_vector: numpy.ndarray) -> int:
+        key = token_vector.tobytes()
+        marking_id = self.marking_ids.get(key)
+        if marking_id is None:
+            marking_id = len(self.token_vectors)
+            self.marking_ids[key] = marking_id
+            self.token_vectors.append(token_vector)
+            self.successors.append(None)
+            self.final.append(self.model.is_final_token_vector(token_vector))
+        return marking_id
+
+    def get_successors(self, marking_id: int) -> list:
+        if self.successors[marking_id] is None:
+            token_vector = self.token_vectors[marking_id]
+            successors = []
+            for index in self.model.get_enabled_transition_indexes(token_vector):
+                successors.append((int(index), self.get_marking_id(
+                    token_vector + self.model.change_matrix[index])))
+            self.successors[marking_id] = successors
+        return self.successors[marking_id]
+
+    def is_final(self, marking_id: int) -> bool:
+        return self.final[marking_id]
+
+    def get_number_of_markings(self) -> int:
+        return len(self.token_vectors)
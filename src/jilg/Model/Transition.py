@@ -2,7 +2,6 @@ from typing import Union
 from xml.etree.ElementTree import Element
 
 from src.jilg.Model.Guard import Guard
-from src.jilg.Model.Place import Place
 from src.jilg.Other.Global import print_summary_global
 from src.jilg.Simulation.TransitionConfiguration import TransitionConfiguration
 from src.jilg.Model.MilpSolver import MilpSolver
@@ -81,38 +80,11 @@ class Transition:
             place_ids.append(place.id)
         return place_ids
 
-    def is_enabled(self, with_data: bool, value_gen: bool = None) -> bool:
-        for input_place in self.inputs:
-            tokens_needed = self.count_tokens_needed(input_place)
-            if input_place.token_count < tokens_needed:
-                return False
-        if with_data:
-            return self.evalute_guard(value_gen)
-        else:
-            return True
-
-    def count_tokens_needed(self, input_place: Place) -> int:
-        tokens_needed = 0
-        for place in self.inputs:
-            if place.id == input_place.id:
-                tokens_needed += 1
-        return tokens_needed
-
-    def fire(self) -> ([Place], [Place]):
-        effected_input_places = []
-        effected_output_places = []
-        for input_place in self.inputs:
-            effected_input_places.append(input_place.id)
-            input_place.token_count -= 1
-        for output_place in self.outputs:
-            effected_output_places.append(output_place.id)
-            output_place.token_count += 1
-        return effected_input_places, effected_output_places
-
-    def evalute_guard(self, value_gen: ValueGenerator) -> bool:
+    def evalute_guard(self, value_gen: ValueGenerator,
+                      variable_values: Union[dict, None] = None) -> bool:
         if self.guard is not None:
             return self.milp_solver.compile_and_evaluate_string(self.guard.guard_string,
                                                                 self.reads_variables, self,
-                                                                value_gen)
+                                                                value_gen, variable_values)
         else:
             return True
@@ -28,6 +28,7 @@ standard_utc_offset = 0
 standard_fixed_timestamp = False
 
 standard_random_seed = 1701
+standard_workers = 1
 standard_model_has_no_loop = False
 
 standard_avg_timestamp_delay = 0
@@ -45,6 +46,8 @@ standard_include_invisible_transitions_in_log = False
 standard_perform_trace_estimation = True
 standard_use_only_values_from_guard_strings = True
 standard_merge_intervals = True
+standard_solve_guards_with_milp = False
+standard_columnar_event_logs = False
 standard_duplicates_with_invisible_trans = False
 standard_precision = 2
 
@@ -0,0 +1,479 @@
+import datetime
+from typing import Union
+
+import numpy as np
+
+from src.jilg.Other.Global import print_summary_global
+from src.jilg.Simulation.Event import Event
+from src.jilg.Simulation.EventLog import EventLog
+from src.jilg.Simulation.Trace import Trace
+
+'''
+This class is an alternative representation of the generated event log that does not keep the
+Trace and Event objects of the generated traces. Instead, the events are appended to columns:
+the activities and transitions as int32 codes, the flags for invisible transitions, the timestamps
+as int64 microseconds since the epoch together with their int32 UTC offsets (see
+TimestampFormatter) and the event attributes in one typed NumPy column per attribute key, type and
+value type. The traces consist of the index of their first event (trace offsets) and their trace
+variables.
+
+The simulation creates the traces of the event log with create_trace, which returns a
+ColumnarTraceBuilder. Its events are appended to the columns when the simulation creates them
+(see Trace.add_event), no Event objects are created. Whether the trace becomes part of the event
+log is only decided after it has been generated, e.g. by the duplicate check. Therefore, the events
+of the trace are removed from the columns again if another trace is created or added before the
+trace has been added.
+
+Not every event has every attribute. Therefore, the attribute columns only contain the values of
+the events that have the attribute and every event stores a code for the ordered list of columns
+it uses (layout). Reading the events in order reconstructs the attributes in their original
+order (see AttributeTable.iterate_rows).
+
+Ints, floats and booleans are stored in NumPy arrays of the corresponding type, strings as codes
+of a list of the distinct strings, dates that are given as ISO strings like the timestamps and all
+other values in object arrays. The writers read the event log with get_traces, which converts the
+columns of one trace at a time to lightweight views that provide the attributes that are used for
+the output, and get_metadata_counts, which is calculated on the columns.
+
+Like for event logs whose traces are written during the simulation, the fingerprints of the traces
+are counted when they are added, the duplicate options can therefore not be changed afterwards.
+'''
+
+
+class Column:
+    initial_capacity = 1024
+    values: np.ndarray  # the first size entries are used
+    size: int
+
+    def print_summary(self, print_list_elements=False):
+        print_summary_global(self, print_list_elements)
+
+    def __init__(self, dtype):
+        self.values = np.empty(self.initial_capacity, dtype)
+        self.size = 0
+
+    def append(self, value):
+        if self.size == len(self.values):
+            values = np.empty(2 * len(self.values), self.values.dtype)
+            values[:self.size] = self.values
+            self.values = values
+        self.values[self.size] = value
+        self.size += 1
+
+    def truncate(self, size: int):
+        self.size = size
+
+    def get_values(self) -> np.ndarray:
+        return self.values[:self.size]
+
+    def get_list(self, start: int, end: int) -> list:
+        return self.values[start:end].tolist()
+
+
+class AttributeColumn:
+    numpy_types = {bool: np.bool_, int: np.int64, float: np.float64, str: np.int32}
+    key: str
+    type_string: str  # XES type of the attribute, e.g. "int" or "date"
+    value_type: type
+    values: Column
+    strings: list  # distinct values of a string column, the column contains their indexes
+    string_codes: dict
+
+    def print_summary(self, print_list_elements=False):
+        print_summary_global(self, print_list_elements)
+
+    def __init__(self, key: str, type_string: str, value_type: type):
+        self.key = key
+        self.type_string = type_string
+        self.value_type = value_type
+        self.values = Column(self.numpy_types.get(value_type, object))
+        self.strings = []
+        self.string_codes = {}
+
+    def append(self, value):
+        if self.value_type is str:
+            code = self.string_codes.get(value)
+            if code is None:
+                code = len(self.strings)
+                self.string_codes[value] = code
+                self.strings.append(value)
+            self.values.append(code)
+        else:
+            self.values.append(value)
+
+    def get_size(self) -> int:
+        return self.values.size
+
+    def truncate(self, size: int):
+        self.values.truncate(size)
+
+    def get_value(self, index: int):
+        value = self.values.values[index]
+        if self.value_type is str:
+            return self.strings[value]
+        elif isinstance(value, np.generic):
+            return value.item()
+        return value
+
+
+class TimestampColumn(AttributeColumn):
+    epoch = datetime.datetime(1970, 1, 1, tzinfo=datetime.timezone.utc)
+    naive_epoch = datetime.datetime(1970, 1, 1)
+    naive_offset = np.iinfo(np.int32).min  # offset of timestamps without time zone
+    offsets: Column  # UTC offsets in seconds
+    time_zones: dict
+
+    def __init__(self, key: str, type_string: str):
+        super().__init__(key, type_string, datetime.datetime)
+        self.values = Column(np.int64)
+        self.offsets = Column(np.int32)
+        self.time_zones = {}
+
+    def append(self, value: datetime.datetime):
+        if value.tzinfo is None:
+            self.values.append((value - self.naive_epoch) // datetime.timedelta(microseconds=1))
+            self.offsets.append(self.naive_offset)
+        else:
+            self.values.append((value - self.epoch) // datetime.timedelta(microseconds=1))
+            self.offsets.append(int(value.utcoffset().total_seconds()))
+
+    def truncate(self, size: int):
+        self.values.truncate(size)
+        self.offsets.truncate(size)
+
+    def get_value(self, index: int) -> str:
+        # Returns the timestamp in the ISO format it has been added in.
+        microseconds = int(self.values.values[index])
+        offset = int(self.offsets.values[index])
+        if offset == self.naive_offset:
+            timestamp = self.naive_epoch + datetime.timedelta(microseconds=microseconds)
+        else:
+            if offset not in self.time_zones:
+                self.time_zones[offset] = datetime.timezone(datetime.timedelta(seconds=offset))
+            timestamp = (self.epoch + datetime.timedelta(microseconds=microseconds)) \
+                .astimezone(self.time_zones[offset])
+        return timestamp.isoformat()
+
+
+class AttributeTable:
+    # Attributes (name, value, type) of a sequence of rows, e.g. of all events of an event log.
+    columns: list
+    column_indexes: dict  # (key, type string, value type) -> index of the column
+    layouts: list  # tuples of the indexes of the columns that are used by a row
+    layout_codes: dict
+    row_layouts: Column
+
+    def print_summary(self, print_list_elements=False):
+        print_summary_global(self, print_list_elements)
+
+    def __init__(self):
+        self.columns = []
+        self.column_indexes = {}
+        self.layouts = []
+        self.layout_codes = {}
+        self.row_layouts = Column(np.int32)
+
+    def add_row(self, attributes: list):
+        layout = []
+        for key, value, type_string in attributes:
+            value_type = type(value)
+            if value_type is str and type_string == "date":
+                try:
+                    value = datetime.datetime.fromisoformat(value)
+                    value_type = datetime.datetime
+                except ValueError:
+                    pass
+            elif value_type is int and not -2 ** 63 <= value < 2 ** 63:
+                value_type = object
+            column_key = (key, type_string, value_type)
+            column_index = self.column_indexes.get(column_key)
+            if column_index is None:
+                column_index = len(self.columns)
+                self.column_indexes[column_key] = column_index
+                if value_type is datetime.datetime:
+                    self.columns.append(TimestampColumn(key, type_string))
+                else:
+                    self.columns.append(AttributeColumn(key, type_string, value_type))
+            self.columns[column_index].append(value)
+            layout.append(column_index)
+        layout = tuple(layout)
+        layout_code = self.layout_codes.get(layout)
+        if layout_code is None:
+            layout_code = len(self.layouts)
+            self.layout_codes[layout] = layout_code
+            self.layouts.append(layout)
+        self.row_layouts.append(layout_code)
+
+    def get_positions(self) -> list:
+        # Index of the next value of every column, i.e. the positions of the values of the next
+        # row that is added.
+        positions = []
+        for column in self.columns:
+            positions.append(column.get_size())
+        return positions
+
+    def truncate(self, number_of_rows: int):
+        # Removes all rows after the first number_of_rows rows.
+        sizes = self.get_positions()
+        for layout_code in self.row_layouts.get_list(number_of_rows, self.row_layouts.size):
+            for column_index in self.layouts[layout_code]:
+                sizes[column_index] -= 1
+        for column, size in zip(self.columns, sizes):
+            column.truncate(size)
+        self.row_layouts.truncate(number_of_rows)
+
+    def iterate_rows(self, first_row: int = 0, positions: Union[list, None] = None):
+        # Yields the attributes of every row, starting at first_row, as list of (name, value, type)
+        # tuples. positions are the positions of the values of the first row (see get_positions),
+        # the values are only converted when the row is read.
+        if positions is None:
+            positions = []
+        positions = positions + [0] * (len(self.columns) - len(positions))
+        row = first_row
+        while row < self.row_layouts.size:
+            if len(positions) < len(self.columns):
+                positions += [0] * (len(self.columns) - len(positions))
+            attributes = []
+            for column_index in self.layouts[self.row_layouts.values[row]]:
+                column = self.columns[column_index]
+                attributes.append((column.key, column.get_value(positions[column_index]),
+                                   column.type_string))
+                positions[column_index] += 1
+            yield attributes
+            row += 1
+
+
+class ColumnarEvent:
+    __slots__ = ("name", "trans_id", "timestamp", "utc_offset", "variables",
+                 "from_invisible_transition")
+
+    def __init__(self, name: str, trans_id: str, timestamp: int, utc_offset: Union[int, None],
+                 variables: list, from_invisible_transition: bool):
+        self.name = name
+        self.trans_id = trans_id
+        self.timestamp = timestamp
+        self.utc_offset = utc_offset
+        self.variables = variables
+        self.from_invisible_transition = from_invisible_transition
+
+    def get_fingerprint(self, with_data_perspective: bool) -> tuple:
+        return Event.get_fingerprint(self, with_data_perspective)
+
+
+class ColumnarTrace:
+    __slots__ = ("name", "variables", "events")
+
+    def __init__(self, name: str, variables: list):
+        self.name = name
+        self.variables = variables
+        self.events = []
+
+
+class ColumnarTraceBuilder(Trace):
+    # Trace whose events are appended to the columns of the event log while it is generated.
+    event_log: "ColumnarEventLog"
+    start: int  # index of the first event
+    length: int
+    attribute_positions: list  # positions of the event attributes of the first event
+    fingerprints: list  # (fingerprint, from invisible transition) of every event
+    event_views: Union[list, None]
+
+    def __init__(self, event_log: "ColumnarEventLog", name: str):
+        self.name = name
+        self.variables = []
+        self.event_fingerprints = None
+        self.event_log = event_log
+        self.start = event_log.activities.size
+        self.length = 0
+        self.attribute_positions = event_log.event_attributes.get_positions()
+        self.fingerprints = []
+        self.event_views = None
+
+    def add_event(self, name, timestamp, model, trans_id, include_millieseconds, invisible=False):
+        timestamp, utc_offset = Event.get_timestamp(timestamp, include_millieseconds)
+        variables = Event.get_variables(model, trans_id)
+        self.event_log.append_event(name, trans_id, timestamp, utc_offset, variables, invisible)
+        if self.event_log.fingerprint_options[1]:
+            fingerprint = (trans_id, len(variables), tuple(sorted(variables)))
+        else:
+            fingerprint = (trans_id,)
+        self.fingerprints.append((fingerprint, invisible))
+        self.length += 1
+
+    def remove_last_event(self):
+        self.length -= 1
+        self.fingerprints.pop()
+        self.event_log.truncate_events(self.start + self.length)
+
+    def get_length(self) -> int:
+        invisible = self.event_log.invisible.values[self.start:self.start + self.length]
+        return self.length - int(np.count_nonzero(invisible))
+
+    def get_fingerprint(self, with_invisible_transitions: bool, with_data_perspective: bool) -> tuple:
+        if (with_invisible_transitions, with_data_perspective) != \
+                self.event_log.fingerprint_options:
+            return super().get_fingerprint(with_invisible_transitions, with_data_perspective)
+        fingerprint = []
+        for event_fingerprint, invisible in self.fingerprints:
+            if with_invisible_transitions or not invisible:
+                fingerprint.append(event_fingerprint)
+        return tuple(fingerprint)
+
+    @property
+    def events(self) -> list:
+        # Views of the events, e.g. for partial traces. They are read from the columns the first
+        # time they are needed and can be read until the event log discards the events of the
+        # trace, i.e. until another trace is created or added if the trace has not been added.
+        if self.event_views is None or len(self.event_views) != self.length:
+            self.event_views = self.event_log.get_events(
+                self.start, self.start + self.length,
+                self.event_log.event_attributes.iterate_rows(self.start, self.attribute_positions))
+        return self.event_views
+
+
+class ColumnarEventLog(EventLog):
+    activity_names: list
+    activity_codes: dict
+    activities: Column
+    transition_ids: list
+    transition_codes: dict
+    transitions: Column
+    invisible: Column
+    timestamps: Column
+    utc_offsets: Column  # TimestampColumn.naive_offset for timestamps without time zone
+    event_attributes: AttributeTable
+    trace_names: AttributeColumn
+    trace_attributes: AttributeTable
+    trace_offsets: Column  # index of the first event of every trace and the number of events
+    pending_trace: Union[ColumnarTraceBuilder, None]  # created trace that has not been added
+
+    def print_summary(self, print_list_elements=False):
+        print_summary_global(self, print_list_elements)
+
+    def __init__(self, name, creator, with_invisible_transitions: bool,
+                 with_data_perspective: bool):
+        super().__init__(name, creator)
+        self.fingerprint_options = (with_invisible_transitions, with_data_perspective)
+        self.activity_names = []
+        self.activity_codes = {}
+        self.activities = Column(np.int32)
+        self.transition_ids = []
+        self.transition_codes = {}
+        self.transitions = Column(np.int32)
+        self.invisible = Column(np.bool_)
+        self.timestamps = Column(np.int64)
+        self.utc_offsets = Column(np.int32)
+        self.event_attributes = AttributeTable()
+        self.trace_names = AttributeColumn("concept:name", "string", str)
+        self.trace_attributes = AttributeTable()
+        self.trace_offsets = Column(np.int64)
+        self.trace_offsets.append(0)
+        self.pending_trace = None
+
+    def create_trace(self, name: str) -> ColumnarTraceBuilder:
+        self.discard_pending_trace()
+        self.pending_trace = ColumnarTraceBuilder(self, name)
+        return self.pending_trace
+
+    def add_trace(self, trace):
+        fingerprint = trace.get_fingerprint(*self.fingerprint_options)
+        if trace is not self.pending_trace:
+            # The events are read before the events of the pending trace are discarded, because
+            # partial traces of the pending trace share its events.
+            events = trace.events
+            self.discard_pending_trace()
+            for event in events:
+                self.append_event(event.name, event.trans_id, event.timestamp, event.utc_offset,
+                                  event.variables, event.from_invisible_transition)
+        self.pending_trace = None
+        self.trace_counts[fingerprint] = self.trace_counts.get(fingerprint, 0) + 1
+        self.trace_names.append(trace.name)
+        self.trace_attributes.add_row(trace.variables)
+        self.trace_offsets.append(self.activities.size)
+
+    def append_event(self, name: str, trans_id: str, timestamp: int, utc_offset: Union[int, None],
+                     variables: list, invisible: bool):
+        activity_code = self.activity_codes.get(name)
+        if activity_code is None:
+            activity_code = len(self.activity_names)
+            self.activity_codes[name] = activity_code
+            self.activity_names.append(name)
+        self.activities.append(activity_code)
+        transition_code = self.transition_codes.get(trans_id)
+        if transition_code is None:
+            transition_code = len(self.transition_ids)
+            self.transition_codes[trans_id] = transition_code
+            self.transition_ids.append(trans_id)
+        self.transitions.append(transition_code)
+        self.invisible.append(invisible)
+        self.timestamps.append(timestamp)
+        if utc_offset is None:
+            self.utc_offsets.append(TimestampColumn.naive_offset)
+        else:
+            self.utc_offsets.append(utc_offset)
+        self.event_attributes.add_row(variables)
+
+    def truncate_events(self, number_of_events: int):
+        for column in [self.activities, self.transitions, self.invisible, self.timestamps,
+                       self.utc_offsets]:
+            column.truncate(number_of_events)
+        self.event_attributes.truncate(number_of_events)
+
+    def discard_pending_trace(self):
+        if self.pending_trace is not None:
+            self.truncate_events(int(self.trace_offsets.values[self.trace_offsets.size - 1]))
+            self.pending_trace = None
+
+    def close(self):
+        self.discard_pending_trace()
+
+    def get_number_of_traces(self) -> int:
+        return self.trace_offsets.size - 1
+
+    def update_trace_counts(self, fingerprint_options: tuple):
+        # The fingerprints are counted when the traces are added.
+        return
+
+    def get_events(self, start: int, end: int, event_rows) -> list:
+        # Returns views of the events start to end - 1, event_rows yields their attributes.
+        events = []
+        utc_offsets = self.utc_offsets.get_list(start, end)
+        for activity, transition, invisible, timestamp, utc_offset in zip(
+                self.activities.get_list(start, end), self.transitions.get_list(start, end),
+                self.invisible.get_list(start, end), self.timestamps.get_list(start, end),
+                utc_offsets):
+            if utc_offset == TimestampColumn.naive_offset:
+                utc_offset = None
+            events.append(ColumnarEvent(self.activity_names[activity],
+                                        self.transition_ids[transition], timestamp, utc_offset,
+                                        next(event_rows), invisible))
+        return events
+
+    def get_traces(self):
+        # The views of a trace are only created when the trace is read.
+        self.discard_pending_trace()
+        trace_rows = self.trace_attributes.iterate_rows()
+        event_rows = self.event_attributes.iterate_rows()
+        for index in range(self.get_number_of_traces()):
+            start, end = self.trace_offsets.get_list(index, index + 2)
+            trace = ColumnarTrace(self.trace_names.get_value(index), next(trace_rows))
+            trace.events = self.get_events(start, end, event_rows)
+            yield trace
+
+    def get_metadata_counts(self, include_invisible_transitions: bool) -> (list, list, int):
+        self.discard_pending_trace()
+        number_of_traces = self.get_number_of_traces()
+        activities = self.activities.get_values().astype(np.int64)
+        trace_indexes = np.repeat(np.arange(number_of_traces),
+                                  np.diff(self.trace_offsets.get_values()))
+        if not include_invisible_transitions:
+            visible = ~self.invisible.get_values()
+            activities = activities[visible]
+            trace_indexes = trace_indexes[visible]
+        number_of_activities = max(len(self.activity_names), 1)
+        trace_activities = np.unique(trace_indexes * number_of_activities + activities)
+        number_of_events_traces = np.bincount(trace_indexes, minlength=number_of_traces)
+        event_names_traces = np.bincount(trace_activities // number_of_activities,
+                                         minlength=number_of_traces)
+        return number_of_events_traces.tolist(), event_names_traces.tolist(), \
+            len(np.unique(activities))
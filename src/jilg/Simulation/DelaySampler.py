@@ -0,0 +1,38 @@
+import numpy as np
+from scipy.stats import truncnorm
+
+from src.jilg.Other.Global import print_summary_global
+
+'''
+This class is used to sample the time delays and lead times of transitions from a truncated normal
+distribution. Constructing a frozen scipy distribution is much more expensive than drawing a
+single sample from it. Therefore, the simulation keeps one sampler per transition configuration
+(and one for the general simulation configuration) and every sampler draws its samples in blocks
+from the random number generator of the simulation.
+'''
+
+
+class DelaySampler:
+    block_size = 256
+    parameters: tuple  # (mean, sd, min, max)
+    generator: truncnorm
+    rng: np.random.Generator
+    samples: list
+
+    def print_summary(self, print_list_elements=False):
+        print_summary_global(self, print_list_elements)
+
+    def __init__(self, mean, sd, low, upp, rng):
+        self.parameters = (mean, sd, low, upp)
+        self.generator = truncnorm((low - mean) / sd, (upp - mean) / sd, loc=mean, scale=sd)
+        self.rng = rng
+        self.samples = []
+
+    def has_parameters(self, mean, sd, low, upp):
+        return self.parameters == (mean, sd, low, upp)
+
+    def next_sample(self):
+        if not self.samples:
+            self.samples = self.generator.rvs(size=self.block_size, random_state=self.rng).tolist()
+            self.samples.reverse()
+        return self.samples.pop()
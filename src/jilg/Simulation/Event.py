@@ -1,11 +1,9 @@
 import logging
-import traceback
+from typing import Union
 
-from PySide6.QtCore import QDateTime
-
-from src.jilg.Other import Global
 from src.jilg.Other.Global import VariableTypes
 from src.jilg.Other.Global import print_summary_global
+from src.jilg.Simulation.TimestampFormatter import TimestampFormatter
 
 '''
 This class is used to represent events in the generated event log.
@@ -13,9 +11,14 @@ This class is used to represent events in the generated event log.
 
 
 class Event:
+    xml_type_strings = {VariableTypes.DATE: "date", VariableTypes.LONG: "int",
+                        VariableTypes.INT: "int", VariableTypes.STRING: "string",
+                        VariableTypes.BOOL: "boolean", VariableTypes.DOUBLE: "float"}
     name: str
     trans_id: str
-    variables: list  # ("var_name", var_value, "var_type"), includes event timestamp
+    timestamp: int  # microseconds since the epoch, see TimestampFormatter
+    utc_offset: Union[int, None]  # in seconds, None if the timestamp has no time zone
+    variables: list  # ("var_name", var_value, "var_type"), date values are seconds since the epoch
     from_invisible_transition: bool
 
     def print_summary(self, print_list_elements=False):
@@ -24,46 +27,61 @@ class Event:
     def __init__(self, name, timestamp, model, trans_id, include_millieseconds, invisible=False):
         self.name = name
         self.trans_id = trans_id
-        if not include_millieseconds:
-            self.variables = [("time:timestamp", timestamp.replace(microsecond=0).isoformat(),
-                               "date")]
-        else:
-            self.variables = [("time:timestamp", timestamp.isoformat(), "date")]
+        self.timestamp, self.utc_offset = self.get_timestamp(timestamp, include_millieseconds)
+        self.variables = self.get_variables(model, trans_id)
         self.from_invisible_transition = invisible
+
+    @staticmethod
+    def get_timestamp(timestamp, include_millieseconds: bool) -> (int, Union[int, None]):
+        epoch_timestamp, utc_offset = TimestampFormatter.get_epoch_timestamp(timestamp)
+        if not include_millieseconds:
+            epoch_timestamp -= epoch_timestamp % 1000000
+        return epoch_timestamp, utc_offset
+
+    @staticmethod
+    def get_variables(model, trans_id) -> list:
+        # Returns the current values of the variables that are included in the events of the
+        # transition as ("var_name", var_value, "var_type") tuples.
+        variables = []
+        attributes = model.event_attributes.get(trans_id)
+        if attributes is None:
+            attributes = Event.get_event_attributes(model, trans_id)
+        for variable, type_string, precision in attributes:
+            if variable.has_current_value:
+                if precision is not None:
+                    variables.append((variable.original_name, round(variable.value, precision),
+                                      type_string))
+                else:
+                    variables.append((variable.original_name, variable.value, type_string))
+        return variables
+
+    @staticmethod
+    def get_event_attributes(model, trans_id) -> list:
+        # Returns the variables that are included in the events of the transition in the order of
+        # the model variables as (variable, XES type string, precision) tuples. The precision is
+        # None for all variables that are not doubles. The Configuration precomputes these lists
+        # for all transitions (see Configuration.configure_event_attributes).
+        attributes = []
+        if not model.variables:
+            return attributes
+        included_vars = model.get_place_or_transition_by_id(trans_id).config.included_vars
         for variable in model.variables:
-            if variable.has_current_value and not variable.semantic_information.trace_variable:
-                if variable.original_name in model.get_place_or_transition_by_id(
-                        trans_id).config.included_vars:
-                    if variable.type == VariableTypes.DATE:
-                        try:
-                            date = (QDateTime.fromSecsSinceEpoch(
-                                int(variable.value)).toPython()).isoformat()
-                        except:
-                            Global.log_error(__file__, "Failed conversion from"
-                                                                      " seconds to QDateTime", traceback)
-                            date = "2000-01-01T00:00:00+00:00"
-                        self.variables.append((variable.original_name, date,
-                                               self.get_xml_variable_type_string(variable.type)))
-                    else:
-                        if variable.type == VariableTypes.DOUBLE:
-                            self.variables.append((variable.original_name,
-                                                   round(variable.value,
-                                                         variable.semantic_information.precision),
-                                                   self.get_xml_variable_type_string(
-                                                       variable.type)))
-                        else:
-                            self.variables.append((variable.original_name, variable.value,
-                                                   self.get_xml_variable_type_string(
-                                                       variable.type)))
+            # Variables without semantic information are never assigned a value.
+            if variable.original_name in included_vars and \
+                    hasattr(variable, "semantic_information") and \
+                    not variable.semantic_information.trace_variable:
+                if variable.type == VariableTypes.DOUBLE:
+                    precision = variable.semantic_information.precision
+                else:
+                    precision = None
+                attributes.append((variable, Event.xml_type_strings.get(variable.type), precision))
+        return attributes
+
+    def get_fingerprint(self, with_data_perspective: bool) -> tuple:
+        # Two events are duplicates if their fingerprints are equal. The timestamp is ignored.
+        if not with_data_perspective:
+            return (self.trans_id,)
+        return self.trans_id, len(self.variables), tuple(sorted(self.variables))
 
     def get_xml_variable_type_string(self, var_type):
-        if var_type == VariableTypes.DATE:
-            return "date"
-        elif var_type == VariableTypes.LONG or var_type == VariableTypes.INT:
-            return "int"
-        elif var_type == VariableTypes.STRING:
-            return "string"
-        elif var_type == VariableTypes.BOOL:
-            return "boolean"
-        elif var_type == VariableTypes.DOUBLE:
-            return "float"
+        return self.xml_type_strings.get(var_type)
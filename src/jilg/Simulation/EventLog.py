@@ -1,7 +1,23 @@
+from typing import Union
+
 from src.jilg.Other.Global import print_summary_global
+from src.jilg.Simulation.Trace import Trace
 
 '''
 This class is used to represent the generated event log.
+
+To find duplicate traces quickly the event log counts the fingerprints (see Trace.get_fingerprint)
+of its traces. The counts are updated lazily for traces that have been appended to the traces list
+since the last check and are recalculated if the traces list has been replaced or the duplicate
+options have changed.
+
+If a trace writer is set (see TraceStreamWriter), added traces are passed to the writer instead of
+being kept in the traces list. Only the fingerprint counts and the number of written traces are
+kept, the duplicate options can therefore not be changed afterwards.
+
+The external trace counts are fingerprint counts of traces that are not part of this event log but
+still have to be considered by the duplicate check, e.g. the traces that have already been merged
+into the event log of the main process when traces are generated by multiple worker processes.
 '''
 
 
@@ -9,6 +25,13 @@ class EventLog:
     name: str
     creator: str
     traces: list
+    trace_counts: dict  # trace fingerprint -> number of traces
+    indexed_traces: Union[list, None]
+    number_of_indexed_traces: int
+    fingerprint_options: Union[tuple, None]
+    trace_writer: Union["TraceStreamWriter", None]
+    number_of_written_traces: int
+    external_trace_counts: dict
 
     def print_summary(self, print_list_elements=False):
         print_summary_global(self, print_list_elements)
@@ -17,3 +40,83 @@ class EventLog:
         self.name = name
         self.creator = creator
         self.traces = []
+        self.trace_counts = {}
+        self.indexed_traces = None
+        self.number_of_indexed_traces = 0
+        self.fingerprint_options = None
+        self.trace_writer = None
+        self.number_of_written_traces = 0
+        self.external_trace_counts = {}
+
+    def stream_traces(self, trace_writer, with_invisible_transitions: bool,
+                      with_data_perspective: bool):
+        self.update_trace_counts((with_invisible_transitions, with_data_perspective))
+        self.trace_writer = trace_writer
+
+    def add_trace(self, trace):
+        if self.trace_writer is None:
+            self.traces.append(trace)
+        else:
+            fingerprint = trace.get_fingerprint(*self.fingerprint_options)
+            self.trace_counts[fingerprint] = self.trace_counts.get(fingerprint, 0) + 1
+            self.number_of_written_traces += 1
+            self.trace_writer.write_trace(self, trace)
+
+    def create_trace(self, name: str) -> Trace:
+        # The simulation creates the traces of the event log with this method and adds their
+        # events with Trace.add_event.
+        return Trace(name)
+
+    def close(self):
+        if self.trace_writer is not None:
+            self.trace_writer.close_event_log(self)
+
+    def get_number_of_traces(self) -> int:
+        return len(self.traces) + self.number_of_written_traces
+
+    def get_traces(self):
+        return self.traces
+
+    def get_metadata_counts(self, include_invisible_transitions: bool) -> (list, list, int):
+        # Returns the number of events and of different event names of every trace and the number
+        # of different event names of the event log. Events of invisible transitions are only
+        # counted if they are included in the event log.
+        number_of_events_traces = []
+        event_names = {}
+        event_names_traces = []
+        for trace in self.traces:
+            number_of_events = 0
+            trace_event_names = {}
+            for event in trace.events:
+                if include_invisible_transitions or not event.from_invisible_transition:
+                    number_of_events += 1
+                    event_names[event.name] = True
+                    trace_event_names[event.name] = True
+            number_of_events_traces.append(number_of_events)
+            event_names_traces.append(len(trace_event_names))
+        return number_of_events_traces, event_names_traces, len(event_names)
+
+    def count_duplicates(self, trace, with_invisible_transitions: bool,
+                         with_data_perspective: bool) -> int:
+        self.update_trace_counts((with_invisible_transitions, with_data_perspective))
+        fingerprint = trace.get_fingerprint(*self.fingerprint_options)
+        return self.trace_counts.get(fingerprint, 0) + self.external_trace_counts.get(fingerprint, 0)
+
+    def get_trace_counts(self, with_invisible_transitions: bool,
+                         with_data_perspective: bool) -> dict:
+        self.update_trace_counts((with_invisible_transitions, with_data_perspective))
+        return self.trace_counts
+
+    def update_trace_counts(self, fingerprint_options: tuple):
+        if self.trace_writer is not None:
+            return
+        if self.traces is not self.indexed_traces or fingerprint_options != self.fingerprint_options \
+                or len(self.traces) < self.number_of_indexed_traces:
+            self.trace_counts = {}
+            self.indexed_traces = self.traces
+            self.number_of_indexed_traces = 0
+            self.fingerprint_options = fingerprint_options
+        for trace in self.traces[self.number_of_indexed_traces:]:
+            fingerprint = trace.get_fingerprint(*fingerprint_options)
+            self.trace_counts[fingerprint] = self.trace_counts.get(fingerprint, 0) + 1
+        self.number_of_indexed_traces = len(self.traces)
@@ -1,11 +1,12 @@
 import datetime
 import itertools
 import logging
-import random
+import multiprocessing
+import multiprocessing.pool
 import threading
 import traceback
+from collections import Counter
 from copy import deepcopy, copy
-from enum import Enum
 from threading import Thread
 
 import numpy as np
@@ -14,26 +15,18 @@ from PySide6.QtCore import QDateTime
 from src.jilg.Main.ModelAnalyser import ModelAnalyser
 from src.jilg.Model.MilpSolver import MilpSolver
 from src.jilg.Model.Model import Model
+from src.jilg.Simulation.ColumnarEventLog import ColumnarEventLog
+from src.jilg.Simulation.DelaySampler import DelaySampler
 from src.jilg.Other import Global
 from src.jilg.Other.Global import VariableTypes
-from src.jilg.Simulation.Event import Event
 from src.jilg.Simulation.EventLog import EventLog
 from src.jilg.Simulation.SimulationConfiguration import SimulationConfiguration
-from src.jilg.Simulation.Trace import Trace
-from scipy.stats import truncnorm
+from src.jilg.Simulation.TimestampFormatter import TimestampFormatter
+from src.jilg.Simulation.Trace import PartialTrace
 from src.jilg.Other.Global import print_summary_global
 
 from src.jilg.Simulation.ValueGenerator import ValueGenerator
-
-
-class Weekday(Enum):
-    Mon = 0
-    Tue = 1
-    Wed = 2
-    Thu = 3
-    Fri = 4
-    Sat = 5
-    Sun = 6
+from src.jilg.Simulation.WorkingTimeCalendar import WorkingTimeCalendar
 
 
 class SimStatus:
@@ -71,12 +64,95 @@ class TraceEstimationResults:
         self.partial_traces = []
 
 
+class LoopTracker:
+    # Counts how often every marking (see Marking.to_key) has been reached and every transition
+    # has been fired in the current trace. The highest counts are updated incrementally so that
+    # checking the loop limits does not depend on the length of the trace.
+    marking_counts: Counter
+    transition_counts: Counter
+    max_marking_count: int
+    max_transition_count: int
+
+    def print_summary(self, print_list_elements=False):
+        print_summary_global(self, print_list_elements)
+
+    def __init__(self):
+        self.marking_counts = Counter()
+        self.transition_counts = Counter()
+        self.max_marking_count = 0
+        self.max_transition_count = 0
+
+    def add_marking(self, marking_key):
+        self.marking_counts[marking_key] += 1
+        self.max_marking_count = max(self.max_marking_count, self.marking_counts[marking_key])
+
+    def add_transition(self, transition_id):
+        self.transition_counts[transition_id] += 1
+        self.max_transition_count = max(self.max_transition_count,
+                                        self.transition_counts[transition_id])
+
+    def copy(self):
+        loop_tracker = LoopTracker()
+        loop_tracker.marking_counts = self.marking_counts.copy()
+        loop_tracker.transition_counts = self.transition_counts.copy()
+        loop_tracker.max_marking_count = self.max_marking_count
+        loop_tracker.max_transition_count = self.max_transition_count
+        return loop_tracker
+
+
+# Model and simulation configuration of a worker process (see run_parallel_random_trace_generation).
+worker_model = None
+worker_config = None
+
+
+def initialize_worker(model: Model, config: SimulationConfiguration):
+    global worker_model, worker_config
+    worker_model = model
+    worker_config = config
+
+
+def generate_random_traces(seed_sequence: np.random.SeedSequence, number_of_traces: int,
+                           max_attempts: int, start_time: datetime.datetime, trace_counts: dict):
+    rng = np.random.default_rng(seed_sequence)
+    # Every block starts with the initial model, independent of the blocks the process has
+    # generated before.
+    simulation = Simulation(deepcopy(worker_model), worker_config, rng, 1)
+    simulation.set_up_sim()
+    simulation.current_time = start_time
+    # The traces are returned to the main process, which adds them to its own event log.
+    simulation.current_event_log = EventLog(simulation.event_log_name,
+                                            simulation.event_log_creator)
+    simulation.current_event_log.external_trace_counts = trace_counts
+    # The number of attempts is limited, so that a block returns even if the duplicate limit does
+    # not allow enough traces. The main process then starts another round if it is not stopped.
+    attempts = 0
+    while simulation.current_event_log.get_number_of_traces() < number_of_traces and \
+            attempts < max_attempts:
+        simulation.add_random_trace()
+        attempts += 1
+    return simulation.current_event_log.traces, simulation.current_time
+
+
+def generate_random_event_log(seed_sequence: np.random.SeedSequence, event_log_name: str,
+                              event_log_creator: str) -> EventLog:
+    rng = np.random.default_rng(seed_sequence)
+    simulation = Simulation(deepcopy(worker_model), worker_config, rng, 1, event_log_name,
+                            event_log_creator)
+    simulation.set_up_sim()
+    while simulation.current_event_log.get_number_of_traces() < worker_config.number_of_traces:
+        simulation.add_random_trace()
+    return simulation.current_event_log
+
+
 '''
 This class runs the simulation and, therefore, the actual generation of event logs.
 '''
 
 
 class Simulation:
+    parallel_block_size = 100  # maximum number of traces a worker generates in one round
+    parallel_attempts_per_trace = 10  # attempts a worker makes per trace of its block
+    parallel_wait_timeout = 0.1  # seconds between the checks for a stop while waiting for workers
     model: Model
     config: SimulationConfiguration
     event_logs: list
@@ -96,31 +172,52 @@ class Simulation:
     thread_stop: bool
     exit_with_errors: bool
     errors: str
+    delay_samplers: dict  # (transition id or None for the general config, "delay"/"lead") -> sampler
+    calendars: dict  # tuple of time interval strings -> WorkingTimeCalendar
+    trace_writer: "TraceStreamWriter"  # None if the traces are kept in the event logs
+    event_log_handler: object  # called with every event log (and its index) that has been
+    # generated by a worker process, e.g. to write it to the output directory
 
     def __init__(self, model, config, rng, number_of_event_logs, event_log_name="log",
-                 event_log_creator="undefined"):
+                 event_log_creator="undefined", trace_writer=None):
         self.event_logs = []
         self.event_log_name = event_log_name
         self.event_log_creator = event_log_creator
         self.number_of_event_logs = number_of_event_logs
-        self.current_event_log = EventLog(event_log_name, event_log_creator)
+        self.trace_writer = trace_writer
+        self.event_log_handler = None
         self.model = model
         self.config = config
+        self.current_event_log = self.create_event_log()
         self.rng = rng
         self.used_trace_name_count = {}
+        self.delay_samplers = {}
+        self.calendars = {}
         self.current_time = self.config.timestamp_anchor
         t = self.current_time
         sgt_time_delta = datetime.timedelta(hours=self.config.utc_offset)
         sgt_tz_object = datetime.timezone(sgt_time_delta, name="SGT")
         self.current_time = datetime.datetime(t.year, t.month, t.day, t.hour, t.minute, t.second, 0,
                                               sgt_tz_object)
-        np.random.seed(int(self.rng.uniform(0, 1000)))
         self.thread_status_lock = threading.Lock()
         self.value_generator = ValueGenerator(model, self.rng)
+        self.set_distribution_generators()
         self.sim_status = SimStatus()
         self.exit_with_errors = False
         self.errors = ""
 
+    def set_distribution_generators(self):
+        # The distributions of the variables draw their values from the generator of the
+        # simulation, values that have been drawn for a previous simulation are discarded.
+        # Therefore, no random value of the simulation depends on global state or on other
+        # simulations.
+        if self.model is None:
+            return
+        for variable in self.model.variables:
+            if hasattr(variable, "semantic_information") and \
+                    variable.semantic_information.distribution is not None:
+                variable.semantic_information.distribution.set_rng(self.rng)
+
     def set_up_sim(self):
         self.unused_trace_names = copy(self.config.trace_names)
         self.used_trace_name_count = {}
@@ -141,7 +238,20 @@ class Simulation:
             self.thread_stop = False
             self.exit_with_errors = False
             self.errors = ""
-            if self.config.sim_strategy == "random":
+            if self.config.sim_strategy == "random" and self.config.workers > 1 and \
+                    self.number_of_event_logs > 1 and self.trace_writer is None:
+                sim_thread = threading.Thread(target=self.run_parallel_event_log_generation,
+                                              daemon=True)
+                with self.thread_status_lock:
+                    self.sim_status = SimStatus()
+                sim_thread.start()
+            elif self.config.sim_strategy == "random" and self.config.workers > 1:
+                sim_thread = threading.Thread(target=self.run_parallel_random_trace_generation,
+                                              daemon=True)
+                with self.thread_status_lock:
+                    self.sim_status = SimStatus()
+                sim_thread.start()
+            elif self.config.sim_strategy == "random":
                 sim_thread = threading.Thread(target=self.run_random_trace_generation, daemon=True)
                 with self.thread_status_lock:
                     self.sim_status = SimStatus()
@@ -170,12 +280,10 @@ class Simulation:
 
     def calculate_possible_traces(self, model):
         estimation_result = TraceEstimationResults()
-        model_copy = deepcopy(model)
         valid_traces = []
         other_traces = []
         partial_traces = []
-        self.recursive_trace_estimation(valid_traces, other_traces, partial_traces, model_copy, [],
-                                        [], [], [])
+        self.estimate_traces(valid_traces, other_traces, partial_traces, model)
         self.sim_status.trace_estimation_running = True
         if self.config.include_partial_traces:
             estimation_result.partial_traces = partial_traces
@@ -186,77 +294,300 @@ class Simulation:
         estimation_result.other_traces = other_traces
         return estimation_result
 
-    def recursive_trace_estimation(self, valid_traces, other_traces, partial_traces, model,
-                                   current_trace, current_trace_seen_markings,
-                                   all_seen_traces_markings, current_no_invisible_trace):
-        if self.config.include_invisible_transitions_in_log:
-            current_trace_length = len(current_trace)
+    def count_possible_traces(self, model) -> int:
+        # Returns the number of possible traces that is used as stopping criterion by the random
+        # exploration, i.e. the number of traces calculate_possible_traces would find. If the
+        # traces can be counted (see can_count_possible_traces), they are counted without
+        # enumerating them.
+        if not self.can_count_possible_traces(model):
+            estimation_result = self.calculate_possible_traces(model)
+            if self.config.only_ending_traces:
+                return len(estimation_result.valid_ending_traces)
+            else:
+                return estimation_result.number_of_possible_traces
+        valid_traces, other_traces, partial_traces = self.count_traces(model)
+        self.sim_status.trace_estimation_running = True
+        if self.config.only_ending_traces:
+            nr_of_traces = valid_traces
         else:
-            current_trace_length = len(current_no_invisible_trace)
-        if not current_trace_length > self.config.max_trace_length:
+            nr_of_traces = valid_traces + other_traces
+            if self.config.include_partial_traces:
+                nr_of_traces += partial_traces
+        return min(nr_of_traces, self.config.number_of_traces)
+
+    def can_count_possible_traces(self, model) -> bool:
+        # The trace length has to be the number of fired transitions and a marking/trace
+        # combination that has been seen before (see estimate_traces) can only be reached again
+        # by another enabled transition of the same state. This is the case if the model has no
+        # invisible transitions or if invisible transitions are part of the traces and of the
+        # duplicate check.
+        if self.config.include_invisible_transitions_in_log and \
+                self.config.duplicates_with_invisible_trans:
+            return True
+        for transition in model.transitions:
+            if transition.invisible:
+                return False
+        return True
+
+    def count_traces(self, model) -> (int, int, int):
+        # Counts the valid, other and partial traces that estimate_traces would find if it was not
+        # stopped after number_of_traces traces. Instead of following every path through the
+        # reachability graph, the number of traces is calculated once per search state and
+        # reused for every path that reaches the same state.
+        # A search state consists of the marking, the number of times every transition has been
+        # fired (which also determines the trace length) and the number of times every marking
+        # that lies on a cycle has been reached. Markings that do not lie on a cycle are reached
+        # at most once and are therefore only relevant for the loop limit if it is below one.
+        # Like in estimate_traces, the trace length stays zero if duplicates are determined with
+        # invisible transitions that are not included in the log.
+        limit_trace_length = self.config.include_invisible_transitions_in_log or \
+            not self.config.duplicates_with_invisible_trans
+        reachability_graph = model.get_reachability_graph()
+        initial_marking_id = reachability_graph.get_marking_id(
+            model.current_marking.token_vector.copy())
+        cyclic_markings = self.get_cyclic_markings(reachability_graph, initial_marking_id,
+                                                   limit_trace_length)
+        traces_per_state = {}
+        initial_state = (initial_marking_id, (), ())
+        stack = [(initial_state, False)]
+        while stack:
+            state, children_counted = stack.pop()
+            if state in traces_per_state:
+                continue
             if self.thread_stop:
                 self.sim_status.nr_of_current_logs = len(self.event_logs)
                 self.sim_status.nr_of_current_traces = 0
                 self.sim_status.simulation_ended = True
+                return 0, 0, 0
+            marking_id, transition_counts, marking_counts = state
+            number_of_transitions = 0
+            for transition_index, count in transition_counts:
+                number_of_transitions += count
+            trace_length = number_of_transitions if limit_trace_length else 0
+            enough_length = trace_length >= self.config.min_trace_length
+
+            if reachability_graph.is_final(marking_id):
+                traces_per_state[state] = (int(enough_length), 0, 0)
+                continue
+            elif self.loop_limits_exceeded(number_of_transitions, transition_counts,
+                                           marking_counts):
+                traces_per_state[state] = (0, int(enough_length), 0)
+                continue
+            successors = reachability_graph.get_successors(marking_id)
+            if not successors:
+                traces_per_state[state] = (0, int(enough_length), 0)
+                continue
+
+            children = []
+            next_marking_ids = set()
+            if not limit_trace_length or trace_length < self.config.max_trace_length:
+                for transition_index, next_marking_id in successors:
+                    if not self.config.duplicates_with_invisible_trans:
+                        if next_marking_id in next_marking_ids:
+                            continue
+                        next_marking_ids.add(next_marking_id)
+                    children.append(self.get_next_search_state(state, transition_index,
+                                                               next_marking_id, cyclic_markings))
+            if children_counted:
+                valid_traces = 0
+                other_traces = 0
+                partial_traces = int(number_of_transitions > 0 and enough_length)
+                for child in children:
+                    child_valid_traces, child_other_traces, child_partial_traces = \
+                        traces_per_state[child]
+                    valid_traces += child_valid_traces
+                    other_traces += child_other_traces
+                    partial_traces += child_partial_traces
+                traces_per_state[state] = (valid_traces, other_traces, partial_traces)
             else:
-                if self.config.only_ending_traces:
-                    nr_of_traces = len(valid_traces)
+                stack.append((state, True))
+                for child in children:
+                    if child not in traces_per_state:
+                        stack.append((child, False))
+        return traces_per_state[initial_state]
+
+    def loop_limits_exceeded(self, number_of_transitions: int, transition_counts: tuple,
+                             marking_counts: tuple) -> bool:
+        if number_of_transitions > 0 and self.config.max_loop_iterations < 1:
+            return True
+        for marking_id, count in marking_counts:
+            if count > self.config.max_loop_iterations:
+                return True
+        for transition_index, count in transition_counts:
+            if count > self.config.max_loop_iterations_transitions:
+                return True
+        return False
+
+    def get_next_search_state(self, state: tuple, transition_index: int, next_marking_id: int,
+                              cyclic_markings: set) -> tuple:
+        marking_id, transition_counts, marking_counts = state
+        transition_counts = dict(transition_counts)
+        transition_counts[transition_index] = transition_counts.get(transition_index, 0) + 1
+        if next_marking_id in cyclic_markings:
+            marking_counts = dict(marking_counts)
+            marking_counts[next_marking_id] = marking_counts.get(next_marking_id, 0) + 1
+            marking_counts = tuple(sorted(marking_counts.items()))
+        return next_marking_id, tuple(sorted(transition_counts.items())), marking_counts
+
+    def get_cyclic_markings(self, reachability_graph, initial_marking_id: int,
+                            limit_trace_length: bool) -> set:
+        # Markings that are reachable (within max_trace_length transitions if limit_trace_length
+        # is set) and lie on a cycle of such markings, determined with an iterative version of
+        # Tarjan's algorithm.
+        depths = {initial_marking_id: 0}
+        queue = [initial_marking_id]
+        for marking_id in queue:
+            if not limit_trace_length or depths[marking_id] < self.config.max_trace_length:
+                for transition_index, next_marking_id in \
+                        reachability_graph.get_successors(marking_id):
+                    if next_marking_id not in depths:
+                        depths[next_marking_id] = depths[marking_id] + 1
+                        queue.append(next_marking_id)
+
+        cyclic_markings = set()
+        indexes = {}
+        low_links = {}
+        component_stack = []
+        on_component_stack = set()
+        for root in queue:
+            if root in indexes:
+                continue
+            work_stack = [(root, 0)]
+            while work_stack:
+                marking_id, successor_position = work_stack.pop()
+                if successor_position == 0:
+                    indexes[marking_id] = len(indexes)
+                    low_links[marking_id] = indexes[marking_id]
+                    component_stack.append(marking_id)
+                    on_component_stack.add(marking_id)
+                successors = reachability_graph.get_successors(marking_id)
+                descended = False
+                while successor_position < len(successors):
+                    next_marking_id = successors[successor_position][1]
+                    successor_position += 1
+                    if next_marking_id not in depths:
+                        continue
+                    if next_marking_id == marking_id:
+                        cyclic_markings.add(marking_id)
+                    elif next_marking_id not in indexes:
+                        work_stack.append((marking_id, successor_position))
+                        work_stack.append((next_marking_id, 0))
+                        descended = True
+                        break
+                    elif next_marking_id in on_component_stack:
+                        low_links[marking_id] = min(low_links[marking_id], indexes[next_marking_id])
+                if descended:
+                    continue
+                if low_links[marking_id] == indexes[marking_id]:
+                    component = []
+                    while True:
+                        component_marking_id = component_stack.pop()
+                        on_component_stack.discard(component_marking_id)
+                        component.append(component_marking_id)
+                        if component_marking_id == marking_id:
+                            break
+                    if len(component) > 1:
+                        cyclic_markings.update(component)
+                if work_stack:
+                    parent_marking_id = work_stack[-1][0]
+                    low_links[parent_marking_id] = min(low_links[parent_marking_id],
+                                                       low_links[marking_id])
+        return cyclic_markings
+
+    def estimate_traces(self, valid_traces, other_traces, partial_traces, model):
+        # Depth-first search over the reachability graph of the model. A state of the search only
+        # consists of the id of the marking and the transitions that have been fired so far, the
+        # model itself is not modified. The stack contains the states that still have to be
+        # visited, the children of a state are pushed in reverse order so that they are visited
+        # in the order of the enabled transitions.
+        # If duplicates are determined without invisible transitions, a state is only visited if
+        # the combination of its marking and the visible transitions fired before the last
+        # transition has not been seen before.
+        reachability_graph = model.get_reachability_graph()
+        seen_traces_markings = set()
+        stack = [(reachability_graph.get_marking_id(model.current_marking.token_vector.copy()), (),
+                  LoopTracker(), (), None)]
+        while stack:
+            marking_id, current_trace, loop_tracker, current_no_invisible_trace, seen_key = \
+                stack.pop()
+            if seen_key is not None:
+                if seen_key in seen_traces_markings:
+                    continue
+                seen_traces_markings.add(seen_key)
+            if self.config.include_invisible_transitions_in_log:
+                current_trace_length = len(current_trace)
+            else:
+                current_trace_length = len(current_no_invisible_trace)
+            if current_trace_length > self.config.max_trace_length:
+                continue
+            if self.thread_stop:
+                self.sim_status.nr_of_current_logs = len(self.event_logs)
+                self.sim_status.nr_of_current_traces = 0
+                self.sim_status.simulation_ended = True
+                break
+            if self.config.only_ending_traces:
+                nr_of_traces = len(valid_traces)
+            else:
+                nr_of_traces = len(valid_traces) + len(other_traces)
+                if self.config.include_partial_traces:
+                    nr_of_traces += len(partial_traces)
+            if nr_of_traces >= self.config.number_of_traces:
+                break
+            with self.thread_status_lock:
+                self.sim_status.nr_of_estimated_traces = nr_of_traces
+
+            if reachability_graph.is_final(marking_id):
+                if current_trace_length >= self.config.min_trace_length:
+                    valid_traces.append(list(current_trace))
+            elif self.max_loop_iterations_exceeded(loop_tracker):
+                if current_trace_length >= self.config.min_trace_length:
+                    other_traces.append(list(current_trace))
+            else:
+                successors = reachability_graph.get_successors(marking_id)
+                if not successors:
+                    if current_trace_length >= self.config.min_trace_length:
+                        other_traces.append(list(current_trace))
                 else:
-                    nr_of_traces = len(valid_traces) + len(other_traces)
                     if self.config.include_partial_traces:
-                        nr_of_traces += len(partial_traces)
-                if nr_of_traces < self.config.number_of_traces:
-                    with self.thread_status_lock:
-                        self.sim_status.nr_of_estimated_traces = nr_of_traces
-                    if model.is_in_final_state():
-                        if current_trace_length >= self.config.min_trace_length:
-                            valid_traces.append(current_trace[:])
-                    else:
-                        if self.max_loop_iterations_exceeded(current_trace_seen_markings,
-                                                             current_trace):
+                        if current_trace:
                             if current_trace_length >= self.config.min_trace_length:
-                                other_traces.append(current_trace[:])
+                                partial_traces.append(list(current_trace))
+                    children = []
+                    for index, next_marking_id in successors:
+                        transition = model.transitions[index]
+                        loop_tracker_copy = loop_tracker.copy()
+                        loop_tracker_copy.add_marking(next_marking_id)
+                        loop_tracker_copy.add_transition(transition.id)
+                        if self.config.duplicates_with_invisible_trans:
+                            children.append((next_marking_id, current_trace + (transition.id,),
+                                             loop_tracker_copy, (), None))
                         else:
-                            enabled_transitions = model.get_enabled_transitions(False, False, None)
-                            if not enabled_transitions:
-                                if current_trace_length >= self.config.min_trace_length:
-                                    other_traces.append(current_trace[:])
+                            if transition.invisible:
+                                no_invisible_trace = current_no_invisible_trace
                             else:
-                                if self.config.include_partial_traces:
-                                    if current_trace:
-                                        if current_trace_length >= self.config.min_trace_length:
-                                            partial_traces.append(current_trace[:])
-                                for transition in enabled_transitions:
-                                    model_copy = deepcopy(model)
-                                    model_copy.fire_transition(transition.id, False)
-                                    current_marking = model_copy.current_marking.to_minimalistic_string()
-                                    trace_copy = current_trace[:]
-                                    trace_copy.append(transition.id)
-                                    markings_copy = current_trace_seen_markings[:]
-                                    markings_copy.append(current_marking)
-                                    if self.config.duplicates_with_invisible_trans:
-                                        self.recursive_trace_estimation(valid_traces, other_traces,
-                                                                        partial_traces, model_copy,
-                                                                        trace_copy,
-                                                                        markings_copy,
-                                                                        [],
-                                                                        [])
-                                    else:
-                                        no_invisible_trace_copy = current_no_invisible_trace[:]
-                                        if not transition.invisible:
-                                            no_invisible_trace_copy.append(transition.id)
-                                        if (current_marking, current_no_invisible_trace) \
-                                                not in all_seen_traces_markings:
-                                            all_seen_traces_markings.append(
-                                                (current_marking[:], current_no_invisible_trace[:]))
-                                            self.recursive_trace_estimation(valid_traces,
-                                                                            other_traces,
-                                                                            partial_traces,
-                                                                            model_copy,
-                                                                            trace_copy,
-                                                                            markings_copy,
-                                                                            all_seen_traces_markings,
-                                                                            no_invisible_trace_copy)
+                                no_invisible_trace = current_no_invisible_trace + (transition.id,)
+                            children.append((next_marking_id, current_trace + (transition.id,),
+                                             loop_tracker_copy, no_invisible_trace,
+                                             (next_marking_id, current_no_invisible_trace)))
+                    children.reverse()
+                    stack.extend(children)
+
+    def create_event_log(self) -> EventLog:
+        if self.trace_writer is not None:
+            event_log = EventLog(self.event_log_name, self.event_log_creator)
+            event_log.stream_traces(self.trace_writer, self.config.duplicates_with_invisible_trans,
+                                    self.config.duplicates_with_data_perspective)
+        elif self.config.columnar_event_logs:
+            event_log = ColumnarEventLog(self.event_log_name, self.event_log_creator,
+                                         self.config.duplicates_with_invisible_trans,
+                                         self.config.duplicates_with_data_perspective)
+        else:
+            event_log = EventLog(self.event_log_name, self.event_log_creator)
+        return event_log
+
+    def finish_current_event_log(self):
+        self.current_event_log.close()
+        self.event_logs.append(self.current_event_log)
 
     def run_random_trace_generation(self):
         try:
@@ -264,27 +595,14 @@ class Simulation:
             while len(self.event_logs) < self.number_of_event_logs:
                 if break_var:
                     break
-                while len(self.current_event_log.traces) < self.config.number_of_traces:
+                while self.current_event_log.get_number_of_traces() < self.config.number_of_traces:
                     if break_var:
                         break
-                    time_before_trace = copy(self.current_time)
-                    success = False
-                    trace, reached_valid_final_marking = self.generate_random_single_trace()
-                    trace.add_trace_variables(self.model)
-                    if not self.config.only_ending_traces or reached_valid_final_marking:
-                        if self.count_duplicates(trace) <= self.config.max_trace_duplicates:
-                            if self.get_trace_length(trace) >= self.config.min_trace_length:
-                                self.current_event_log.traces.append(trace)
-                                success = True
-                    if not success:
-                        self.current_time = time_before_trace
-                    self.model.reset()
-                    self.model.generate_initial_values(self.value_generator)
-                    if self.config.fixed_timestamp:
-                        self.current_time = self.config.timestamp_anchor
+                    self.add_random_trace()
                     with self.thread_status_lock:
                         self.sim_status.nr_of_current_logs = len(self.event_logs)
-                        self.sim_status.nr_of_current_traces = len(self.current_event_log.traces)
+                        self.sim_status.nr_of_current_traces = \
+                            self.current_event_log.get_number_of_traces()
                         self.sim_status.simulation_ended = False
                     with self.thread_status_lock:
                         if self.thread_stop:
@@ -297,10 +615,9 @@ class Simulation:
                         break_var = True
                     self.model.reset()
                     self.model.generate_initial_values(self.value_generator)
-                    self.event_logs.append(self.current_event_log)
+                    self.finish_current_event_log()
                     if not break_var:
-                        self.current_event_log = EventLog(self.event_log_name,
-                                                          self.event_log_creator)
+                        self.current_event_log = self.create_event_log()
                         self.model.reset()
                         self.model.generate_initial_values(self.value_generator)
                         self.set_up_sim()
@@ -309,10 +626,288 @@ class Simulation:
                 if break_var:
                     nr_of_traces = 0
                     for log in self.event_logs:
-                        nr_of_traces += len(log.traces)
+                        nr_of_traces += log.get_number_of_traces()
                     self.sim_status.nr_of_current_traces = nr_of_traces
                 else:
-                    self.sim_status.nr_of_current_traces = len(self.current_event_log.traces)
+                    self.sim_status.nr_of_current_traces = \
+                        self.current_event_log.get_number_of_traces()
+                self.sim_status.simulation_ended = True
+        except:
+            Global.log_error(__file__, "Simulation ended with errors!", traceback)
+            self.exit_with_errors = True
+            self.errors = str(traceback.format_exc())
+
+    def add_random_trace(self):
+        time_before_trace = copy(self.current_time)
+        success = False
+        trace, reached_valid_final_marking = self.generate_random_single_trace()
+        trace.add_trace_variables(self.model)
+        if not self.config.only_ending_traces or reached_valid_final_marking:
+            if self.count_duplicates(trace) <= self.config.max_trace_duplicates:
+                if self.get_trace_length(trace) >= self.config.min_trace_length:
+                    self.current_event_log.add_trace(trace)
+                    success = True
+        if not success:
+            self.current_time = time_before_trace
+        self.model.reset()
+        self.model.generate_initial_values(self.value_generator)
+        if self.config.fixed_timestamp:
+            self.current_time = self.config.timestamp_anchor
+
+    def run_parallel_random_trace_generation(self):
+        # The traces are generated in rounds. In every round, the missing traces are split into
+        # blocks that are generated by the worker processes, starting at the current time of the
+        # simulation. Every block gets its own generator that is spawned from a SeedSequence of
+        # the random seed and the blocks are merged in the order in which they have been
+        # submitted. While merging, the timestamps of every block are moved behind the end of the
+        # previous block, like the traces of a serial simulation follow each other (see
+        # get_block_shift). The generated event logs, therefore, only depend on the random seed
+        # and the number of workers. Leaving the pool terminates the worker processes, so that no
+        # worker keeps generating traces after the simulation has been stopped or has failed.
+        try:
+            break_var = False
+            seed_sequence = np.random.SeedSequence(self.config.random_seed)
+            with multiprocessing.get_context("spawn").Pool(self.config.workers, initialize_worker,
+                                                           (self.model, self.config)) as pool:
+                while len(self.event_logs) < self.number_of_event_logs:
+                    while self.current_event_log.get_number_of_traces() < \
+                            self.config.number_of_traces:
+                        self.add_parallel_random_traces(pool, seed_sequence)
+                        with self.thread_status_lock:
+                            self.sim_status.nr_of_current_logs = len(self.event_logs)
+                            self.sim_status.nr_of_current_traces = \
+                                self.current_event_log.get_number_of_traces()
+                            self.sim_status.simulation_ended = False
+                            if self.thread_stop:
+                                break_var = True
+                                break
+                    with self.thread_status_lock:
+                        self.finish_current_event_log()
+                        if self.thread_stop:
+                            break_var = True
+                    if break_var:
+                        break
+                    self.current_event_log = self.create_event_log()
+                    self.set_up_sim()
+            with self.thread_status_lock:
+                self.sim_status.nr_of_current_logs = len(self.event_logs)
+                if break_var:
+                    nr_of_traces = 0
+                    for log in self.event_logs:
+                        nr_of_traces += log.get_number_of_traces()
+                    self.sim_status.nr_of_current_traces = nr_of_traces
+                else:
+                    self.sim_status.nr_of_current_traces = \
+                        self.current_event_log.get_number_of_traces()
+                self.sim_status.simulation_ended = True
+        except:
+            Global.log_error(__file__, "Simulation ended with errors!", traceback)
+            self.exit_with_errors = True
+            self.errors = str(traceback.format_exc())
+
+    def add_parallel_random_traces(self, pool: multiprocessing.pool.Pool,
+                                   seed_sequence: np.random.SeedSequence):
+        number_of_missing_traces = self.config.number_of_traces - \
+                                   self.current_event_log.get_number_of_traces()
+        block_size = min(self.parallel_block_size,
+                         -(-number_of_missing_traces // self.config.workers))
+        block_sizes = []
+        while sum(block_sizes) < number_of_missing_traces and \
+                len(block_sizes) < self.config.workers:
+            block_sizes.append(min(block_size, number_of_missing_traces - sum(block_sizes)))
+
+        # The workers skip traces that would already exceed the duplicate limit. Duplicates
+        # between the blocks of one round are removed while merging.
+        trace_counts = self.current_event_log.get_trace_counts(
+            self.config.duplicates_with_invisible_trans, self.config.duplicates_with_data_perspective)
+        results = []
+        for size, block_seed_sequence in zip(block_sizes, seed_sequence.spawn(len(block_sizes))):
+            results.append(pool.apply_async(generate_random_traces, (
+                block_seed_sequence, size, size * self.parallel_attempts_per_trace,
+                self.current_time, trace_counts)))
+        start_time = self.current_time
+        end_time = start_time
+        for result in results:
+            if not self.wait_for_worker(result):
+                return
+            traces, block_end_time = result.get()
+            if not self.config.fixed_timestamp:
+                shift = self.get_block_shift(traces, start_time, end_time)
+                self.shift_traces(traces, shift)
+                end_time = self.shift_time(block_end_time, shift)
+            for trace in traces:
+                if self.current_event_log.get_number_of_traces() < self.config.number_of_traces:
+                    if self.count_duplicates(trace) <= self.config.max_trace_duplicates:
+                        self.current_event_log.add_trace(trace)
+        if not self.config.fixed_timestamp:
+            self.current_time = end_time
+
+    def wait_for_worker(self, result: multiprocessing.pool.AsyncResult) -> bool:
+        # Returns False if the simulation has been stopped before the worker was finished.
+        while not result.ready():
+            result.wait(self.parallel_wait_timeout)
+            with self.thread_status_lock:
+                if self.thread_stop:
+                    return False
+        return True
+
+    def get_block_shift(self, traces: list, start_time: datetime.datetime,
+                        end_time: datetime.datetime) -> int:
+        # Microseconds by which the traces of a block that started at start_time are moved, so
+        # that the block follows the previous block, which ended at end_time. Without time
+        # intervals, the block continues at end_time. With time intervals, the block may instead
+        # start at the next start of an interval after end_time, like a serial simulation waits
+        # for the next interval. A shift is only used if all events that lie within their
+        # intervals still do after the shift. Moving the block by whole weeks always keeps them
+        # within their intervals and is used if no earlier start does.
+        shift = TimestampFormatter.get_epoch_timestamp(end_time)[0] - \
+            TimestampFormatter.get_epoch_timestamp(start_time)[0]
+        if shift <= 0:
+            return 0
+        default_calendar, calendars = self.get_event_calendars()
+        events = self.get_block_events(traces)
+        if (default_calendar is None and not any(calendars.values())) or not events:
+            return self.round_block_shift(shift)
+        week = WorkingTimeCalendar.seconds_per_week * 1000000
+        first_timestamp = min(event.timestamp for event in events)
+        candidates = {shift}
+        for calendar in set(calendars.values()) | {default_calendar}:
+            if calendar is not None:
+                for interval_start in self.get_interval_starts(calendar, end_time):
+                    candidates.add(TimestampFormatter.get_epoch_timestamp(interval_start)[0] -
+                                   first_timestamp)
+        event_calendars = []
+        for event in events:
+            calendar = calendars.get(event.trans_id, default_calendar)
+            if calendar is not None and calendar.is_valid(self.get_event_time(event, 0)):
+                event_calendars.append((event, calendar))
+        for candidate in sorted(candidates):
+            if candidate < 0:
+                continue
+            candidate = self.round_block_shift(candidate)
+            if self.keeps_events_valid(event_calendars, candidate):
+                return candidate
+        return -(-shift // week) * week
+
+    def round_block_shift(self, shift: int) -> int:
+        # Without milliseconds, the timestamps of the events are whole seconds and stay so.
+        if not self.config.timestamp_millieseconds:
+            return -(-shift // 1000000) * 1000000
+        return shift
+
+    def get_event_calendars(self) -> tuple:
+        # Returns the calendar of the general configuration and a dict that maps the ids of the
+        # transitions with their own configuration to their calendar. Calendars are None if there
+        # are no time intervals.
+        default_calendar = None
+        if self.config.time_intervals:
+            default_calendar = self.get_calendar(self.config.time_intervals)
+        calendars = {}
+        if self.model is not None:
+            for transition in self.model.transitions:
+                if not transition.config.use_general_config:
+                    if transition.config.time_intervals:
+                        calendars[transition.id] = self.get_calendar(
+                            transition.config.time_intervals)
+                    else:
+                        calendars[transition.id] = None
+        return default_calendar, calendars
+
+    def get_block_events(self, traces: list) -> list:
+        events = []
+        event_ids = set()  # partial traces share the events of their parent trace
+        for trace in traces:
+            for event in trace.events:
+                if id(event) not in event_ids:
+                    event_ids.add(id(event))
+                    events.append(event)
+        return events
+
+    def get_interval_starts(self, calendar: WorkingTimeCalendar,
+                            end_time: datetime.datetime) -> list:
+        # All starts of intervals within one week after end_time.
+        interval_starts = []
+        time = end_time
+        try:
+            while True:
+                interval_start = time + datetime.timedelta(
+                    seconds=calendar.get_seconds_to_next_start(time))
+                if interval_start - end_time > datetime.timedelta(weeks=1):
+                    break
+                interval_starts.append(interval_start)
+                time = interval_start + datetime.timedelta(seconds=1)
+        except OverflowError:
+            pass
+        return interval_starts
+
+    def get_event_time(self, event, shift: int) -> datetime.datetime:
+        # Local date and time of the shifted event, which the calendars compare with.
+        utc_offset = event.utc_offset or 0
+        return TimestampFormatter.naive_epoch + datetime.timedelta(
+            microseconds=event.timestamp + shift + utc_offset * 1000000)
+
+    def keeps_events_valid(self, event_calendars: list, shift: int) -> bool:
+        try:
+            for event, calendar in event_calendars:
+                if not calendar.is_valid(self.get_event_time(event, shift)):
+                    return False
+        except OverflowError:
+            return False
+        return True
+
+    def shift_traces(self, traces: list, shift: int):
+        if shift == 0:
+            return
+        max_timestamp = TimestampFormatter.get_epoch_timestamp(datetime.datetime.max)[0]
+        for event in self.get_block_events(traces):
+            utc_offset = event.utc_offset or 0
+            event.timestamp = min(event.timestamp + shift, max_timestamp - utc_offset * 1000000)
+
+    def shift_time(self, time: datetime.datetime, shift: int) -> datetime.datetime:
+        try:
+            return time + datetime.timedelta(microseconds=shift)
+        except OverflowError:
+            return datetime.datetime.max
+
+    def run_parallel_event_log_generation(self):
+        # Every event log is generated by one of the worker processes with its own generator that
+        # is spawned from a SeedSequence of the random seed. Therefore, every event log only
+        # depends on the random seed and its index. The event logs are passed to the event log
+        # handler in the order in which they are finished. Leaving the pool terminates the worker
+        # processes, so that no worker keeps generating an event log after the simulation has
+        # been stopped or has failed.
+        try:
+            seed_sequences = np.random.SeedSequence(self.config.random_seed).spawn(
+                self.number_of_event_logs)
+            finished_event_logs = {}
+            with multiprocessing.get_context("spawn").Pool(self.config.workers, initialize_worker,
+                                                           (self.model, self.config)) as pool:
+                results = {}
+                for index, seed_sequence in enumerate(seed_sequences):
+                    results[index] = pool.apply_async(generate_random_event_log, (
+                        seed_sequence, self.event_log_name, self.event_log_creator))
+                break_var = False
+                while len(finished_event_logs) < len(results) and not break_var:
+                    pending = [index for index in results if index not in finished_event_logs]
+                    results[pending[0]].wait(self.parallel_wait_timeout)
+                    for index in pending:
+                        if results[index].ready():
+                            event_log = results[index].get()
+                            finished_event_logs[index] = event_log
+                            if self.event_log_handler is not None:
+                                self.event_log_handler(event_log, index)
+                    with self.thread_status_lock:
+                        # The traces of the event logs that are still generated are not known.
+                        self.sim_status.nr_of_current_logs = len(finished_event_logs)
+                        self.sim_status.nr_of_current_traces = 0
+                        self.sim_status.simulation_ended = False
+                        if self.thread_stop:
+                            break_var = True
+            with self.thread_status_lock:
+                for index in sorted(finished_event_logs.keys()):
+                    self.event_logs.append(finished_event_logs[index])
+                self.sim_status.nr_of_current_logs = len(self.event_logs)
+                self.sim_status.nr_of_current_traces = 0
                 self.sim_status.simulation_ended = True
         except:
             Global.log_error(__file__, "Simulation ended with errors!", traceback)
@@ -320,16 +915,11 @@ class Simulation:
             self.errors = str(traceback.format_exc())
 
     def run_random_exploration(self):
-        self.current_event_log = EventLog(self.event_log_name,
-                                          self.event_log_creator)
+        self.current_event_log = self.create_event_log()
         no_traces_possible = False
         try:
             if self.config.perform_trace_estimation:
-                self.possible_traces = self.calculate_possible_traces(self.model)
-                if self.config.only_ending_traces:
-                    nr_of_possible_traces = len(self.possible_traces.valid_ending_traces)
-                else:
-                    nr_of_possible_traces = self.possible_traces.number_of_possible_traces
+                nr_of_possible_traces = self.count_possible_traces(self.model)
                 if nr_of_possible_traces == 0:
                     no_traces_possible = True
                     raise Exception
@@ -337,7 +927,7 @@ class Simulation:
                 nr_of_possible_traces = 0
             with self.thread_status_lock:
                 self.sim_status = SimStatus(0, 0, False, nr_of_possible_traces, True)
-            while len(self.current_event_log.traces) < nr_of_possible_traces or \
+            while self.current_event_log.get_number_of_traces() < nr_of_possible_traces or \
                     not self.config.perform_trace_estimation:
                 time_before_trace = copy(self.current_time)
                 success = False
@@ -346,7 +936,7 @@ class Simulation:
                 if not self.config.only_ending_traces or reached_valid_final_marking:
                     if self.count_duplicates(trace) <= self.config.max_trace_duplicates:
                         if self.get_trace_length(trace) >= self.config.min_trace_length:
-                            self.current_event_log.traces.append(trace)
+                            self.current_event_log.add_trace(trace)
                             success = True
                 if not success:
                     self.current_time = time_before_trace
@@ -356,8 +946,9 @@ class Simulation:
                         for partial_trace in partial_traces:
                             if self.count_duplicates(
                                     partial_trace) <= self.config.max_trace_duplicates:
-                                if len(self.current_event_log.traces) < self.config.number_of_traces:
-                                    self.current_event_log.traces.append(partial_trace)
+                                if self.current_event_log.get_number_of_traces() < \
+                                        self.config.number_of_traces:
+                                    self.current_event_log.add_trace(partial_trace)
                 self.model.reset()
                 self.model.generate_initial_values(self.value_generator)
                 if self.config.fixed_timestamp:
@@ -365,17 +956,20 @@ class Simulation:
                 with self.thread_status_lock:
                     if self.thread_stop:
                         break
-                    elif len(self.current_event_log.traces) >= self.config.number_of_traces:
+                    elif self.current_event_log.get_number_of_traces() >= \
+                            self.config.number_of_traces:
                         break
                     self.sim_status.nr_of_current_logs = len(self.event_logs)
-                    self.sim_status.nr_of_current_traces = len(self.current_event_log.traces)
+                    self.sim_status.nr_of_current_traces = \
+                        self.current_event_log.get_number_of_traces()
                     self.sim_status.simulation_ended = False
             with self.thread_status_lock:
                 self.model.reset()
                 self.model.generate_initial_values(self.value_generator)
-                self.event_logs.append(self.current_event_log)
+                self.finish_current_event_log()
                 self.sim_status.nr_of_current_logs = len(self.event_logs)
-                self.sim_status.nr_of_current_traces = len(self.current_event_log.traces)
+                self.sim_status.nr_of_current_traces = \
+                    self.current_event_log.get_number_of_traces()
                 self.sim_status.simulation_ended = True
         except:
             Global.log_error(__file__, "Simulation ended with errors!", traceback)
@@ -389,7 +983,7 @@ class Simulation:
     def no_traces_generated(self):
         traces = 0
         for event_log in self.event_logs:
-            traces += len(event_log.traces)
+            traces += event_log.get_number_of_traces()
         if traces == 0:
             return True
         else:
@@ -410,32 +1004,30 @@ class Simulation:
         return None
 
     def determine_partial_traces(self, trace):
+        # The partial traces are prefixes of the trace that share its events (see PartialTrace),
+        # starting with the longest one.
         partial_traces = []
         events = trace.events
-        if len(events) < 2:
-            return partial_traces
-        else:
-            current_partial_trace = deepcopy(events)
-            while len(current_partial_trace) > 1:
-                current_partial_trace.pop()
-                tmp = Trace(trace.name)
-                tmp.events = deepcopy(current_partial_trace)
-                if self.get_trace_length(tmp) >= self.config.min_trace_length:
-                    partial_traces.append(tmp)
-                else:
-                    break
-            return partial_traces
+        trace_length = self.get_trace_length(trace)
+        for length in range(len(events) - 1, 0, -1):
+            if not events[length].from_invisible_transition:
+                trace_length -= 1
+            if trace_length < self.config.min_trace_length:
+                break
+            partial_traces.append(PartialTrace(trace, length))
+        return partial_traces
 
     def generate_random_single_trace(self):
-        trace = Trace(self.generate_trace_name())
-        seen_markings = [self.model.current_marking.to_string()]
+        trace = self.current_event_log.create_trace(self.generate_trace_name())
+        loop_tracker = LoopTracker()
+        loop_tracker.add_marking(self.model.current_marking.to_key())
         previous_transition = None
         while not self.model.is_in_final_state():
             if self.get_trace_length(trace) >= self.config.max_trace_length:
                 return trace, False
             elif self.config.model_has_no_increasing_loop and \
-                    self.max_loop_iterations_exceeded(seen_markings, trace.get_transition_ids()):
-                trace.events.pop()
+                    self.max_loop_iterations_exceeded(loop_tracker):
+                trace.remove_last_event()
                 return trace, False
             else:
                 fired_transition = self.fire_transition()
@@ -445,7 +1037,8 @@ class Simulation:
                                                                previous_transition)
                     except OverflowError:
                         self.current_time = datetime.datetime.max
-                    seen_markings.append(self.model.current_marking.to_string())
+                    loop_tracker.add_marking(self.model.current_marking.to_key())
+                    loop_tracker.add_transition(fired_transition.id)
                     previous_transition = fired_transition
                     if self.config.values_in_origin_event:
                         if fired_transition.writes_variables:
@@ -470,7 +1063,7 @@ class Simulation:
             if self.config.allow_duplicate_trace_names:
                 return "trace"
             else:
-                return "trace" + str(len(self.current_event_log.traces) + 1)
+                return "trace" + str(self.current_event_log.get_number_of_traces() + 1)
 
     def generate_unique_trace_name(self):
         if self.unused_trace_names:
@@ -496,17 +1089,18 @@ class Simulation:
 
         if not fired_transition.config.no_time_forward:
             if fired_transition.config.use_general_config:
-                generator = self.get_truncated_normal(self.config.avg_timestamp_delay,
-                                                      self.config.timestamp_delay_sd,
-                                                      self.config.timestamp_delay_min,
-                                                      self.config.timestamp_delay_max)
-                delay += generator.rvs()
+                sampler = self.get_delay_sampler((None, "delay"),
+                                                 self.config.avg_timestamp_delay,
+                                                 self.config.timestamp_delay_sd,
+                                                 self.config.timestamp_delay_min,
+                                                 self.config.timestamp_delay_max)
             else:
-                generator = self.get_truncated_normal(fired_transition.config.avg_time_delay,
-                                                      fired_transition.config.time_delay_sd,
-                                                      fired_transition.config.time_delay_min,
-                                                      fired_transition.config.time_delay_max)
-                delay += generator.rvs()
+                sampler = self.get_delay_sampler((fired_transition.id, "delay"),
+                                                 fired_transition.config.avg_time_delay,
+                                                 fired_transition.config.time_delay_sd,
+                                                 fired_transition.config.time_delay_min,
+                                                 fired_transition.config.time_delay_max)
+            delay += sampler.next_sample()
         if self.check_timestamp_validity(valid_time_intervals, delay):
             timedelta = datetime.timedelta(seconds=delay)
         else:
@@ -525,116 +1119,49 @@ class Simulation:
     def check_timestamp_validity(self, valid_time_intervals, delay):
         if not valid_time_intervals:
             return True
-        target_timestamp = copy(self.current_time) + datetime.timedelta(seconds=delay)
-        for time_interval in valid_time_intervals:
-            if self.in_interval(target_timestamp, time_interval):
-                return True
-        return False
-
-    def in_interval(self, time, time_interval):
-        weekdays, interval = time_interval.replace(" ", "").split("|")
-        if "," in weekdays:
-            weekdays = weekdays.split(",")
-        else:
-            weekdays = [weekdays]
-        valid_day = False
-        current_weekday = time.weekday()
-        for weekday in weekdays:
-            if current_weekday == Weekday[weekday].value:
-                valid_day = True
-                break
-        if not valid_day:
-            return False
-
-        interval_start, interval_stop = self.get_interval_timestamps(time, interval.split("-")[0],
-                                                                     interval.split("-")[1])
-
-        if interval_start <= time <= interval_stop:
-            return True
-        else:
-            return False
-
-    def get_interval_timestamps(self, base_time, start_string, stop_string):
-        interval_start_time = datetime.datetime.strptime(start_string, "%H:%M:%S")
-        interval_stop_time = datetime.datetime.strptime(stop_string, "%H:%M:%S")
-        interval_start = copy(base_time)
-        interval_stop = copy(base_time)
-
-        interval_start = interval_start.replace(hour=interval_start_time.hour,
-                                                minute=interval_start_time.minute,
-                                                second=interval_start_time.second)
-        interval_stop = interval_stop.replace(hour=interval_stop_time.hour,
-                                              minute=interval_stop_time.minute,
-                                              second=interval_stop_time.second)
-        return interval_start, interval_stop
+        target_timestamp = self.current_time + datetime.timedelta(seconds=delay)
+        return self.get_calendar(valid_time_intervals).is_valid(target_timestamp)
+
+    def get_calendar(self, valid_time_intervals):
+        # The time interval strings are only parsed once per simulation and list of intervals.
+        key = tuple(valid_time_intervals)
+        calendar = self.calendars.get(key)
+        if calendar is None:
+            calendar = WorkingTimeCalendar(valid_time_intervals)
+            self.calendars[key] = calendar
+        return calendar
 
     def get_next_valid_timestamp(self, delay1, valid_time_intervals, add_variance, max_variance):
-        processed_intervals = []
-        for valid_interval in valid_time_intervals:
-            weekdays_string, interval_string = valid_interval.replace(" ", "").split("|")
-            if "," in weekdays_string:
-                weekdays_string = weekdays_string.split(",")
-            else:
-                weekdays_string = [weekdays_string]
-            weekdays = []
-            for weekday in weekdays_string:
-                weekdays.append(Weekday[weekday].value)
-            weekdays.sort()
-            start, stop = interval_string.split("-")
-            processed_intervals.append((weekdays, (start, stop)))
-
-        target_timestamp = copy(self.current_time) + datetime.timedelta(seconds=delay1)
-
-        distance_to_intervals = []  # Tuple (distance, interval_start: Datetime obj)
-        for interval in processed_intervals:
-            distance_to_intervals.append(self.get_distance_to_interval(target_timestamp, interval))
-        distance_to_intervals.sort(key=lambda x: x[0])
-
-        delay2, interval_start, interval_stop = distance_to_intervals[0]
+        target_timestamp = self.current_time + datetime.timedelta(seconds=delay1)
+        delay2 = self.get_calendar(valid_time_intervals).get_seconds_to_next_start(target_timestamp)
         if add_variance and max_variance > 0:
             max_variance_sec = max_variance * 60
-            interval_length = (interval_stop - interval_start).total_seconds()
-            if interval_length > max_variance_sec:
-                delay2 += random.randint(0, max_variance_sec)
-            else:
-                delay2 += random.randint(0, max_variance_sec)
+            delay2 += int(self.rng.integers(0, max_variance_sec, endpoint=True))
 
         return datetime.timedelta(seconds=delay1 + delay2)
 
-    def get_distance_to_interval(self, target_timestamp, interval):
-        interval_start, interval_stop = self.get_interval_timestamps(target_timestamp,
-                                                                     interval[1][0],
-                                                                     interval[1][1])
-
-        if target_timestamp.weekday() in interval[0] and interval_start >= target_timestamp:
-            distance = (interval_start - target_timestamp).total_seconds()
-        else:
-            if interval_start <= target_timestamp:
-                interval_start += datetime.timedelta(days=1)
-                interval_stop += datetime.timedelta(days=1)
-            while interval_start.weekday() not in interval[0]:
-                interval_start += datetime.timedelta(days=1)
-                interval_stop += datetime.timedelta(days=1)
-            distance = (interval_start - target_timestamp).total_seconds()
-
-        return distance, interval_start, interval_stop
-
     def get_previous_transition_lead_time(self, previous_transition):
         if previous_transition.config.use_general_config:
-            generator = self.get_truncated_normal(self.config.avg_timestamp_lead,
-                                                  self.config.timestamp_lead_sd,
-                                                  self.config.timestamp_lead_min,
-                                                  self.config.timestamp_lead_max)
-            return generator.rvs()
+            sampler = self.get_delay_sampler((None, "lead"),
+                                             self.config.avg_timestamp_lead,
+                                             self.config.timestamp_lead_sd,
+                                             self.config.timestamp_lead_min,
+                                             self.config.timestamp_lead_max)
         else:
-            generator = self.get_truncated_normal(previous_transition.config.avg_lead_time,
-                                                  previous_transition.config.lead_time_sd,
-                                                  previous_transition.config.lead_time_min,
-                                                  previous_transition.config.lead_time_max)
-            return generator.rvs()
-
-    def get_truncated_normal(self, mean, sd, low, upp):
-        return truncnorm((low - mean) / sd, (upp - mean) / sd, loc=mean, scale=sd)
+            sampler = self.get_delay_sampler((previous_transition.id, "lead"),
+                                             previous_transition.config.avg_lead_time,
+                                             previous_transition.config.lead_time_sd,
+                                             previous_transition.config.lead_time_min,
+                                             previous_transition.config.lead_time_max)
+        return sampler.next_sample()
+
+    def get_delay_sampler(self, key, mean, sd, low, upp):
+        # The samplers are recreated if the configuration has been changed in the meantime.
+        sampler = self.delay_samplers.get(key)
+        if sampler is None or not sampler.has_parameters(mean, sd, low, upp):
+            sampler = DelaySampler(mean, sd, low, upp, self.rng)
+            self.delay_samplers[key] = sampler
+        return sampler
 
     def fire_transition(self):
         enabled_transitions, probabilities = self.model.get_enabled_transitions(True, True,
@@ -646,73 +1173,24 @@ class Simulation:
             self.model.fire_transition(chosen_transition.id, True)
             return chosen_transition
 
-    def max_loop_iterations_exceeded(self, seen_markings, trace=[]):
-        for marking in seen_markings:
-            if seen_markings.count(marking) > self.config.max_loop_iterations:
-                return True
-        for transition_id in trace:
-            if trace.count(transition_id) > self.config.max_loop_iterations_transitions:
-                return True
-        return False
+    def max_loop_iterations_exceeded(self, loop_tracker):
+        return loop_tracker.max_marking_count > self.config.max_loop_iterations or \
+            loop_tracker.max_transition_count > self.config.max_loop_iterations_transitions
 
     def count_duplicates(self, trace):
-        duplicate_count = 0
-        for other_trace in self.current_event_log.traces:
-            if self.are_duplicate_traces(trace, other_trace):
-                duplicate_count += 1
-        return duplicate_count
+        return self.current_event_log.count_duplicates(trace,
+                                                       self.config.duplicates_with_invisible_trans,
+                                                       self.config.duplicates_with_data_perspective)
 
     def are_duplicate_traces(self, trace1, trace2):
         consider_invisible_trans = self.config.duplicates_with_invisible_trans
-        if not self.equal_trace_length(trace1, trace2, consider_invisible_trans):
-            return False
-        if not consider_invisible_trans:
-            for event1, event2 in zip(self.get_non_invisible_events(trace1),
-                                      self.get_non_invisible_events(trace2)):
-                if not self.are_duplicate_events(event1, event2):
-                    return False
-            return True
-        else:
-            for event1, event2 in zip(trace1.events, trace2.events):
-                if not self.are_duplicate_events(event1, event2):
-                    return False
-            return True
-
-    def equal_trace_length(self, trace1, trace2, consider_invisible_trans):
-        if consider_invisible_trans:
-            return len(trace1.events) == len(trace2.events)
-        else:
-            return self.get_trace_length(trace1) == self.get_trace_length(trace2)
-
-    def are_duplicate_events(self, event1, event2):
-        if event1.trans_id != event2.trans_id:
-            return False
-        if self.config.duplicates_with_data_perspective:
-            if len(event1.variables) != len(event2.variables):
-                return False
-            else:
-                for variable1, variable2 in zip(sorted(event1.variables),
-                                                sorted(event2.variables)):
-                    if not self.are_duplicate_variables(variable1, variable2):
-                        return False
-        return True
-
-    def are_duplicate_variables(self, variable1, variable2):
-        if variable1[0] == "time:timestamp":
-            return True
-        elif variable1[0] != variable2[0]:
-            return False
-        elif variable1[1] != variable2[1]:
-            return False
-        elif variable1[2] != variable2[2]:
-            return False
-        else:
-            return True
+        with_data_perspective = self.config.duplicates_with_data_perspective
+        return trace1.get_fingerprint(consider_invisible_trans, with_data_perspective) == \
+            trace2.get_fingerprint(consider_invisible_trans, with_data_perspective)
 
     def create_event(self, transition, trace):
-        event = Event(transition.config.activity_name, self.current_time, self.model, transition.id,
-                      self.config.timestamp_millieseconds, transition.invisible)
-        trace.events.append(event)
+        trace.add_event(transition.config.activity_name, self.current_time, self.model,
+                        transition.id, self.config.timestamp_millieseconds, transition.invisible)
 
     def get_non_invisible_events(self, trace):
         events = []
@@ -722,16 +1200,11 @@ class Simulation:
         return events
 
     def get_trace_length(self, trace):
-        event_count = 0
-        for event in trace.events:
-            if not event.from_invisible_transition:
-                event_count += 1
-        return event_count
+        return trace.get_length()
 
     # --------------------------------------- All Traces experimental model ------------------------------------------------
     def run_full_exploration(self):
-        self.current_event_log = EventLog(self.event_log_name,
-                                          self.event_log_creator)
+        self.current_event_log = self.create_event_log()
         no_traces_possible = False
         no_traces_found = False
         try:
@@ -745,18 +1218,14 @@ class Simulation:
                 raise Exception
             with self.thread_status_lock:
                 self.sim_status = SimStatus(0, 0, False, nr_of_possible_traces, True)
-            variable_values_objs = []
-            variable_values = []
-            variable_names = []
+            variable_values = {}
             analyser = ModelAnalyser()
             interval_dict = analyser.determine_intervals(self.model, None, None, True)
             for variable in self.model.variables:
-                variable_values_objs.append(
-                    self.determine_discrete_variable_values(variable, interval_dict))
-                variable_values_objs[-1].combine_values_and_intervals()
-                variable_values.append(variable_values_objs[-1].combined_values)
-                variable_names.append(variable.name)
-            combinations = list(itertools.product(*variable_values))
+                variable_values_obj = self.determine_discrete_variable_values(variable,
+                                                                              interval_dict)
+                variable_values_obj.combine_values_and_intervals()
+                variable_values[variable.name] = variable_values_obj.combined_values
             valid_traces = self.possible_traces.valid_ending_traces
             other_traces = self.possible_traces.other_traces
             variables = self.get_variables()
@@ -773,10 +1242,12 @@ class Simulation:
                 with self.thread_status_lock:
                     if self.thread_stop:
                         break
-                    elif len(self.current_event_log.traces) >= self.config.number_of_traces:
+                    elif self.current_event_log.get_number_of_traces() >= \
+                            self.config.number_of_traces:
                         break
                     self.sim_status.nr_of_current_logs = len(self.event_logs)
-                    self.sim_status.nr_of_current_traces = len(self.current_event_log.traces)
+                    self.sim_status.nr_of_current_traces = \
+                        self.current_event_log.get_number_of_traces()
                     self.sim_status.simulation_ended = False
                 guard_strings, written_variables_names = \
                     self.get_guard_strings_and_written_variable(trace)
@@ -785,44 +1256,52 @@ class Simulation:
                     for variable in variables:
                         if variable.name in written_variables_names:
                             written_variables.append(variable)
-                    for combination in combinations:
-                        with self.thread_status_lock:
-                            if self.thread_stop:
-                                break_var = True
-                                break
-                        success, generated_trace = self.try_combination(trace, combination,
-                                                                        guard_strings,
-                                                                        written_variables,
-                                                                        variables, milp_solver)
-                        if success:
-                            self.current_event_log.traces.append(generated_trace)
-                            partial_traces = self.determine_partial_traces(generated_trace)
-                            if partial_traces:
-                                for partial_trace in partial_traces:
-                                    if self.count_duplicates(
-                                            partial_trace) <= self.config.max_trace_duplicates:
-                                        if len(self.current_event_log.traces) < \
-                                                self.config.number_of_traces:
-                                            self.current_event_log.traces.append(partial_trace)
-                            break
+                    solved = False
+                    if self.config.solve_guards_with_milp:
+                        solved, combination = self.solve_combination(guard_strings,
+                                                                     written_variables,
+                                                                     variable_values, variables,
+                                                                     milp_solver)
+                    if not solved:
+                        combination = self.find_combination(guard_strings, written_variables,
+                                                            variable_values, variables,
+                                                            milp_solver)
+                    with self.thread_status_lock:
+                        if self.thread_stop:
+                            break_var = True
+                    if combination is not None and not break_var:
+                        generated_trace = self.generate_trace_with_var_combination(trace,
+                                                                                   combination)
+                        self.current_event_log.add_trace(generated_trace)
+                        partial_traces = self.determine_partial_traces(generated_trace)
+                        if partial_traces:
+                            for partial_trace in partial_traces:
+                                if self.count_duplicates(
+                                        partial_trace) <= self.config.max_trace_duplicates:
+                                    if self.current_event_log.get_number_of_traces() < \
+                                            self.config.number_of_traces:
+                                        self.current_event_log.add_trace(partial_trace)
                 else:
                     for variable in self.model.variables:
                         variable.reset()
                     success = True
+                    current_values = milp_solver.get_variable_values(variables)
                     for guard in guard_strings:
-                        if not milp_solver.compile_and_evaluate_string(guard, variables):
+                        if not milp_solver.compile_and_evaluate_string(guard, variables,
+                                                                       variable_values=current_values):
                             success = False
                             break
                     if success:
-                        self.current_event_log.traces.append(
+                        self.current_event_log.add_trace(
                             self.generate_trace_without_var_writes(trace)
                         )
             with self.thread_status_lock:
                 self.model.reset()
                 self.model.generate_initial_values(self.value_generator)
-                self.event_logs.append(self.current_event_log)
+                self.finish_current_event_log()
                 self.sim_status.nr_of_current_logs = len(self.event_logs)
-                self.sim_status.nr_of_current_traces = len(self.current_event_log.traces)
+                self.sim_status.nr_of_current_traces = \
+                    self.current_event_log.get_number_of_traces()
                 self.sim_status.simulation_ended = True
             if self.no_traces_generated():
                 no_traces_found = True
@@ -907,23 +1386,100 @@ class Simulation:
                 guard_strings.append(trans.guard.guard_string)
         return guard_strings, written_variables
 
-    def try_combination(self, trace, combination, guards, written_variables, variables,
-                        milp_solver):
+    def find_combination(self, guards, written_variables, variable_values, variables,
+                         milp_solver):
+        # Searches the first combination of values for the variables written by a trace (in the
+        # order of itertools.product) for which all guards of the trace are satisfied. Variables
+        # that are not written by the trace have no value and are therefore not part of the
+        # combinations. The combinations are built one variable after another and every guard is
+        # evaluated as soon as all written variables it reads have a value. Combinations that
+        # start with values that already violate a guard are therefore skipped as a whole.
         for variable in variables:
             variable.reset()
-        for variable in written_variables:
-            variable.value = self.get_value_from_combination(combination, variable.name)
-            variable.has_current_value = True
-            variable.has_been_written_to = True
-        success = True
+        guards_per_depth = []
+        for depth in range(len(written_variables) + 1):
+            guards_per_depth.append([])
         for guard in guards:
-            if not milp_solver.compile_and_evaluate_string(guard, variables):
-                success = False
-                break
-        if success:
-            return True, self.generate_trace_with_var_combination(trace, combination)
-        else:
+            compiled_guard = milp_solver.get_compiled_guard(guard, variables)
+            depth = 0
+            for index, variable in enumerate(written_variables):
+                if variable.name in compiled_guard.variable_names:
+                    depth = index + 1
+            guards_per_depth[depth].append(guard)
+
+        values = {}
+        if not self.guards_satisfied(guards_per_depth[0], variables, values, milp_solver):
+            return None
+        combination = []
+        positions = [0]
+        while positions:
+            with self.thread_status_lock:
+                if self.thread_stop:
+                    return None
+            depth = len(positions) - 1
+            variable_name = written_variables[depth].name
+            candidates = variable_values[variable_name]
+            if positions[-1] == len(candidates):
+                positions.pop()
+                values.pop(variable_name, None)
+                if combination:
+                    combination.pop()
+                continue
+            candidate = candidates[positions[-1]]
+            positions[-1] += 1
+            values[variable_name] = self.get_value_from_combination([candidate], variable_name)
+            if self.guards_satisfied(guards_per_depth[depth + 1], variables, values, milp_solver):
+                combination.append(candidate)
+                if len(combination) == len(written_variables):
+                    return tuple(combination)
+                positions.append(0)
+        return None
+
+    def solve_combination(self, guards, written_variables, variable_values, variables,
+                          milp_solver):
+        # Determines the values of the written variables that are read by the guards of a trace
+        # with a single mixed integer linear program (see MilpSolver.solve_linear_guards). The
+        # other written variables get their first possible value, like in find_combination.
+        # Returns (False, None) if the guards can not be solved this way and (True, None) if no
+        # combination exists, e.g. because the guards along the trace contradict each other.
+        guard_variable_names = set()
+        for guard in guards:
+            guard_variable_names.update(
+                milp_solver.get_compiled_guard(guard, variables).variable_names)
+        written_variable_names = set()
+        solved_variables = []
+        for variable in written_variables:
+            written_variable_names.add(variable.name)
+            if variable.name in guard_variable_names:
+                solved_variables.append(variable)
+        if not guard_variable_names.issubset(written_variable_names):
+            return False, None
+        result = milp_solver.solve_linear_guards(guards, variables, solved_variables)
+        if result is None:
+            return False, None
+        feasible, values = result
+        if not feasible:
+            return True, None
+        combination = []
+        for variable in written_variables:
+            if variable.name in values:
+                combination.append((variable.name, False, values[variable.name]))
+            elif variable_values[variable.name]:
+                combination.append(variable_values[variable.name][0])
+            else:
+                return True, None
+        for variable in variables:
+            variable.reset()
+        if not self.guards_satisfied(guards, variables, values, milp_solver):
             return False, None
+        return True, tuple(combination)
+
+    def guards_satisfied(self, guards, variables, variable_values, milp_solver):
+        for guard in guards:
+            if not milp_solver.compile_and_evaluate_string(guard, variables,
+                                                           variable_values=variable_values):
+                return False
+        return True
 
     def generate_trace_without_var_writes(self, trace):
         if self.config.fixed_timestamp:
@@ -933,17 +1489,15 @@ class Simulation:
             transitions.append(self.model.get_place_or_transition_by_id(trans_id))
         for variable in self.model.variables:
             variable.reset()
-        generated_trace = Trace(self.generate_trace_name())
+        generated_trace = self.current_event_log.create_trace(self.generate_trace_name())
         previous_transition = None
         for index, transition in enumerate(transitions):
             try:
                 self.current_time += self.forward_time(transition, previous_transition)
             except OverflowError:
                 self.current_time = datetime.datetime.max
-                event = Event(transition.config.activity_name, self.current_time, self.model,
-                              transition.id, self.config.timestamp_millieseconds,
-                              transition.invisible)
-                generated_trace.events.append(event)
+            self.create_event(transition, generated_trace)
+            previous_transition = transition
         return generated_trace
 
     def check_for_interval_merging(self, intervals, offset):
@@ -1002,7 +1556,7 @@ class Simulation:
 
         for variable in self.model.variables:
             variable.reset()
-        generated_trace = Trace(self.generate_trace_name())
+        generated_trace = self.current_event_log.create_trace(self.generate_trace_name())
         previous_transition = None
         for index, transition in enumerate(transitions):
             try:
@@ -1012,16 +1566,10 @@ class Simulation:
 
             if self.config.values_in_origin_event:
                 self.generate_value(transition, combination, value_gen)
-                event = Event(transition.config.activity_name, self.current_time, self.model,
-                              transition.id, self.config.timestamp_millieseconds,
-                              transition.invisible)
-                generated_trace.events.append(event)
+                self.create_event(transition, generated_trace)
 
             else:
-                event = Event(transition.config.activity_name, self.current_time, self.model,
-                              transition.id, self.config.timestamp_millieseconds,
-                              transition.invisible)
-                generated_trace.events.append(event)
+                self.create_event(transition, generated_trace)
                 self.generate_value(transition, combination, value_gen)
 
             previous_transition = transition
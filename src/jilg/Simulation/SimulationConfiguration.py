@@ -38,6 +38,7 @@ class SimulationConfiguration:
     max_time_interval_variance: int
 
     random_seed: int
+    workers: int  # number of processes that generate traces in the "random" mode
     transition_configs: list
     trace_names: list
     model_has_no_increasing_loop: bool
@@ -48,6 +49,8 @@ class SimulationConfiguration:
     duplicates_with_invisible_trans: bool
     perform_trace_estimation: bool
     merge_intervals: bool
+    solve_guards_with_milp: bool  # "all" mode: solve linear guards instead of trying combinations
+    columnar_event_logs: bool  # store the generated events in columns (see ColumnarEventLog)
 
     timestamp_millieseconds: bool
 
@@ -82,6 +85,7 @@ class SimulationConfiguration:
 
         self.model_has_no_increasing_loop = Global.standard_model_has_no_loop
         self.random_seed = Global.standard_random_seed
+        self.workers = Global.standard_workers
         self.allow_duplicate_trace_names = Global.standard_allow_duplicate_trace_names
         self.transition_configs = []
         self.trace_names = Global.standard_trace_names
@@ -95,6 +99,8 @@ class SimulationConfiguration:
         self.perform_trace_estimation = Global.standard_perform_trace_estimation
         self.use_only_values_from_guard_strings = Global.standard_use_only_values_from_guard_strings
         self.merge_intervals = Global.standard_merge_intervals
+        self.solve_guards_with_milp = Global.standard_solve_guards_with_milp
+        self.columnar_event_logs = Global.standard_columnar_event_logs
         self.timestamp_millieseconds = True
 
         self.time_intervals = []
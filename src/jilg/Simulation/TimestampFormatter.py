@@ -0,0 +1,95 @@
+import datetime
+import traceback
+from typing import Union
+
+from PySide6.QtCore import QDateTime
+
+from src.jilg.Other import Global
+from src.jilg.Other.Global import print_summary_global
+
+'''
+The events of the generated event logs do not store their timestamps as ISO strings. Instead, an
+event stores the number of microseconds since the epoch and the UTC offset of its timestamp in
+seconds (see get_epoch_timestamp). Timestamps without time zone are stored as microseconds since
+the naive epoch and without UTC offset. The values of date variables are stored as seconds since
+the epoch, like they are generated.
+
+This class is used by the writers to convert these values to ISO strings when the event log is
+written. The date and time of every distinct second and the values of the date variables are
+cached, because the events of a trace and the events of consecutive traces often share them. The
+strings are equal to the ones that datetime.isoformat and QDateTime return.
+'''
+
+
+class TimestampFormatter:
+    epoch = datetime.datetime(1970, 1, 1, tzinfo=datetime.timezone.utc)
+    naive_epoch = datetime.datetime(1970, 1, 1)
+    cache_size = 2 ** 16
+    seconds: dict  # (seconds since the (naive) epoch, UTC offset) -> ISO date and time, offset
+    dates: dict  # value of a date variable -> ISO string
+    offsets: dict  # UTC offset in seconds -> ISO string of the offset
+
+    def print_summary(self, print_list_elements=False):
+        print_summary_global(self, print_list_elements)
+
+    def __init__(self):
+        self.seconds = {}
+        self.dates = {}
+        self.offsets = {}
+
+    @staticmethod
+    def get_epoch_timestamp(timestamp: datetime.datetime) -> (int, Union[int, None]):
+        # Returns the microseconds since the epoch and the UTC offset in seconds of the timestamp.
+        utc_offset = timestamp.utcoffset()
+        if utc_offset is None:
+            return (timestamp - TimestampFormatter.naive_epoch) // datetime.timedelta(
+                microseconds=1), None
+        return (timestamp - TimestampFormatter.epoch) // datetime.timedelta(microseconds=1), \
+            utc_offset // datetime.timedelta(seconds=1)
+
+    def format_timestamp(self, timestamp: int, utc_offset: Union[int, None]) -> str:
+        seconds, microseconds = divmod(timestamp, 1000000)
+        parts = self.seconds.get((seconds, utc_offset))
+        if parts is None:
+            if len(self.seconds) >= self.cache_size:
+                self.seconds.clear()
+            if utc_offset is None:
+                parts = ((self.naive_epoch + datetime.timedelta(seconds=seconds)).isoformat(), "")
+            else:
+                parts = ((self.naive_epoch + datetime.timedelta(seconds=seconds + utc_offset))
+                         .isoformat(), self.format_utc_offset(utc_offset))
+            self.seconds[(seconds, utc_offset)] = parts
+        if microseconds:
+            return parts[0] + "." + str(microseconds).zfill(6) + parts[1]
+        return parts[0] + parts[1]
+
+    def format_utc_offset(self, utc_offset: int) -> str:
+        offset_string = self.offsets.get(utc_offset)
+        if offset_string is None:
+            if utc_offset < 0:
+                sign = "-"
+            else:
+                sign = "+"
+            minutes, seconds = divmod(abs(utc_offset), 60)
+            hours, minutes = divmod(minutes, 60)
+            offset_string = sign + str(hours).zfill(2) + ":" + str(minutes).zfill(2)
+            if seconds:
+                offset_string += ":" + str(seconds).zfill(2)
+            self.offsets[utc_offset] = offset_string
+        return offset_string
+
+    def format_date(self, value) -> str:
+        # Date variables are written in local time without UTC offset.
+        if isinstance(value, str):
+            return value
+        date = self.dates.get(value)
+        if date is None:
+            if len(self.dates) >= self.cache_size:
+                self.dates.clear()
+            try:
+                date = (QDateTime.fromSecsSinceEpoch(int(value)).toPython()).isoformat()
+            except:
+                Global.log_error(__file__, "Failed conversion from seconds to QDateTime", traceback)
+                date = "2000-01-01T00:00:00+00:00"
+            self.dates[value] = date
+        return date
@@ -1,9 +1,14 @@
-from PySide6.QtCore import QDateTime
+from typing import Union
 
 from src.jilg.Other.Global import print_summary_global, VariableTypes
+from src.jilg.Simulation.Event import Event
 
 '''
 This class is used to represent the traces in the generated event log.
+
+Partial traces are represented by the PartialTrace class as a prefix of another trace. They share
+the event objects of that trace instead of copying them, the fingerprints of the events are
+therefore also only determined once per trace (see get_prefix_fingerprint).
 '''
 
 
@@ -11,38 +16,83 @@ class Trace:
     name: str
     events: list
     variables: list  # ("var_name", var_value, "var_type")
+    event_fingerprints: Union[tuple, None]  # (options, number of events, event fingerprints)
 
     def __init__(self, name):
         self.name = name
         self.events = []
         self.variables = []
+        self.event_fingerprints = None
 
     def add_trace_variables(self, model):
         for variable in model.variables:
             if variable.has_current_value and variable.semantic_information.trace_variable:
-                if variable.type == VariableTypes.DATE:
-                    date = (QDateTime.fromSecsSinceEpoch(int(variable.value)).toPython()).isoformat()
-                    self.variables.append((variable.original_name, date,
+                # Date values are stored as seconds since the epoch (see TimestampFormatter).
+                if variable.type == VariableTypes.DOUBLE:
+                    self.variables.append((variable.original_name,
+                                           round(variable.value,
+                                                 variable.semantic_information.precision),
                                            self.get_xml_variable_type_string(variable.type)))
                 else:
-                    if variable.type == VariableTypes.DOUBLE:
-                        self.variables.append((variable.original_name,
-                                               round(variable.value,
-                                                     variable.semantic_information.precision),
-                                               self.get_xml_variable_type_string(variable.type)))
-                    else:
-                        self.variables.append((variable.original_name, variable.value,
-                                               self.get_xml_variable_type_string(variable.type)))
+                    self.variables.append((variable.original_name, variable.value,
+                                           self.get_xml_variable_type_string(variable.type)))
 
     def print_summary(self, print_list_elements=False):
         print_summary_global(self, print_list_elements)
 
+    def add_event(self, name, timestamp, model, trans_id, include_millieseconds, invisible=False):
+        self.events.append(Event(name, timestamp, model, trans_id, include_millieseconds, invisible))
+
+    def remove_last_event(self):
+        self.events.pop()
+
+    def get_length(self) -> int:
+        # Number of events that are not from invisible transitions.
+        length = 0
+        for event in self.events:
+            if not event.from_invisible_transition:
+                length += 1
+        return length
+
     def to_string(self):
         string = self.name + ": "
         for event in self.events:
             string += ", "+event.name
         return string
 
+    def get_fingerprint(self, with_invisible_transitions: bool, with_data_perspective: bool) -> tuple:
+        fingerprint = []
+        for event in self.events:
+            if with_invisible_transitions or not event.from_invisible_transition:
+                fingerprint.append(event.get_fingerprint(with_data_perspective))
+        return tuple(fingerprint)
+
+    def get_prefix_fingerprint(self, length: int, with_invisible_transitions: bool,
+                               with_data_perspective: bool) -> tuple:
+        # Fingerprint of the trace that consists of the first length events of this trace. The
+        # fingerprints of the events are cached, the events must therefore not be changed anymore.
+        fingerprint = []
+        for event_fingerprint in self.get_event_fingerprints(
+                with_invisible_transitions, with_data_perspective)[:length]:
+            if event_fingerprint is not None:
+                fingerprint.append(event_fingerprint)
+        return tuple(fingerprint)
+
+    def get_event_fingerprints(self, with_invisible_transitions: bool,
+                               with_data_perspective: bool) -> list:
+        # Fingerprints of all events, None for events that are not part of the trace fingerprint.
+        options = (with_invisible_transitions, with_data_perspective)
+        if self.event_fingerprints is None or self.event_fingerprints[0] != options or \
+                self.event_fingerprints[1] != len(self.events):
+            fingerprints = []
+            for event in self.events:
+                if with_invisible_transitions or not event.from_invisible_transition:
+                    fingerprints.append(event.get_fingerprint(with_data_perspective))
+                else:
+                    fingerprints.append(None)
+            self.event_fingerprints = (options, len(self.events), fingerprints)
+        return self.event_fingerprints[2]
+
     def get_transition_ids(self):
         trans_ids = []
         for event in self.events:
@@ -59,4 +109,31 @@ class Trace:
         elif var_type == VariableTypes.BOOL:
             return "boolean"
         elif var_type == VariableTypes.DOUBLE:
-            return "float"
\ No newline at end of file
+            return "float"
+
+
+class PartialTrace(Trace):
+    parent: Trace
+    length: int  # number of events of the parent trace that belong to the partial trace
+    event_slice: Union[list, None]  # events of the parent trace, created on the first access
+
+    def __init__(self, parent: Trace, length: int):
+        # Trace.__init__ is not called, because the events are not stored in the partial trace.
+        self.name = parent.name
+        self.variables = []
+        self.event_fingerprints = None
+        self.parent = parent
+        self.length = length
+        self.event_slice = None
+
+    @property
+    def events(self) -> list:
+        # The writers read the events of a trace several times, the slice is therefore only
+        # created once.
+        if self.event_slice is None:
+            self.event_slice = self.parent.events[:self.length]
+        return self.event_slice
+
+    def get_fingerprint(self, with_invisible_transitions: bool, with_data_perspective: bool) -> tuple:
+        return self.parent.get_prefix_fingerprint(self.length, with_invisible_transitions,
+                                                  with_data_perspective)
@@ -0,0 +1,84 @@
+import datetime
+from bisect import bisect_left, bisect_right
+from enum import Enum
+
+from src.jilg.Other.Global import print_summary_global
+
+'''
+This class is used to represent the valid time intervals of the general simulation configuration
+or of a transition configuration, e.g. ["Mon,Tue|08:00:00-17:00:00", "Sat|10:00:00-12:00:00"],
+as a weekly calendar. The interval strings are parsed once and converted to sorted intervals of
+seconds since the start of the week (Monday 00:00:00). Checking whether a timestamp lies within a
+valid interval and determining the next start of an interval are then binary searches.
+
+Like the string based implementation that was used before, timestamps are compared with a
+precision of one second and both interval bounds are inclusive.
+'''
+
+
+class Weekday(Enum):
+    Mon = 0
+    Tue = 1
+    Wed = 2
+    Thu = 3
+    Fri = 4
+    Sat = 5
+    Sun = 6
+
+
+class WorkingTimeCalendar:
+    seconds_per_day = 24 * 60 * 60
+    seconds_per_week = 7 * seconds_per_day
+    valid_intervals: list  # merged (start, stop) tuples in seconds of the week
+    valid_interval_starts: list
+    interval_starts: list  # seconds of the week at which one of the intervals starts
+
+    def print_summary(self, print_list_elements=False):
+        print_summary_global(self, print_list_elements)
+
+    def __init__(self, time_intervals: list):
+        intervals = []
+        self.interval_starts = []
+        for time_interval in time_intervals:
+            weekdays_string, interval_string = time_interval.replace(" ", "").split("|")
+            start_string, stop_string = interval_string.split("-")
+            start = self.get_second_of_day(start_string)
+            stop = self.get_second_of_day(stop_string)
+            for weekday in weekdays_string.split(","):
+                day_offset = Weekday[weekday].value * self.seconds_per_day
+                self.interval_starts.append(day_offset + start)
+                if start <= stop:
+                    intervals.append((day_offset + start, day_offset + stop))
+        self.interval_starts.sort()
+        intervals.sort()
+        self.valid_intervals = []
+        for start, stop in intervals:
+            if self.valid_intervals and start <= self.valid_intervals[-1][1] + 1:
+                if stop > self.valid_intervals[-1][1]:
+                    self.valid_intervals[-1] = (self.valid_intervals[-1][0], stop)
+            else:
+                self.valid_intervals.append((start, stop))
+        self.valid_interval_starts = []
+        for interval in self.valid_intervals:
+            self.valid_interval_starts.append(interval[0])
+
+    def get_second_of_day(self, time_string: str) -> int:
+        time = datetime.datetime.strptime(time_string, "%H:%M:%S")
+        return time.hour * 60 * 60 + time.minute * 60 + time.second
+
+    def get_second_of_week(self, timestamp: datetime.datetime) -> int:
+        return timestamp.weekday() * self.seconds_per_day + timestamp.hour * 60 * 60 \
+            + timestamp.minute * 60 + timestamp.second
+
+    def is_valid(self, timestamp: datetime.datetime) -> bool:
+        second_of_week = self.get_second_of_week(timestamp)
+        index = bisect_right(self.valid_interval_starts, second_of_week) - 1
+        return index >= 0 and second_of_week <= self.valid_intervals[index][1]
+
+    def get_seconds_to_next_start(self, timestamp: datetime.datetime) -> int:
+        second_of_week = self.get_second_of_week(timestamp)
+        index = bisect_left(self.interval_starts, second_of_week)
+        if index < len(self.interval_starts):
+            return self.interval_starts[index] - second_of_week
+        else:
+            return self.interval_starts[0] + self.seconds_per_week - second_of_week
@@ -1,3 +1,5 @@
+import json
+import tempfile
 from unittest import TestCase
 
 import numpy as np
@@ -7,6 +9,7 @@ from src.jilg.Main.Configuration import Configuration
 from src.jilg.Main.PnmlReader import PnmlReader
 from src.jilg.Model.Distribution import Distribution
 from src.jilg.Other import Global
+from src.jilg.Simulation.Event import Event
 
 
 class TestConfiguration(TestCase):
@@ -29,6 +32,67 @@ class TestConfiguration(TestCase):
         config = Configuration(np.random.default_rng(1701))
         config.read_config_file(Global.test_files_path + "test.json", self.model)
         self.check_config_after_write_and_read(config)
+        self.test_configure_event_attributes()
+        self.test_distribution()
+        self.test_invalid_output_options()
+
+    def test_invalid_output_options(self):
+        self.setUp()
+        config = Configuration(np.random.default_rng(1701))
+        config.create_basic_configuration(self.model, self.model_path, self.output_directory)
+        with tempfile.TemporaryDirectory() as directory:
+            for option, value in [("output_format", "CSV"), ("output_format", "xlsx"),
+                                  ("compression", "zip")]:
+                config.write_config_file(directory + "/config.json")
+                with open(directory + "/config.json") as config_file:
+                    json_data = json.load(config_file)
+                json_data[option] = value
+                with open(directory + "/config.json", "w") as config_file:
+                    json.dump(json_data, config_file)
+                with self.assertRaises(ValueError):
+                    Configuration(np.random.default_rng(1701)).read_config_file(
+                        directory + "/config.json", self.reader.read_pnml(self.model_path)[0])
+
+    def test_configure_event_attributes(self):
+        model = self.reader.read_pnml(self.model_path)[0]
+        config = Configuration(np.random.default_rng(1701))
+        config.create_basic_configuration(model, self.model_path, self.output_directory)
+        trans_config = config.simulation_config.transition_configs[0]
+        trans_config.included_vars = ["variable2", "patient_status"]
+        config.get_sem_info_by_variable_name("variable2").precision = 1
+        config.configure_event_attributes(model)
+        attributes = model.event_attributes[trans_config.transition_id]
+        self.assertEqual([("patient_status", "string", None), ("variable2", "float", 1)],
+                         [(variable.original_name, type_string, precision)
+                          for variable, type_string, precision in attributes])
+
+        model.variables[0].value = "healthy"
+        model.variables[0].has_current_value = True
+        model.variables[1].value = 2.26
+        model.variables[1].has_current_value = True
+        event = Event("diagnose", parse("2010-12-17T20:01:02+02:00"), model,
+                      trans_config.transition_id, False)
+        self.assertEqual([("patient_status", "healthy", "string"), ("variable2", 2.3, "float")],
+                         event.variables)
+        model.variables[1].has_current_value = False
+        config.get_sem_info_by_variable_name("patient_status").trace_variable = True
+        config.configure_event_attributes(model)
+        event = Event("diagnose", parse("2010-12-17T20:01:02+02:00"), model,
+                      trans_config.transition_id, False)
+        self.assertEqual([], event.variables)
+
+    def test_distribution(self):
+        global_state = np.random.get_state()[1].copy()
+        for distribution_type in ["truncated_normal", "uniform", "truncated_exponential"]:
+            arguments = {"mean": 15, "standard_deviation": 5, "minimum": 10, "maximum": 20}
+            distribution = Distribution(np.random.default_rng(1701), distribution_type, arguments)
+            values = [distribution.get_next_float() for i in range(Distribution.block_size + 10)]
+            for value in values:
+                self.assertTrue(10 <= value <= 20)
+            distribution = Distribution(np.random.default_rng(1701), distribution_type, arguments)
+            self.assertEqual(values[:5], [distribution.get_next_float() for i in range(5)])
+            self.assertEqual(int(values[5]), distribution.get_next_int())
+        self.assertTrue(np.array_equal(global_state, np.random.get_state()[1]))
 
     def edit_config(self, config):
         config.model_file_path = "test_model_path"
@@ -36,6 +100,7 @@ class TestConfiguration(TestCase):
         config.number_of_event_logs = 1996
         config.logs_in_one_file = True
         config.event_log_name = "test_event_log_name"
+        config.output_format = "csv"
 
         sem_info = config.get_sem_info_by_variable_name("variable2")
         sem_info.dependencies.append("(x=1) => (Y = 5)")
@@ -156,6 +221,8 @@ class TestConfiguration(TestCase):
         self.assertEqual(1996, config.number_of_event_logs)
         self.assertEqual(True, config.logs_in_one_file)
         self.assertEqual("test_event_log_name", config.event_log_name)
+        self.assertEqual("csv", config.output_format)
+        self.assertEqual(".csv", config.get_output_file_extension())
 
         for variable in self.model.variables:
             self.assertEqual(variable.name, variable.semantic_information.variable_name)
@@ -7,6 +7,7 @@ from src.jilg.Tests.TestModelAnalyser import TestModelAnalyser
 from src.jilg.Tests.TestPnmlReader import TestPnmlReader
 
 from src.jilg.Tests.TestSimulation import TestSimulation
+from src.jilg.Tests.TestXesWriter import TestXesWriter
 
 
 class TestEverything(TestCase):
@@ -18,11 +19,15 @@ class TestEverything(TestCase):
         self.configuration_test = TestConfiguration()
         self.model_analyser_test = TestModelAnalyser()
         self.simulation_test = TestSimulation()
+        self.xes_writer_test = TestXesWriter()
 
     def test_everything(self):
         self.pnml_reader_test.test_read_pnml()
         self.model_test.test_model()
         self.logic_compiler_test.test_logic_compiler()
+        self.logic_compiler_test.test_compiled_guard()
+        self.logic_compiler_test.test_solve_linear_guards()
         self.configuration_test.test_all()
         self.model_analyser_test.test_all()
         self.simulation_test.test_all()
+        self.xes_writer_test.test_all()
@@ -120,3 +120,42 @@ class TestMilpSolver(TestCase):
         self.assertEqual(self.lc.compile_and_evaluate_string(
             "(((var1 + var3) == (var2 * var2)) && ('test' == var8)) || (((var3 /var3) == var1) && "
             "( (var2 - var1) > var1))", self.variables), True)
+
+    def test_compiled_guard(self):
+        self.setUp()
+        compiled_guard = self.lc.get_compiled_guard("(var1 > 0) && (var6 != 'test')", self.variables)
+        self.assertIs(compiled_guard, self.lc.get_compiled_guard("(var1 > 0) && (var6 != 'test')",
+                                                                  self.variables))
+        self.assertEqual(compiled_guard.evaluate({"var1": 1, "var6": "var6"}), True)
+        self.assertEqual(compiled_guard.evaluate({"var1": 0, "var6": "var6"}), False)
+        self.assertEqual(compiled_guard.evaluate({"var1": 1, "var6": "test"}), False)
+
+        # Brackets that contain variables without a value evaluate to True only for "!="
+        self.assertEqual(compiled_guard.evaluate({"var1": 1}), True)
+        self.assertEqual(compiled_guard.evaluate({"var6": "var6"}), False)
+
+        with self.assertLogs(level="ERROR"):
+            compiled_guard = self.lc.get_compiled_guard("(var1 > 0) var2", self.variables)
+        self.assertEqual(compiled_guard.evaluate({"var1": 1, "var2": 2}), None)
+
+    def test_solve_linear_guards(self):
+        self.setUp()
+        guards = ["(var1 > 2) && (var2 >= var1 * 2)", "((var1 + var2) <= 10) && (var10 < var1 / 2)",
+                  "var10 > 1.25"]
+        feasible, values = self.lc.solve_linear_guards(guards, self.variables,
+                                                       [self.var1, self.var2, self.var10])
+        self.assertTrue(feasible)
+        self.assertEqual(int, type(values["var1"]))
+        self.assertEqual(float, type(values["var10"]))
+        for guard in guards:
+            self.assertTrue(self.lc.get_compiled_guard(guard, self.variables).evaluate(values))
+
+        self.assertEqual((False, None), self.lc.solve_linear_guards(
+            ["var1 > 2", "var1 < 3"], self.variables, [self.var1]))
+        self.assertEqual((False, None), self.lc.solve_linear_guards(
+            ["(var1 + var2) == 3", "(var1 - var2) == 0"], self.variables, [self.var1, self.var2]))
+        # Disjunctions, "!=", products of variables, strings and unsolved variables are not linear
+        for guard in ["var1 > 2 || var2 > 2", "var1 != 2", "var1 * var2 > 2", "var6 == 'test'",
+                      "var3 > 2"]:
+            self.assertEqual(None, self.lc.solve_linear_guards(
+                [guard], self.variables, [self.var1, self.var2]))
@@ -27,6 +27,8 @@ class TestModel(TestCase):
         self.assertEqual(self.model_step1_enabled_transitions, self.get_transition_ids(model))
         model.fire_transition(self.model_fire1)
         self.assertFalse(model.is_in_final_state())
+        for place_id, token_count in model.current_marking.token_places:
+            self.assertEqual(model.get_token_count(place_id), token_count)
         self.assertEqual(self.model_step2_enabled_transitions, self.get_transition_ids(model))
         model2 = deepcopy(model)
         model.get_variable_by_name("patient_status").value = "emergency"
@@ -51,6 +53,36 @@ class TestModel(TestCase):
         self.assertTrue(model.get_place_or_transition_by_id(self.transition_id) is not None)
         self.assertTrue(model.get_place_or_transition_by_id(self.transition_id).id == self.transition_id)
 
+        self.assertTrue(model2.get_place_or_transition_by_id(self.transition_id) in model2.transitions)
+        self.assertFalse(model2.get_place_or_transition_by_id(self.transition_id) in model.transitions)
+        variable = model.get_variable_by_name(self.variable_name)
+        variable.name = "renamed_variable"
+        model.update_indexes()
+        self.assertTrue(model.get_variable_by_name("renamed_variable") is variable)
+        self.assertTrue(model.get_variable_by_name(variable.original_name) is variable)
+
+        model = self.reader.read_pnml(self.model_path)[0]
+        graph = model.get_reachability_graph()
+        self.assertTrue(model.get_reachability_graph() is graph)
+        initial_marking_id = graph.get_marking_id(model.current_marking.token_vector)
+        self.assertFalse(graph.is_final(initial_marking_id))
+        successors = graph.get_successors(initial_marking_id)
+        self.assertEqual([self.model_fire1], self.get_transition_ids_of_successors(model, successors))
+        successors = graph.get_successors(successors[0][1])
+        self.assertEqual([self.model_fire2, self.model_fire3],
+                         self.get_transition_ids_of_successors(model, successors))
+        for transition_index, marking_id in successors:
+            self.assertTrue(graph.is_final(marking_id))
+        self.assertTrue(graph.get_successors(initial_marking_id) is
+                        graph.get_successors(initial_marking_id))
+        self.assertEqual(initial_marking_id, graph.get_marking_id(model.current_marking.token_vector))
+
+    def get_transition_ids_of_successors(self, model, successors):
+        ids = []
+        for transition_index, marking_id in successors:
+            ids.append(model.transitions[transition_index].id)
+        return ids
+
     def get_transition_ids(self, model):
         transitions = model.get_enabled_transitions(False, True, None)
         ids = []
@@ -1,18 +1,25 @@
 import datetime
+import multiprocessing
+import threading
+import time
 from copy import deepcopy, copy
 from unittest import TestCase
 
 import numpy as np
 import pytz
 
+from src.jilg.Main.Configuration import Configuration
 from src.jilg.Main.Main import Main
+from src.jilg.Main.XesWriter import XesWriter
 from src.jilg.Main.PnmlReader import PnmlReader
+from src.jilg.Model.MilpSolver import MilpSolver
 from src.jilg.Model.Model import Model
 from src.jilg.Model.Transition import Transition
 from src.jilg.Other import Global
 from src.jilg.Simulation.Event import Event
 from src.jilg.Simulation.EventLog import EventLog
-from src.jilg.Simulation.Simulation import Simulation, SimStatus
+from src.jilg.Simulation.Simulation import Simulation, SimStatus, LoopTracker, \
+    TraceEstimationResults
 from src.jilg.Simulation.SimulationConfiguration import SimulationConfiguration
 from src.jilg.Simulation.Trace import Trace
 from src.jilg.Simulation.TransitionConfiguration import TransitionConfiguration
@@ -30,6 +37,17 @@ class TestSimulation(TestCase):
         self.test_is_duplicates()
         self.test_count_duplicates()
         self.test_forward_time()
+        self.test_time_intervals()
+        self.test_determine_partial_traces()
+        self.test_count_possible_traces()
+        self.test_find_combination()
+        self.test_full_exploration()
+        self.test_columnar_event_logs()
+        self.test_parallel_random_trace_generation()
+        self.test_stop_parallel_random_trace_generation()
+        self.test_parallel_event_log_generation()
+        self.test_stop_parallel_event_log_generation()
+        self.test_concurrent_simulations()
 
     def test_is_duplicates(self):
         # Without Data
@@ -114,6 +132,10 @@ class TestSimulation(TestCase):
         self.assertEqual(3, self.simulation.count_duplicates(traceA1))
         self.assertEqual(3, self.simulation.count_duplicates(traceB1))
 
+        self.simulation.current_event_log.traces.append(deepcopy(traceA1))
+        self.assertEqual(4, self.simulation.count_duplicates(traceA1))
+        self.assertEqual(3, self.simulation.count_duplicates(traceB1))
+
         # With Data
         self.sim_config.duplicates_with_data_perspective = True
         traceA1.events = [Event("event1", timestamp, Model("name"), "t1", False),
@@ -145,18 +167,52 @@ class TestSimulation(TestCase):
         self.assertEqual(3, self.simulation.count_duplicates(traceA1))
         self.assertEqual(3, self.simulation.count_duplicates(traceB1))
 
+    def test_determine_partial_traces(self):
+        self.setUp()
+        timestamp = datetime.datetime.now(pytz.utc)
+        trace = Trace("trace1")
+        trace.events = [Event("event1", timestamp, Model("name"), "t1", False),
+                        Event("event2", timestamp, Model("name"), "t2", False, True),
+                        Event("event3", timestamp, Model("name"), "t3", False),
+                        Event("event4", timestamp, Model("name"), "t4", False)]
+        self.sim_config.min_trace_length = 1
+        partial_traces = self.simulation.determine_partial_traces(trace)
+        self.assertEqual([3, 2, 1], [len(partial_trace.events) for partial_trace in partial_traces])
+        self.assertIs(trace.events[0], partial_traces[0].events[0])
+        self.assertEqual("trace1", partial_traces[0].name)
+        self.assertIs(partial_traces[0].events, partial_traces[0].events)
+        self.assertEqual(trace.get_prefix_fingerprint(2, True, True),
+                         partial_traces[0].get_prefix_fingerprint(2, True, True))
+        self.assertEqual(3, len(partial_traces[0].get_event_fingerprints(True, True)))
+
+        copied_trace = Trace("trace2")
+        copied_trace.events = deepcopy(trace.events[:2])
+        for with_invisible_transitions in [True, False]:
+            self.assertEqual(copied_trace.get_fingerprint(with_invisible_transitions, True),
+                             partial_traces[1].get_fingerprint(with_invisible_transitions, True))
+        self.simulation.current_event_log = EventLog("log1", "creator")
+        self.simulation.current_event_log.traces = [copied_trace]
+        self.assertEqual(1, self.simulation.count_duplicates(partial_traces[1]))
+        self.assertEqual(0, self.simulation.count_duplicates(partial_traces[0]))
+
+        self.sim_config.min_trace_length = 2
+        self.assertEqual(1, len(self.simulation.determine_partial_traces(trace)))
+
     def test_max_loop_iterations_exceeded(self):
         seen_markings = ["currentMarking: ('p1', 1), ('p2', 0), ('p3', 0)",
                          "currentMarking: ('p1', 0), ('p2', 1), ('p3', 0)",
                          "currentMarking: ('p1', 0), ('p2', 1), ('p3', 3)"]
         self.simulation.config.max_loop_iterations = 1
-        self.assertFalse(self.simulation.max_loop_iterations_exceeded(seen_markings))
+        self.assertFalse(self.simulation.max_loop_iterations_exceeded(
+            self.get_loop_tracker(seen_markings)))
 
         seen_markings.append("currentMarking: ('p1', 1), ('p2', 0), ('p3', 0)")
-        self.assertTrue(self.simulation.max_loop_iterations_exceeded(seen_markings))
+        self.assertTrue(self.simulation.max_loop_iterations_exceeded(
+            self.get_loop_tracker(seen_markings)))
 
         self.sim_config.max_loop_iterations = 2
-        self.assertFalse(self.simulation.max_loop_iterations_exceeded(seen_markings))
+        self.assertFalse(self.simulation.max_loop_iterations_exceeded(
+            self.get_loop_tracker(seen_markings)))
 
         seen_markings = ["currentMarking: ('p1', 1), ('p2', 0), ('p3', 0)",
                          "currentMarking: ('p1', 0), ('p2', 1), ('p3', 0)",
@@ -165,9 +221,25 @@ class TestSimulation(TestCase):
                          "currentMarking: ('p1', 0), ('p2', 1), ('p3', 0)",
                          "currentMarking: ('p1', 0), ('p2', 1), ('p3', 3)",
                          "currentMarking: ('p1', 1), ('p2', 0), ('p3', 0)"]
-        self.assertTrue(self.simulation.max_loop_iterations_exceeded(seen_markings))
+        self.assertTrue(self.simulation.max_loop_iterations_exceeded(
+            self.get_loop_tracker(seen_markings)))
         self.sim_config.max_loop_iterations = 3
-        self.assertFalse(self.simulation.max_loop_iterations_exceeded(seen_markings))
+        self.assertFalse(self.simulation.max_loop_iterations_exceeded(
+            self.get_loop_tracker(seen_markings)))
+
+        self.sim_config.max_loop_iterations_transitions = 1
+        self.assertTrue(self.simulation.max_loop_iterations_exceeded(
+            self.get_loop_tracker(seen_markings, ["t1", "t2", "t1"])))
+
+    def get_loop_tracker(self, seen_markings, transition_ids=None):
+        if transition_ids is None:
+            transition_ids = []
+        loop_tracker = LoopTracker()
+        for marking in seen_markings:
+            loop_tracker.add_marking(marking)
+        for transition_id in transition_ids:
+            loop_tracker.add_transition(transition_id)
+        return loop_tracker
 
     def test_forward_time(self):
         self.setUp()
@@ -178,15 +250,62 @@ class TestSimulation(TestCase):
         transition1.config = trans_config1
         transition2.config = trans_config2
 
-        self.assertEqual("0:00:00.463425",
+        self.assertEqual("0:00:01.118363",
                          str(self.simulation.forward_time(transition1, transition2)))
 
         trans_config1.time_delay_min = 5
         trans_config1.time_delay_max = 60 * 5
 
-        self.assertEqual("0:00:01.139591",
+        self.assertEqual("0:00:01.147611",
                          str(self.simulation.forward_time(transition1, transition2)))
 
+    def test_time_intervals(self):
+        self.setUp()
+        time_intervals = ["Mon,Tue|08:00:00-12:00:00", "Mon | 13:00:00-17:00:00"]
+        # Monday
+        self.simulation.current_time = datetime.datetime(2023, 1, 2, 16, 0, 0, 0, pytz.utc)
+        self.assertTrue(self.simulation.check_timestamp_validity(time_intervals, 60 * 60))
+        self.assertFalse(self.simulation.check_timestamp_validity(time_intervals, 60 * 60 + 1))
+        self.assertFalse(self.simulation.check_timestamp_validity(time_intervals, -(3 * 60 * 60 + 30)))
+        self.assertEqual("16:00:00", str(self.simulation.get_next_valid_timestamp(
+            60 * 60 + 1, time_intervals, False, 0)))
+        self.assertEqual(datetime.timedelta(hours=-3), self.simulation.get_next_valid_timestamp(
+            -(3 * 60 * 60 + 30 * 60), time_intervals, False, 0))
+        # Tuesday
+        self.simulation.current_time = datetime.datetime(2023, 1, 3, 12, 0, 1, 0, pytz.utc)
+        self.assertEqual("5 days, 19:59:59", str(self.simulation.get_next_valid_timestamp(
+            1, time_intervals, False, 0)))
+
+        # Blocks of parallel simulations start at the next interval start after the previous
+        # block, as long as their events stay within the intervals.
+        day = 24 * 60 * 60 * 1000000
+        start_time = datetime.datetime(2023, 1, 5, 8, 0, 0, 0, pytz.utc)  # Thursday
+        block = [self.get_trace([datetime.datetime(2023, 1, 5, 8, 0, 0, 0, pytz.utc),
+                                 datetime.datetime(2023, 1, 5, 16, 0, 0, 0, pytz.utc)])]
+        end_time = datetime.datetime(2023, 1, 5, 16, 30, 0, 0, pytz.utc)
+        self.assertEqual(8 * 60 * 60 * 1000000 + 30 * 60 * 1000000,
+                         self.simulation.get_block_shift(block, start_time, end_time))
+        self.simulation.config.time_intervals = ["Mon,Tue,Wed,Thu,Fri|08:00:00-17:00:00"]
+        self.assertEqual(day, self.simulation.get_block_shift(block, start_time, end_time))
+        block.append(self.get_trace([datetime.datetime(2023, 1, 6, 16, 0, 0, 0, pytz.utc)]))
+        end_time = datetime.datetime(2023, 1, 6, 16, 30, 0, 0, pytz.utc)
+        # Friday, the block starts on the next Monday.
+        self.assertEqual(4 * day, self.simulation.get_block_shift(block, start_time, end_time))
+        # On Tuesday, the second event would not be within the intervals anymore.
+        self.simulation.config.time_intervals = time_intervals
+        start_time = datetime.datetime(2023, 1, 2, 8, 0, 0, 0, pytz.utc)
+        block = [self.get_trace([datetime.datetime(2023, 1, 2, 8, 0, 0, 0, pytz.utc),
+                                 datetime.datetime(2023, 1, 2, 16, 0, 0, 0, pytz.utc)])]
+        end_time = datetime.datetime(2023, 1, 2, 16, 30, 0, 0, pytz.utc)
+        self.assertEqual(7 * day, self.simulation.get_block_shift(block, start_time, end_time))
+        self.simulation.config.time_intervals = []
+
+    def get_trace(self, timestamps):
+        trace = Trace("trace")
+        for timestamp in timestamps:
+            trace.add_event("event", timestamp, Model("name"), "t1", False)
+        return trace
+
     def test_generate_trace_name(self):
         self.setUp()
         self.simulation.config.allow_duplicate_trace_names = True
@@ -207,9 +326,9 @@ class TestSimulation(TestCase):
         self.simulation.config.allow_duplicate_trace_names = True
         self.simulation.config.trace_names = ["traceA", "traceB"]
 
+        self.assertEqual("traceB", self.simulation.generate_trace_name())
         self.assertEqual("traceA", self.simulation.generate_trace_name())
         self.assertEqual("traceA", self.simulation.generate_trace_name())
-        self.assertEqual("traceB", self.simulation.generate_trace_name())
 
         self.setUp()
         self.simulation.config.allow_duplicate_trace_names = False
@@ -218,14 +337,14 @@ class TestSimulation(TestCase):
         for trace_name in self.simulation.unused_trace_names:
             self.simulation.used_trace_name_count[trace_name] = 0
 
-        self.assertEqual("traceA1", self.simulation.generate_trace_name())
         self.assertEqual("traceB1", self.simulation.generate_trace_name())
+        self.assertEqual("traceA1", self.simulation.generate_trace_name())
         self.assertEqual("traceA2", self.simulation.generate_trace_name())
-        self.assertEqual("traceB2", self.simulation.generate_trace_name())
-        self.assertEqual("traceB3", self.simulation.generate_trace_name())
+        self.assertEqual("traceA3", self.simulation.generate_trace_name())
+        self.assertEqual("traceA4", self.simulation.generate_trace_name())
 
-        self.assertEqual(2, self.simulation.used_trace_name_count["traceA"])
-        self.assertEqual(3, self.simulation.used_trace_name_count["traceB"])
+        self.assertEqual(4, self.simulation.used_trace_name_count["traceA"])
+        self.assertEqual(1, self.simulation.used_trace_name_count["traceB"])
 
     def test_calculate_possible_traces(self):
         reader = PnmlReader()
@@ -238,4 +357,273 @@ class TestSimulation(TestCase):
         self.assertEqual([["n5", "n6"], ["n5", "n7"]], result.valid_ending_traces)
         self.assertEqual([], result.other_traces)
 
-
+    def test_count_possible_traces(self):
+        self.setUp()
+        reader = PnmlReader()
+        model, errors = reader.read_pnml(Global.test_files_path + "test_dpn.pnml")
+        self.simulation.thread_stop = False
+        self.simulation.sim_status = SimStatus(nr_estimation_traces=-1)
+        config = self.simulation.config
+        config.number_of_traces = 5
+        self.assertEqual(2, self.simulation.count_possible_traces(model))
+        config.number_of_traces = 1
+        self.assertEqual(1, self.simulation.count_possible_traces(model))
+        config.number_of_traces = 5
+        config.include_partial_traces = True
+        config.only_ending_traces = False
+        self.assertEqual(3, self.simulation.count_possible_traces(model))
+        config.min_trace_length = 3
+        self.assertEqual(0, self.simulation.count_possible_traces(model))
+
+    def test_find_combination(self):
+        self.setUp()
+        self.main.model_path = Global.test_files_path + "test_dpn.pnml"
+        self.main.initialize_model_and_config()
+        simulation = Simulation(self.main.model, self.main.config.simulation_config,
+                                np.random.default_rng(1701), 1)
+        simulation.thread_stop = False
+        variables = simulation.get_variables()
+        patient_status = self.main.model.get_variable_by_name("patient_status")
+        # variable2 has no possible values but is not used by the traces.
+        variable_values = {"patient_status": [("patient_status", False, "normal"),
+                                              ("patient_status", False, "emergency")],
+                           "variable2": []}
+        milp_solver = MilpSolver()
+        guards, written_variable_names = \
+            simulation.get_guard_strings_and_written_variable(["n5", "n6"])
+        self.assertEqual(["patient_status"], written_variable_names)
+        self.assertEqual((("patient_status", False, "emergency"),),
+                         simulation.find_combination(guards, [patient_status], variable_values,
+                                                     variables, milp_solver))
+        guards, written_variable_names = \
+            simulation.get_guard_strings_and_written_variable(["n5", "n7"])
+        self.assertEqual((("patient_status", False, "normal"),),
+                         simulation.find_combination(guards, [patient_status], variable_values,
+                                                     variables, milp_solver))
+        # String guards can not be solved as a linear program.
+        self.assertEqual((False, None), simulation.solve_combination(
+            guards, [patient_status], variable_values, variables, milp_solver))
+        variable_values["patient_status"] = [("patient_status", False, "emergency")]
+        self.assertEqual(None, simulation.find_combination(guards, [patient_status],
+                                                           variable_values, variables,
+                                                           milp_solver))
+
+    def test_full_exploration(self):
+        self.setUp()
+        self.main.model_path = Global.test_files_path + "test_dpn.pnml"
+        self.main.initialize_model_and_config()
+        config = self.main.config.simulation_config
+        config.number_of_traces = 3
+        self.main.model.reset()
+        simulation = Simulation(self.main.model, config, np.random.default_rng(1701), 1)
+        simulation.set_up_sim()
+        simulation.thread_stop = False
+        # The trace that writes no variables comes before the traces that write variables.
+        possible_traces = TraceEstimationResults()
+        possible_traces.number_of_possible_traces = 3
+        possible_traces.valid_ending_traces = [["n7"], ["n5", "n6"], ["n5", "n7"]]
+        simulation.calculate_possible_traces = lambda model: possible_traces
+        simulation.run_full_exploration()
+        self.assertFalse(simulation.exit_with_errors)
+        traces = simulation.event_logs[0].traces
+        # The last trace is the partial trace of the second trace.
+        self.assertEqual([["n7"], ["n5", "n6"], ["n5"]],
+                         [trace.get_transition_ids() for trace in traces])
+
+    def test_columnar_event_logs(self):
+        self.setUp()
+        writer = XesWriter()
+        for mode in ["random", "exploration"]:
+            xml_strings = []
+            for columnar_event_logs in [False, True]:
+                self.main.model_path = Global.test_files_path + "test_dpn.pnml"
+                self.main.initialize_model_and_config()
+                self.main.analyse_model()
+                config = self.main.config.simulation_config
+                config.number_of_traces = 3
+                config.max_trace_duplicates = 2
+                config.perform_trace_estimation = False
+                config.include_partial_traces = True
+                config.only_ending_traces = False
+                config.columnar_event_logs = columnar_event_logs
+                self.main.model.reset()
+                simulation = Simulation(self.main.model, config, np.random.default_rng(5), 2)
+                simulation.set_up_sim()
+                simulation.thread_stop = False
+                if mode == "random":
+                    simulation.run_random_trace_generation()
+                else:
+                    simulation.run_random_exploration()
+                self.assertFalse(simulation.exit_with_errors)
+                xml_strings.append([writer.generate_xml(event_log, "trace", True, True)
+                                    for event_log in simulation.event_logs])
+            # The columnar event logs contain the same traces as the event logs with trace objects.
+            self.assertEqual(xml_strings[0], xml_strings[1])
+
+    def test_parallel_random_trace_generation(self):
+        self.setUp()
+        event_logs = []
+        for run in range(2):
+            self.main.model_path = Global.test_files_path + "test_dpn.pnml"
+            self.main.initialize_model_and_config()
+            self.main.analyse_model()
+            config = self.main.config.simulation_config
+            config.number_of_traces = 3
+            config.max_trace_duplicates = 2
+            config.workers = 2
+            self.main.model.reset()
+            simulation = Simulation(self.main.model, config,
+                                    np.random.default_rng(config.random_seed), 2)
+            simulation.set_up_sim()
+            simulation.thread_stop = False
+            simulation.run_parallel_random_trace_generation()
+            self.assertFalse(simulation.exit_with_errors)
+            self.assertEqual(2, len(simulation.event_logs))
+            for event_log in simulation.event_logs:
+                self.assertEqual(3, len(event_log.traces))
+                for trace in event_log.traces:
+                    self.assertLessEqual(event_log.count_duplicates(
+                        trace, config.duplicates_with_invisible_trans,
+                        config.duplicates_with_data_perspective) - 1, config.max_trace_duplicates)
+                # The traces of the blocks follow each other like in a serial simulation.
+                timestamps = []
+                for trace in event_log.traces:
+                    for event in trace.events:
+                        timestamps.append(event.timestamp)
+                self.assertEqual(sorted(timestamps), timestamps)
+            event_logs.append(simulation.event_logs)
+
+        self.assert_equal_event_logs(event_logs[0], event_logs[1])
+
+    def test_stop_parallel_random_trace_generation(self):
+        self.setUp()
+        simulation = self.get_unfinishable_simulation()
+        self.stop_simulation(simulation, simulation.run_parallel_random_trace_generation)
+        self.assertFalse(simulation.exit_with_errors)
+        self.assertTrue(simulation.sim_status.simulation_ended)
+        # The worker processes have been terminated.
+        self.assertEqual([], multiprocessing.active_children())
+
+    def test_stop_parallel_event_log_generation(self):
+        self.setUp()
+        simulation = self.get_unfinishable_simulation()
+        self.stop_simulation(simulation, simulation.run_parallel_event_log_generation)
+        self.assertFalse(simulation.exit_with_errors)
+        self.assertTrue(simulation.sim_status.simulation_ended)
+        self.assertEqual([], multiprocessing.active_children())
+
+        # The worker processes are also terminated if the simulation fails.
+        simulation = self.get_unfinishable_simulation()
+        simulation.config.number_of_traces = 1
+
+        def raise_error(event_log, index):
+            raise ValueError
+
+        simulation.event_log_handler = raise_error
+        with self.assertLogs(level="ERROR"):
+            simulation.run_parallel_event_log_generation()
+        self.assertTrue(simulation.exit_with_errors)
+        self.assertEqual([], multiprocessing.active_children())
+
+    def get_unfinishable_simulation(self):
+        self.main.model_path = Global.test_files_path + "test_dpn.pnml"
+        self.main.initialize_model_and_config()
+        self.main.analyse_model()
+        config = self.main.config.simulation_config
+        # The duplicate limit does not allow the number of traces.
+        config.number_of_traces = 10
+        config.max_trace_duplicates = 0
+        config.workers = 2
+        self.main.model.reset()
+        simulation = Simulation(self.main.model, config, np.random.default_rng(config.random_seed),
+                                2)
+        simulation.set_up_sim()
+        simulation.thread_stop = False
+        return simulation
+
+    def stop_simulation(self, simulation, run):
+        thread = threading.Thread(target=run)
+        thread.start()
+        time.sleep(3)
+        with simulation.thread_status_lock:
+            simulation.thread_stop = True
+        thread.join(10)
+        self.assertFalse(thread.is_alive())
+
+    def test_parallel_event_log_generation(self):
+        self.setUp()
+        event_logs = []
+        for workers in [2, 3]:
+            self.main.model_path = Global.test_files_path + "test_dpn.pnml"
+            self.main.initialize_model_and_config()
+            self.main.analyse_model()
+            config = self.main.config.simulation_config
+            config.number_of_traces = 2
+            config.max_trace_duplicates = 2
+            config.workers = workers
+            self.main.model.reset()
+            simulation = Simulation(self.main.model, config,
+                                    np.random.default_rng(config.random_seed), 3)
+            handled_indexes = []
+            simulation.event_log_handler = lambda event_log, index: handled_indexes.append(index)
+            simulation.thread_stop = False
+            simulation.run_parallel_event_log_generation()
+            self.assertFalse(simulation.exit_with_errors)
+            self.assertEqual([0, 1, 2], sorted(handled_indexes))
+            self.assertEqual(3, len(simulation.event_logs))
+            for event_log in simulation.event_logs:
+                self.assertEqual(2, len(event_log.traces))
+            event_logs.append(simulation.event_logs)
+
+        # Every event log only depends on the random seed and its index.
+        self.assert_equal_event_logs(event_logs[0], event_logs[1])
+
+    def test_concurrent_simulations(self):
+        self.setUp()
+        # Simulations only use their own generator, running them at the same time does not change
+        # the generated event logs.
+        reader = PnmlReader()
+        simulations = {}
+        for run in ["serial", "concurrent"]:
+            simulations[run] = []
+            for seed in [1701, 42]:
+                model = reader.read_pnml(Global.test_files_path + "all_variable_types.pnml")[0]
+                config = Configuration(np.random.default_rng(seed))
+                config.read_config_file(Global.test_files_path + "all_variable_types.json", model)
+                config.configure_variables_and_transitions(model)
+                sim_config = config.simulation_config
+                sim_config.number_of_traces = 5
+                sim_config.perform_trace_estimation = False
+                sim_config.add_time_interval_variance = True
+                sim_config.max_time_interval_variance = 30
+                simulation = Simulation(model, sim_config,
+                                        np.random.default_rng(np.random.SeedSequence(seed)), 1)
+                simulation.set_up_sim()
+                simulation.thread_stop = False
+                simulations[run].append(simulation)
+        for simulation in simulations["serial"]:
+            simulation.run_random_trace_generation()
+        threads = []
+        for simulation in simulations["concurrent"]:
+            threads.append(threading.Thread(target=simulation.run_random_trace_generation))
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        for serial, concurrent in zip(simulations["serial"], simulations["concurrent"]):
+            self.assertFalse(concurrent.exit_with_errors)
+            self.assertEqual(5, len(concurrent.event_logs[0].traces))
+            self.assert_equal_event_logs(serial.event_logs, concurrent.event_logs)
+
+    def assert_equal_event_logs(self, event_logs1, event_logs2):
+        self.assertEqual(len(event_logs1), len(event_logs2))
+        for event_log1, event_log2 in zip(event_logs1, event_logs2):
+            self.assertEqual(len(event_log1.traces), len(event_log2.traces))
+            for trace1, trace2 in zip(event_log1.traces, event_log2.traces):
+                self.assertEqual(len(trace1.events), len(trace2.events))
+                for event1, event2 in zip(trace1.events, trace2.events):
+                    self.assertEqual(event1.name, event2.name)
+                    self.assertEqual(event1.timestamp, event2.timestamp)
+                    self.assertEqual(event1.utc_offset, event2.utc_offset)
+                    self.assertEqual(event1.variables, event2.variables)
+                self.assertEqual(trace1.variables, trace2.variables)
@@ -0,0 +1,299 @@
+import bz2
+import csv
+import datetime
+import gzip
+import lzma
+import os
+import tempfile
+import xml.etree.ElementTree as ET
+from unittest import TestCase, skipUnless
+
+import pytz
+
+from src.jilg.Main.TableWriter import TableWriter
+from src.jilg.Main.TraceStreamWriter import TraceStreamWriter
+from src.jilg.Main.XesWriter import XesWriter
+from src.jilg.Model.Model import Model
+from src.jilg.Other import Global
+from src.jilg.Simulation.ColumnarEventLog import ColumnarEventLog
+from src.jilg.Simulation.Event import Event
+from src.jilg.Simulation.EventLog import EventLog
+from src.jilg.Simulation.TimestampFormatter import TimestampFormatter
+from src.jilg.Simulation.Trace import Trace
+
+
+class TestXesWriter(TestCase):
+    namespace = "{http://www.xes-standard.org/}"
+
+    def setUp(self):
+        self.writer = XesWriter()
+        timestamp = datetime.datetime(2023, 1, 2, 8, 0, 0, 0, pytz.utc)
+        self.event_log = EventLog("log", "creator")
+        for trace_index in range(3):
+            trace = Trace("trace")
+            trace.events = [Event("event1", timestamp, Model("name"), "t1", False),
+                            Event("event2", timestamp, Model("name"), "t2", False, True),
+                            Event("event3", timestamp, Model("name"), "t3", False)]
+            trace.events[0].variables.append(("var1", 'a"b<c>&d', "string"))
+            self.event_log.traces.append(trace)
+
+    def test_all(self):
+        self.setUp()
+        self.test_write_event_log()
+        self.test_stream_event_logs()
+        self.test_stream_writer_failure()
+        self.test_columnar_event_log()
+        self.test_timestamp_formatter()
+        self.test_table_writer()
+        if TableWriter.is_parquet_available():
+            self.test_parquet_table_writer()
+        self.test_compressed_output()
+        self.test_baseline_output()
+
+    def test_write_event_log(self):
+        for indent in ["  ", ""]:
+            root = ET.fromstring(self.writer.generate_xml(self.event_log, "trace", False, True,
+                                                          indent))
+            traces = root.findall(self.namespace + "trace")
+            self.assertEqual(3, len(traces))
+            self.assertEqual(2, len(traces[0].findall(self.namespace + "event")))
+            self.assertEqual("trace3", traces[2].find(self.namespace + "string").get("value"))
+            event_attributes = traces[0].find(self.namespace + "event").findall(
+                self.namespace + "string")
+            self.assertEqual('a"b<c>&d', event_attributes[1].get("value"))
+            metadata = {}
+            for element in root.findall(self.namespace + "int"):
+                metadata[element.get("key")] = element.get("value")
+            self.assertEqual("3", metadata["meta_general:traces_total"])
+            self.assertEqual("6", metadata["meta_general:events_total"])
+
+        root = ET.fromstring(self.writer.generate_xml(self.event_log, "trace", True, False))
+        self.assertEqual(3, len(root.find(self.namespace + "trace").findall(self.namespace + "event")))
+        self.assertEqual(None, root.find(self.namespace + "int"))
+
+    def test_stream_event_logs(self):
+        single_trace_log = EventLog("log2", "creator")
+        single_trace_log.traces.append(self.event_log.traces[0])
+        event_logs = [self.event_log, single_trace_log]
+        for write_to_single_file in [True, False]:
+            for include_metadata in [True, False]:
+                with tempfile.TemporaryDirectory() as directory:
+                    expected_dir = directory + "/expected/"
+                    streamed_dir = directory + "/streamed/"
+                    os.mkdir(expected_dir)
+                    os.mkdir(streamed_dir)
+                    self.writer.write_event_logs_to_xes_file(expected_dir, event_logs,
+                                                             write_to_single_file, "log", ["trace"],
+                                                             False, include_metadata)
+                    trace_writer = TraceStreamWriter(self.writer, streamed_dir, "log",
+                                                     write_to_single_file, len(event_logs), "trace",
+                                                     False, include_metadata)
+                    trace_writer.start()
+                    for event_log in event_logs:
+                        streamed_log = EventLog(event_log.name, event_log.creator)
+                        streamed_log.stream_traces(trace_writer, False, False)
+                        for trace in event_log.traces:
+                            streamed_log.add_trace(trace)
+                        self.assertEqual([], streamed_log.traces)
+                        self.assertEqual(len(event_log.traces), streamed_log.get_number_of_traces())
+                        self.assertEqual(len(event_log.traces), streamed_log.count_duplicates(
+                            event_log.traces[0], False, False))
+                        if event_log is self.event_log:
+                            streamed_log.close()
+                    # The second event log is not closed, e.g. because the simulation was aborted.
+                    trace_writer.close()
+                    self.assertEqual(sorted(os.listdir(expected_dir)), sorted(os.listdir(streamed_dir)))
+                    for file_name in os.listdir(expected_dir):
+                        with open(expected_dir + file_name, encoding="utf-8") as expected_file:
+                            with open(streamed_dir + file_name, encoding="utf-8") as streamed_file:
+                                self.assertEqual(expected_file.read(), streamed_file.read())
+
+    def test_stream_writer_failure(self):
+        with tempfile.TemporaryDirectory() as directory:
+            # The temporary trace file cannot be created in a directory that does not exist.
+            trace_writer = TraceStreamWriter(self.writer, directory + "/missing/", "log", True, 1,
+                                             "trace", False, True)
+            trace_writer.start()
+            streamed_log = EventLog("log", "creator")
+            streamed_log.stream_traces(trace_writer, False, False)
+            with self.assertLogs(level="ERROR"):
+                with self.assertRaises(RuntimeError):
+                    # The error is raised once the writer thread has failed instead of blocking
+                    # when the queue is full.
+                    for trace_index in range(TraceStreamWriter.queue_size * 2):
+                        streamed_log.add_trace(self.event_log.traces[0])
+            self.assertFalse(trace_writer.thread.is_alive())
+            with self.assertRaises(RuntimeError):
+                trace_writer.close()
+            # The writer is closed, further traces are ignored.
+            trace_writer.close()
+            streamed_log.add_trace(self.event_log.traces[0])
+
+    def test_columnar_event_log(self):
+        trace = Trace("trace4")
+        trace.events = [Event("event1", datetime.datetime(2023, 1, 2, 8, 0, 0, 123456, pytz.utc),
+                              Model("name"), "t1", True),
+                        Event("event4", datetime.datetime.max, Model("name"), "t4", True)]
+        trace.events[0].variables += [("var2", 2 ** 70, "int"), ("var3", 1.5, "float"),
+                                      ("var4", True, "boolean"), ("var5", 3, "float"),
+                                      ("var6", "2000-01-01T00:00:00", "date")]
+        trace.events[1].variables += [("var4", False, "boolean"), ("var2", -1, "int")]
+        trace.variables.append(("trace_var", "value", "string"))
+        self.event_log.traces.append(trace)
+        columnar_log = ColumnarEventLog(self.event_log.name, self.event_log.creator, False, False)
+        for trace in self.event_log.traces:
+            columnar_log.add_trace(trace)
+        self.assertEqual(4, columnar_log.get_number_of_traces())
+        self.assertEqual(3, columnar_log.count_duplicates(self.event_log.traces[1], False, False))
+        for include_invisible_transitions in [True, False]:
+            self.assertEqual(self.event_log.get_metadata_counts(include_invisible_transitions),
+                             columnar_log.get_metadata_counts(include_invisible_transitions))
+            for include_metadata in [True, False]:
+                self.assertEqual(self.writer.generate_xml(self.event_log, "trace",
+                                                          include_invisible_transitions,
+                                                          include_metadata),
+                                 self.writer.generate_xml(columnar_log, "trace",
+                                                          include_invisible_transitions,
+                                                          include_metadata))
+
+        # The simulation creates the traces with create_trace and appends the events directly.
+        model = Model("name")
+        timestamp = datetime.datetime(2023, 1, 2, 8, 0, 0, 0, pytz.utc)
+        event_logs = [EventLog("log", "creator"), ColumnarEventLog("log", "creator", False, False)]
+        for event_log in event_logs:
+            for trace_index in range(3):
+                trace = event_log.create_trace("trace")
+                trace.add_event("event1", timestamp, model, "t1", False)
+                trace.add_event("event2", timestamp, model, "t2", False, True)
+                trace.add_event("event3", timestamp, model, "t3", False)
+                trace.remove_last_event()
+                self.assertEqual(1, trace.get_length())
+                self.assertEqual(min(trace_index, 1),
+                                 event_log.count_duplicates(trace, False, False))
+                if trace_index != 1:
+                    event_log.add_trace(trace)
+            event_log.close()
+        self.assertEqual(2, event_logs[1].get_number_of_traces())
+        self.assertEqual(4, event_logs[1].activities.size)
+        self.assertEqual(self.writer.generate_xml(event_logs[0], "trace", True, True),
+                         self.writer.generate_xml(event_logs[1], "trace", True, True))
+
+    def test_timestamp_formatter(self):
+        formatter = TimestampFormatter()
+        time_zones = [None, pytz.utc, datetime.timezone(datetime.timedelta(hours=2, minutes=5)),
+                      datetime.timezone(-datetime.timedelta(hours=9, minutes=30, seconds=15))]
+        for time_zone in time_zones:
+            for timestamp in [datetime.datetime(2023, 1, 2, 8, 0, 0, 0),
+                              datetime.datetime(2023, 1, 2, 8, 0, 0, 1),
+                              datetime.datetime(1969, 12, 31, 23, 59, 59, 999999),
+                              datetime.datetime(9999, 12, 31, 23, 59, 59, 999999),
+                              datetime.datetime(1, 1, 1, 0, 0, 0, 120)]:
+                timestamp = timestamp.replace(tzinfo=time_zone)
+                self.assertEqual(timestamp.isoformat(), formatter.format_timestamp(
+                    *TimestampFormatter.get_epoch_timestamp(timestamp)))
+        event = Event("event1", datetime.datetime(2023, 1, 2, 8, 0, 0, 123456, pytz.utc),
+                      Model("name"), "t1", False)
+        self.assertEqual("2023-01-02T08:00:00+00:00",
+                         formatter.format_timestamp(event.timestamp, event.utc_offset))
+        self.assertEqual("2000-01-01T00:00:00", formatter.format_date("2000-01-01T00:00:00"))
+
+    def test_table_writer(self):
+        self.setUp()
+        table_writer = TableWriter()
+        self.event_log.traces[0].variables.append(("trace_var", 5, "int"))
+        self.event_log.traces[1].events[2].variables.append(("var2", 2000000000, "date"))
+        columnar_log = ColumnarEventLog(self.event_log.name, self.event_log.creator, False, False)
+        for trace in self.event_log.traces:
+            columnar_log.add_trace(trace)
+        with tempfile.TemporaryDirectory() as directory:
+            directory += "/"
+            table_writer.write_event_logs_to_table_file(directory, [self.event_log, columnar_log],
+                                                        True, "log", ["trace"], False)
+            with open(directory + "log.csv", encoding="utf-8", newline="") as file:
+                rows = list(csv.reader(file))
+            self.assertEqual(["log", "case:concept:name", "concept:name", "time:timestamp",
+                              "trace_var", "var1", "var2"], rows[0])
+            self.assertEqual(13, len(rows))
+            self.assertEqual(["1", "trace1", "event1", "2023-01-02T08:00:00+00:00", "5",
+                              'a"b<c>&d', ""], rows[1])
+            self.assertEqual(["1", "trace2", "event3", "2023-01-02T08:00:00+00:00", "", "",
+                              TimestampFormatter().format_date(2000000000)], rows[4])
+            self.assertEqual(rows[1:7], [["1"] + row[1:] for row in rows[7:]])
+
+            table_writer.write_event_logs_to_table_file(directory, [self.event_log], True, "log",
+                                                        ["trace"], True, "csv",
+                                                        [("var1", "string")])
+            with open(directory + "log.csv", encoding="utf-8", newline="") as file:
+                rows = list(csv.reader(file))
+            self.assertEqual(["case:concept:name", "concept:name", "time:timestamp", "var1"],
+                             rows[0])
+            self.assertEqual(10, len(rows))
+            self.assertEqual("event2", rows[2][1])
+
+    @skipUnless(TableWriter.is_parquet_available(), "Writing Parquet files requires pyarrow")
+    def test_parquet_table_writer(self):
+        import pyarrow.parquet
+        self.setUp()
+        table_writer = TableWriter()
+        self.event_log.traces[0].variables.append(("trace_var", 5, "int"))
+        with tempfile.TemporaryDirectory() as directory:
+            directory += "/"
+            table_writer.write_event_logs_to_table_file(directory, [self.event_log], False, "log",
+                                                        ["trace"], False, "parquet")
+            table = pyarrow.parquet.read_table(directory + "log.parquet")
+            self.assertEqual(6, table.num_rows)
+            self.assertEqual([5, 5, None, None, None, None],
+                             table.column("trace_var").to_pylist())
+
+    def test_compressed_output(self):
+        self.setUp()
+        event_logs = [self.event_log, self.event_log]
+        with tempfile.TemporaryDirectory() as directory:
+            directory += "/"
+            self.writer.write_event_logs_to_xes_file(directory, event_logs, True, "log", ["trace"],
+                                                     False, True)
+            with open(directory + "log.xes", encoding="utf-8") as file:
+                expected = file.read()
+            for compression, module in [("gzip", gzip), ("lzma", lzma), ("bz2", bz2)]:
+                self.writer.write_event_logs_to_xes_file(directory, event_logs, True, "log",
+                                                         ["trace"], False, True,
+                                                         compression=compression)
+                path = directory + "log.xes" + XesWriter.compression_extensions[compression]
+                with module.open(path, "rt", encoding="utf-8") as file:
+                    self.assertEqual(expected, file.read())
+
+                streamed_dir = directory + compression + "/"
+                os.mkdir(streamed_dir)
+                trace_writer = TraceStreamWriter(self.writer, streamed_dir, "log", True,
+                                                 len(event_logs), "trace", False, True,
+                                                 compression=compression)
+                trace_writer.start()
+                for event_log in event_logs:
+                    streamed_log = EventLog(event_log.name, event_log.creator)
+                    streamed_log.stream_traces(trace_writer, False, False)
+                    for trace in event_log.traces:
+                        streamed_log.add_trace(trace)
+                    streamed_log.close()
+                trace_writer.close()
+                with module.open(streamed_dir + "log.xes" +
+                                 XesWriter.compression_extensions[compression], "rt",
+                                 encoding="utf-8") as file:
+                    self.assertEqual(expected, file.read())
+            with open(directory + "log.xes.gz", "rb") as file:
+                compressed = file.read()
+            self.writer.write_event_logs_to_xes_file(directory, event_logs, True, "log", ["trace"],
+                                                     False, True, compression="gzip")
+            with open(directory + "log.xes.gz", "rb") as file:
+                self.assertEqual(compressed, file.read())
+
+    def test_baseline_output(self):
+        # baseline_event_log.xes has been written by the ElementTree based XesWriter of DALG 1.6.0.
+        self.setUp()
+        with tempfile.TemporaryDirectory() as directory:
+            directory += "/"
+            self.writer.write_event_logs_to_xes_file(directory, [self.event_log], True, "log",
+                                                     ["trace"], False, True)
+            with open(directory + "log.xes", "rb") as file:
+                output = file.read()
+        with open(Global.test_files_path + "baseline_event_log.xes", "rb") as file:
+            self.assertEqual(file.read(), output)
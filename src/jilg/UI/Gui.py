@@ -19,6 +19,7 @@ from dateutil.parser import parse
 
 from src.jilg.Main.Configuration import Configuration
 from src.jilg.Main.Main import Main
+from src.jilg.Main.TableWriter import TableWriter
 from src.jilg.Model.Distribution import Distribution
 from src.jilg.Model.SemanticInformation import SemanticInformation
 from src.jilg.Model.Transition import Transition
@@ -26,7 +27,8 @@ from src.jilg.Model.Variable import Variable
 from src.jilg.Other import Global
 from src.jilg.Other.Global import Status
 from src.jilg.Other.Global import VariableTypes, print_summary_global
-from src.jilg.Simulation.Simulation import Weekday, SimStatus
+from src.jilg.Simulation.Simulation import SimStatus
+from src.jilg.Simulation.WorkingTimeCalendar import Weekday
 from src.jilg.Simulation.TransitionConfiguration import TransitionConfiguration
 from src.jilg.Simulation.ValueGenerator import ValueGenerator
 from src.jilg.UI.QtDesignerClasses import VariableInputBool
@@ -547,7 +549,7 @@ class MainGui:
                 self.sim_stop = False
                 event_logs_generated = False
                 if self.main.simulation.event_logs:
-                    if self.main.simulation.event_logs[0].traces:
+                    if self.main.simulation.event_logs[0].get_number_of_traces() > 0:
                         event_logs_generated = True
                 if event_logs_generated:
                     if len(self.main.event_logs) > 1:
@@ -757,13 +759,14 @@ class MainGui:
 
     def check_override(self):
         path = self.main.config.output_directory_path + self.main.config.event_log_name
+        extension = self.main.config.get_output_file_extension()
         if self.main.config.number_of_event_logs > 1:
             for i in range(self.main.config.number_of_event_logs):
-                if os.path.isfile(path + str(i + 1) + ".xes"):
+                if os.path.isfile(path + str(i + 1) + extension):
                     return True
             return False
         else:
-            return os.path.isfile(path + ".xes")
+            return os.path.isfile(path + extension)
 
     def change_decimal_input(self, var_input: VariableInput):
         precision = var_input.precision_input.value()
@@ -872,6 +875,9 @@ class MainGui:
         if ui.file_name_input.text() == "":
             warnings.append("File name can not be empty!")
             valid = False
+        if ui.output_format_input.currentIndex() == 2 and not TableWriter.is_parquet_available():
+            warnings.append("Parquet files can only be written if pyarrow is installed!")
+            valid = False
         try:
             int(ui.seed_input.text())
         except:
@@ -1197,6 +1203,13 @@ class MainGui:
         config.copy_config_to_output_dir = ui.include_config_input.isChecked()
 
         config.include_metadata = ui.include_metadata_input.isChecked()
+        output_format_index = ui.output_format_input.currentIndex()
+        if output_format_index == 0:
+            config.output_format = "xes"
+        elif output_format_index == 1:
+            config.output_format = "csv"
+        else:
+            config.output_format = "parquet"
 
         if config.output_directory_path:
             if not config.output_directory_path.endswith("/"):
@@ -2331,6 +2344,12 @@ class MainGui:
         ui.include_config_input.setChecked(config.copy_config_to_output_dir)
 
         ui.include_metadata_input.setChecked(config.include_metadata)
+        if config.output_format == "xes":
+            ui.output_format_input.setCurrentIndex(0)
+        elif config.output_format == "csv":
+            ui.output_format_input.setCurrentIndex(1)
+        else:
+            ui.output_format_input.setCurrentIndex(2)
 
         if sim_config.sim_strategy == "random":
             ui.sim_strategy_input.setCurrentIndex(0)
@@ -323,6 +323,7 @@ class Ui_MainWindow(object):
         self.verticalLayout_2.setObjectName(u"verticalLayout_2")
         self.widget_2 = QWidget(self.scrollAreaWidgetContents_4)
         self.widget_2.setObjectName(u"widget_2")
+        self.widget_2.setMinimumSize(QSize(0, 25))
         self.output_path_input = QLineEdit(self.widget_2)
         self.output_path_input.setObjectName(u"output_path_input")
         self.output_path_input.setGeometry(QRect(130, 0, 161, 25))
@@ -340,6 +341,7 @@ class Ui_MainWindow(object):
 
         self.widget_3 = QWidget(self.scrollAreaWidgetContents_4)
         self.widget_3.setObjectName(u"widget_3")
+        self.widget_3.setMinimumSize(QSize(0, 25))
         self.file_name_input = QLineEdit(self.widget_3)
         self.file_name_input.setObjectName(u"file_name_input")
         self.file_name_input.setGeometry(QRect(130, 0, 211, 25))
@@ -354,6 +356,7 @@ class Ui_MainWindow(object):
 
         self.widget_4 = QWidget(self.scrollAreaWidgetContents_4)
         self.widget_4.setObjectName(u"widget_4")
+        self.widget_4.setMinimumSize(QSize(0, 25))
         self.output_dir_label_4 = QLabel(self.widget_4)
         self.output_dir_label_4.setObjectName(u"output_dir_label_4")
         self.output_dir_label_4.setGeometry(QRect(0, 0, 121, 21))
@@ -370,6 +373,7 @@ class Ui_MainWindow(object):
 
         self.trace_estimation_2 = QWidget(self.scrollAreaWidgetContents_4)
         self.trace_estimation_2.setObjectName(u"trace_estimation_2")
+        self.trace_estimation_2.setMinimumSize(QSize(0, 25))
         self.include_config_label = QLabel(self.trace_estimation_2)
         self.include_config_label.setObjectName(u"include_config_label")
         self.include_config_label.setGeometry(QRect(0, 0, 311, 21))
@@ -384,6 +388,7 @@ class Ui_MainWindow(object):
 
         self.trace_estimation_3 = QWidget(self.scrollAreaWidgetContents_4)
         self.trace_estimation_3.setObjectName(u"trace_estimation_3")
+        self.trace_estimation_3.setMinimumSize(QSize(0, 25))
         self.output_dir_label_38 = QLabel(self.trace_estimation_3)
         self.output_dir_label_38.setObjectName(u"output_dir_label_38")
         self.output_dir_label_38.setGeometry(QRect(0, 0, 141, 21))
@@ -396,6 +401,23 @@ class Ui_MainWindow(object):
 
         self.verticalLayout_2.addWidget(self.trace_estimation_3)
 
+        self.output_format = QWidget(self.scrollAreaWidgetContents_4)
+        self.output_format.setObjectName(u"output_format")
+        self.output_format.setMinimumSize(QSize(0, 25))
+        self.output_format_label = QLabel(self.output_format)
+        self.output_format_label.setObjectName(u"output_format_label")
+        self.output_format_label.setGeometry(QRect(0, 0, 121, 21))
+        self.output_format_label.setFont(font2)
+        self.output_format_label.setAlignment(Qt.AlignLeading|Qt.AlignLeft|Qt.AlignTop)
+        self.output_format_input = QComboBox(self.output_format)
+        self.output_format_input.addItem("")
+        self.output_format_input.addItem("")
+        self.output_format_input.addItem("")
+        self.output_format_input.setObjectName(u"output_format_input")
+        self.output_format_input.setGeometry(QRect(130, 0, 111, 25))
+
+        self.verticalLayout_2.addWidget(self.output_format)
+
         self.general_config.setWidget(self.scrollAreaWidgetContents_4)
         self.variable_config = QScrollArea(self.centralwidget)
         self.variable_config.setObjectName(u"variable_config")
@@ -949,6 +971,14 @@ class Ui_MainWindow(object):
 #endif // QT_CONFIG(tooltip)
         self.output_dir_label_38.setText(QCoreApplication.translate("MainWindow", u"Include Metadata:", None))
         self.include_metadata_input.setText("")
+#if QT_CONFIG(tooltip)
+        self.output_format.setToolTip(QCoreApplication.translate("MainWindow", u"<html><head/><body><p>The format of the generated event log files. CSV and Parquet files contain one row per event with the case id, the activity, the timestamp and one column per variable. Parquet files can only be written if pyarrow is installed. The metadata is only included in XES files.</p></body></html>", None))
+#endif // QT_CONFIG(tooltip)
+        self.output_format_label.setText(QCoreApplication.translate("MainWindow", u"Output Format:", None))
+        self.output_format_input.setItemText(0, QCoreApplication.translate("MainWindow", u"XES", None))
+        self.output_format_input.setItemText(1, QCoreApplication.translate("MainWindow", u"CSV", None))
+        self.output_format_input.setItemText(2, QCoreApplication.translate("MainWindow", u"Parquet", None))
+
         self.general_config_3.setTitle(QCoreApplication.translate("MainWindow", u"General Configuration", None))
 #if QT_CONFIG(tooltip)
         self.include_variables_in_origin_label.setToolTip(QCoreApplication.translate("MainWindow", u"<html><head/><body><p>If this setting is checked the values that are generated during an transition are already included in the corresponding event. If this setting is not checked the values first appear in the following event.</p></body></html>", None))